@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+"""Benchmarks and performance checks for the expense tracker.
+
+suite.py times the tracker on seeded synthetic data (synthetic.py) and
+writes JSON that compare.py diffs between commits. The bench_*.py and
+check_query_plans.py scripts each measure one thing and also run directly.
+"""
@@ -0,0 +1,98 @@
+# benchmarks/bench_analytics.py
+"""Compare the NumPy analytics kernels against plain Python loops.
+
+Generates N seeded synthetic expenses, then times grouping by category, day,
+week and month, the cumulative daily total and per-category percentiles,
+once looping over (date, category, amount) tuples the way the charts used
+to and once with expense_db.analytics. Building the tuples is not timed.
+The 10M-row case needs a few GB of memory for the tuple baseline.
+
+Usage: python benchmarks/bench_analytics.py [rows ...]   (default: 1000000 10000000)
+"""
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from itertools import accumulate
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from expense_db.analytics import ExpenseColumns
+from expense_db.days import date_to_day, day_to_date
+
+CATEGORIES = ["Food", "Transport", "Bills", "Shopping", "Health", "Fun", "Education", "Other"]
+PERCENTILES = (50, 90, 99)
+
+
+def generate(rows, seed=42):
+    """Return ExpenseColumns of ``rows`` expenses over three years."""
+    rng = np.random.default_rng(seed)
+    first = date_to_day("2022-01-01")
+    day = rng.integers(first, first + 3 * 365, rows, dtype=np.int32)
+    # Skewed categories: Food and Transport dominate like real spending
+    weights = np.array([30, 20, 12, 12, 8, 8, 5, 5], dtype=float)
+    category = rng.choice(len(CATEGORIES), rows, p=weights / weights.sum()).astype(np.int32)
+    amount = np.round(rng.lognormal(5.5, 1.0, rows) * 100).astype(np.int64) + 1
+    return ExpenseColumns(day, category, amount, CATEGORIES)
+
+
+def as_tuples(columns):
+    """The same expenses as (date, category, pesos) tuples, like fetched rows."""
+    dates = {day: day_to_date(day) for day in np.unique(columns.day).tolist()}
+    return [(dates[day], CATEGORIES[code], cents / 100) for day, code, cents
+            in zip(columns.day.tolist(), columns.category.tolist(), columns.amount.tolist())]
+
+
+def python_loops(rows):
+    by_category = defaultdict(float)
+    by_day = defaultdict(float)
+    by_week = defaultdict(float)
+    by_month = defaultdict(float)
+    amounts = defaultdict(list)
+    for expense_date, category, amount in rows:
+        by_category[category] += amount
+        by_day[expense_date] += amount
+        by_month[expense_date[:7]] += amount
+        amounts[category].append(amount)
+    for expense_date, total in by_day.items():
+        by_week[date.fromisoformat(expense_date).isocalendar()[:2]] += total
+    cumulative = list(accumulate(by_day[d] for d in sorted(by_day)))
+    percentiles = {}
+    for category, values in amounts.items():
+        values.sort()
+        percentiles[category] = {q: values[round((len(values) - 1) * q / 100)] for q in PERCENTILES}
+    return by_category, cumulative, percentiles
+
+
+def numpy_kernels(columns):
+    columns.by_day()
+    columns.by_week()
+    columns.by_month()
+    return columns.by_category(), columns.cumulative(), columns.percentiles(PERCENTILES)
+
+
+def timed(func, arg):
+    start = time.perf_counter()
+    result = func(arg)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]
+    print(f"{'rows':>12} {'python':>10} {'numpy':>10} {'speedup':>9}")
+    for rows in sizes:
+        columns = generate(rows)
+        numpy_s, (by_category, _, _) = timed(numpy_kernels, columns)
+        tuples = as_tuples(columns)
+        python_s, (expected, _, _) = timed(python_loops, tuples)
+        del tuples
+        # Both sides must agree before the timings mean anything
+        for category, total in expected.items():
+            assert abs(by_category[category] - total) <= 1e-6 * total, category
+        print(f"{rows:>12,} {python_s:>9.2f}s {numpy_s:>9.3f}s {python_s / numpy_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
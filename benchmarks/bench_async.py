@@ -0,0 +1,92 @@
+# benchmarks/bench_async.py
+"""Concurrent asyncio requests: AsyncExpenseTracker vs calling ExpenseTracker directly.
+
+Runs C concurrent request loops against a seeded synthetic database. Each
+request reads a 30-day summary and a page of expenses, and every tenth
+also adds (and later removes) an expense. A ticker task measures how late
+the event loop wakes it up, which is how long other requests were blocked.
+
+Usage: python benchmarks/bench_async.py [rows] [concurrency] [requests]   (default: 200000 32 2000)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.async_tracker import AsyncExpenseTracker
+from expense_db.tracker import ExpenseTracker
+
+BENCH_DESCRIPTION = "async benchmark"
+TICK = 0.001
+
+
+async def ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - expected)
+
+
+async def run(call, concurrency, requests):
+    """Run ``requests`` requests over ``concurrency`` loops; returns (seconds, max lag)."""
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    counter = iter(range(requests))
+
+    async def worker():
+        for n in counter:
+            await call("get_summary_by_category", 30)
+            await call("get_expenses_page", 50)
+            if n % 10 == 0:
+                await call("add_expense", "Food", 1, None, BENCH_DESCRIPTION)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(lags, default=0.0)
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        with ExpenseTracker(path, synchronous="OFF") as tracker:
+            fill(tracker, rows)
+
+        blocking = ExpenseTracker(path)
+
+        async def direct(name, *args):
+            return getattr(blocking, name)(*args)
+
+        async with AsyncExpenseTracker(path) as async_tracker:
+            async def offloaded(name, *args):
+                return await getattr(async_tracker, name)(*args)
+
+            print(f"{rows:,} rows, {concurrency} concurrent loops, {requests:,} requests")
+            for label, call in (("blocking ExpenseTracker", direct),
+                                ("AsyncExpenseTracker", offloaded)):
+                elapsed, lag = await run(call, concurrency, requests)
+                print(f"{label:<24} {requests / elapsed:>8.0f} requests/s   "
+                      f"max event loop stall {lag * 1000:.1f} ms")
+
+            count = 0
+            async for _ in async_tracker.iter_expenses(page_size=1000):
+                count += 1
+            print(f"async iteration saw {count:,} expenses")
+        with blocking:
+            conn = blocking._connection()
+            with conn:
+                conn.execute("DELETE FROM expenses WHERE description = ?", (BENCH_DESCRIPTION,))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
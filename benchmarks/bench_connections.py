@@ -0,0 +1,88 @@
+# benchmarks/bench_connections.py
+"""Compare the persistent-connection tracker against per-call connections.
+
+Usage: python benchmarks/bench_connections.py [operations]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from expense_db.days import day_to_date, days_ago
+from expense_db.migrations import CREATE_EXPENSES_SQL
+from expense_db.tracker import ExpenseTracker
+
+
+class PerCallTracker:
+    """The original tracker: one connect/commit/close per method call."""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        conn = sqlite3.connect(self.db_name)
+        conn.execute(CREATE_EXPENSES_SQL)
+        conn.commit()
+        conn.close()
+
+    def add_expense(self, category, amount, date, description=""):
+        conn = sqlite3.connect(self.db_name)
+        conn.execute('''
+            INSERT INTO expenses (category, amount, date, description)
+            VALUES (?, ?, ?, ?)
+        ''', (category, amount, date, description))
+        conn.commit()
+        conn.close()
+
+    def get_expenses_by_period(self, days=7):
+        conn = sqlite3.connect(self.db_name)
+        rows = conn.execute(
+            'SELECT * FROM expenses WHERE date >= ? ORDER BY date DESC',
+            (day_to_date(days_ago(days)),)
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def close(self):
+        pass
+
+
+def run(tracker, operations):
+    """Time inserts and 7-day period reads; returns (insert_s, read_s, rows read)."""
+    # Dates over the last two weeks, so about half the rows are in the period
+    dates = [day_to_date(days_ago(i)) for i in range(14)]
+    start = time.perf_counter()
+    for i in range(operations):
+        tracker.add_expense("Food", 10.0 + i % 50, dates[i % 14], "bench")
+    insert_s = time.perf_counter() - start
+
+    rows = len(tracker.get_expenses_by_period(7))
+    start = time.perf_counter()
+    for _ in range(operations):
+        tracker.get_expenses_by_period(7)
+    read_s = time.perf_counter() - start
+    tracker.close()
+    return insert_s, read_s, rows
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {
+            "per-call": run(PerCallTracker(os.path.join(tmp, "percall.db")), operations),
+            "persistent": run(ExpenseTracker(os.path.join(tmp, "persistent.db")), operations),
+        }
+    counts = {mode: rows for mode, (_, _, rows) in results.items()}
+    if len(set(counts.values())) != 1:
+        sys.exit(f"the two trackers read different periods: {counts}")
+
+    print(f"{operations:,} operations, {counts['persistent']:,} rows per read")
+    print(f"{'mode':<12} {'insert/op':>12} {'read/op':>12}")
+    for mode, (insert_s, read_s, _) in results.items():
+        print(f"{mode:<12} {insert_s / operations * 1e6:>10.1f}us {read_s / operations * 1e6:>10.1f}us")
+    base, fast = results["per-call"], results["persistent"]
+    print(f"\nspeedup: insert x{base[0] / fast[0]:.1f}, read x{base[1] / fast[1]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
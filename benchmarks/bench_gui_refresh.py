@@ -0,0 +1,84 @@
+# benchmarks/bench_gui_refresh.py
+"""Measure the GUI list/summary update cost per add and delete as rows grow.
+
+Compares the incremental apply_added/apply_deleted path with a full
+refresh_data reload and with the old rebuild of every row. Needs a display
+and the GUI dependencies (tkcalendar, optionally Pillow).
+
+Usage: python benchmarks/bench_gui_refresh.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from expense_db.records import Expense
+from expense_db.tracker import ExpenseTracker
+from gui_app import ExpenseTrackerGUI
+
+OPERATIONS = 20
+
+
+def fill(tracker, rows):
+    # Runs on the GUI's database worker thread
+    tracker.add_expenses(
+        ("Food", 1.0 + i % 97, f"20{10 + i % 15:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "bench")
+        for i in range(rows)
+    )
+
+
+def timed(root, action):
+    start = time.perf_counter()
+    action()
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+
+def rebuild_all(app):
+    """The pre-pagination refresh: clear the tree and insert every row."""
+    app.tree.delete(*app.tree.get_children())
+    for expense in app.worker.call(ExpenseTracker.get_all_expenses):
+        app.tree.insert("", tk.END, values=(expense.id, expense.date, expense.category,
+                                            f"₱{expense.amount:.2f}", expense.description))
+
+
+def measure(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = tk.Tk()
+        root.withdraw()
+        app = ExpenseTrackerGUI(root, os.path.join(tmp, "bench.db"))
+        app.worker.call(fill, rows)
+        app.show_snapshot(app.worker.call(app.load_snapshot))
+        today = time.strftime("%Y-%m-%d")
+
+        # Only the UI side is timed; the database call runs on the worker first
+        add_s = delete_s = 0.0
+        for i in range(OPERATIONS):
+            expense_id, version = app.worker.call(
+                lambda tracker: (tracker.add_expense("Bench", 5.0, today, "op"), tracker.data_version()))
+            add_s += timed(root, lambda: app.apply_added(Expense(expense_id, "Bench", 5.0, today, "op"), version))
+            expense, version = app.worker.call(
+                lambda tracker: (tracker.delete_expense(expense_id), tracker.data_version()))
+            delete_s += timed(root, lambda: app.apply_deleted(expense, version))
+
+        reload_s = timed(root, lambda: app.show_snapshot(app.worker.call(app.load_snapshot)))
+        rebuild_s = timed(root, lambda: rebuild_all(app))
+        app.worker.close()
+        root.destroy()
+    return add_s / OPERATIONS, delete_s / OPERATIONS, reload_s, rebuild_s
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'rows':>9} {'add':>10} {'delete':>10} {'reload':>10} {'rebuild all':>12}")
+    for rows in sizes:
+        add_s, delete_s, reload_s, rebuild_s = measure(rows)
+        print(f"{rows:>9,} {add_s * 1e3:>8.2f}ms {delete_s * 1e3:>8.2f}ms "
+              f"{reload_s * 1e3:>8.2f}ms {rebuild_s * 1e3:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
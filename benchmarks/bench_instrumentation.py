@@ -0,0 +1,54 @@
+# benchmarks/bench_instrumentation.py
+"""Measure what expense_db.instrument costs per tracker call.
+
+Times a cheap point lookup (get_expense) and a period summary against a
+seeded synthetic database three ways: with no instrumentation attached,
+with an Instrumentation recording every call, and with the instrumentation
+detached again. The detached run should match the first one.
+
+Usage: python benchmarks/bench_instrumentation.py [rows] [calls]   (default: 100000 20000)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.instrument import Instrumentation
+from expense_db.tracker import ExpenseTracker
+
+
+def per_call_us(func, calls):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    tracker = ExpenseTracker(":memory:")
+    fill(tracker, rows)
+    cases = [
+        ("get_expense", lambda: tracker.get_expense(rows // 2)),
+        ("get_summary_by_category/30", lambda: tracker.get_summary_by_category(30)),
+    ]
+    instrumentation = Instrumentation()
+    print(f"{rows:,} rows, {calls:,} calls per case (best of 3, microseconds per call)")
+    print(f"{'case':<28} {'off':>9} {'on':>9} {'detached':>9}")
+    for name, func in cases:
+        off = per_call_us(func, calls)
+        tracker.instrument(instrumentation)
+        on = per_call_us(func, calls)
+        tracker.instrument(None)
+        detached = per_call_us(func, calls)
+        print(f"{name:<28} {off:>9.2f} {on:>9.2f} {detached:>9.2f}")
+    tracker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_ledgers.py
+"""Rolling up N ledgers: a loop over ExpenseTracker vs Ledgers with a process pool.
+
+Builds N seeded ledgers, then times a yearly category summary plus daily
+series across all of them, and a full CSV export, for the plain loop and
+for Ledgers with 0 (in-process), 1, 2, 4 ... workers up to the CPU count.
+Summaries read the rollup and are cheap, so the pool mostly pays off for
+exports and for ledgers on slow disks; the speedup is bounded by the cores.
+
+Usage: python benchmarks/bench_ledgers.py [ledgers] [rows per ledger]   (default: 8 100000)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.ledgers import Ledgers
+from expense_db.tracker import ExpenseTracker
+
+
+def loop(paths, out):
+    combined = {}
+    for path in paths:
+        with ExpenseTracker(path) as tracker:
+            for category, total in tracker.get_summary_by_category(365).items():
+                combined[category] = combined.get(category, 0) + total
+            tracker.get_daily_totals(365)
+            with open(out, "a", encoding="utf-8") as f:
+                for expense in tracker.iter_expenses(5000):
+                    f.write(",".join(map(str, expense)) + "\n")
+    return combined
+
+
+def pooled(ledgers, out):
+    combined = ledgers.summary(365).combined
+    ledgers.daily_totals(365)
+    ledgers.export(out)
+    return combined
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"ledger{i}.db") for i in range(count)]
+        for seed, path in enumerate(paths):
+            with ExpenseTracker(path, synchronous="OFF") as tracker:
+                fill(tracker, rows, seed=seed)
+        out = os.path.join(tmp, "out.csv")
+        print(f"{count} ledgers x {rows:,} rows, {cpus} CPUs")
+
+        start = time.perf_counter()
+        expected = loop(paths, out)
+        baseline = time.perf_counter() - start
+        print(f"{'loop over ExpenseTracker':<26} {baseline:>7.2f}s")
+
+        workers = [0] + [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+        for n in workers:
+            with Ledgers(paths, workers=n) as ledgers:
+                pooled(ledgers, out)  # warm the pool and its connections
+                start = time.perf_counter()
+                combined = pooled(ledgers, out)
+                elapsed = time.perf_counter() - start
+            ok = all(abs(combined[c] - expected[c]) < 0.005 for c in expected)
+            print(f"{'Ledgers, ' + str(n) + ' workers':<26} {elapsed:>7.2f}s  "
+                  f"x{baseline / elapsed:.1f}  {'totals match' if ok else 'TOTALS DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
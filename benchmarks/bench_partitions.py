@@ -0,0 +1,77 @@
+# benchmarks/bench_partitions.py
+"""Recent-data queries on one big expenses.db vs the same data partitioned by year.
+
+Builds a seeded multi-year history, copies it, archives everything older
+than a year out of the copy, then times the calls the app makes for the
+recent past (and one that spans every year) against both.
+
+Usage: python benchmarks/bench_partitions.py [rows] [years]   (default: 1000000 6)
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.days import day_to_date, days_ago
+from expense_db.partitions import PartitionedSQLiteBackend
+from expense_db.tracker import ExpenseTracker
+
+REPEAT = 20
+CALLS = [
+    ("get_expenses_page(50)", lambda t: t.get_expenses_page(50)),
+    ("get_expenses_by_period(30)", lambda t: t.get_expenses_by_period(30)),
+    ("get_summary_by_category(30)", lambda t: t.get_summary_by_category(30)),
+    ("get_period_summaries", lambda t: t.get_period_summaries({"week": 7, "month": 30})),
+    ("search('coffee', last 90 days)",
+     lambda t: t.search("coffee", (day_to_date(days_ago(90)), None))),
+    ("get_monthly_totals(all years)", lambda t: t.get_monthly_totals(10_000)),
+]
+
+
+def timed(tracker):
+    times = []
+    for _, call in CALLS:
+        call(tracker)
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            call(tracker)
+        times.append((time.perf_counter() - start) / REPEAT * 1000)
+    return times
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    with tempfile.TemporaryDirectory() as tmp:
+        single = os.path.join(tmp, "single.db")
+        split = os.path.join(tmp, "split.db")
+        with ExpenseTracker(single, synchronous="OFF") as tracker:
+            fill(tracker, rows, days=365 * years)
+            tracker._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        shutil.copy(single, split)
+
+        start = time.perf_counter()
+        backend = PartitionedSQLiteBackend(split)
+        moved = backend.archive(days_ago(365))
+        backend.close()
+        # Reopening picks up the partitions by itself
+        with ExpenseTracker(split) as tracker:
+            tracker.backend.compact()
+            print(f"archived {moved:,} of {rows:,} rows in {time.perf_counter() - start:.1f}s; "
+                  f"expenses.db {os.path.getsize(single) / 1e6:.0f} MB -> "
+                  f"{os.path.getsize(split) / 1e6:.0f} MB "
+                  f"+ {len(tracker.backend.partitions())} archive files")
+            split_times = timed(tracker)
+        with ExpenseTracker(single) as tracker:
+            single_times = timed(tracker)
+
+    print(f"{'call':<34}{'one file':>12}{'partitioned':>14}")
+    for (label, _), a, b in zip(CALLS, single_times, split_times):
+        print(f"{label:<34}{a:>10.2f}ms{b:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
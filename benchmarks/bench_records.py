@@ -0,0 +1,79 @@
+# benchmarks/bench_records.py
+"""Memory and build time per row: tuples vs sqlite3.Row vs Expense vs ExpenseBatch.
+
+Fills a seeded database, then reads every expense with the same query
+four ways: plain tuples (the old rows), sqlite3.Row, Expense records from
+the expense_row factory (what the backends return now) and an ExpenseBatch
+filled page by page. Memory is what the result holds once built, measured
+with tracemalloc in a separate pass from the timing.
+
+Usage: python benchmarks/bench_records.py [rows]   (default: 1000000)
+"""
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.sqlite_backend import SELECT_ALL_SQL, expenses
+from expense_db.tracker import ExpenseTracker
+
+
+def fetch(factory):
+    def load(tracker):
+        cursor = tracker._connection().cursor()
+        cursor.row_factory = factory
+        return cursor.execute(SELECT_ALL_SQL).fetchall()
+    return load
+
+
+def records(tracker):
+    return expenses(tracker._connection(), SELECT_ALL_SQL).fetchall()
+
+
+def batch(tracker):
+    return tracker.get_expenses_batch(page_size=5000)
+
+
+LOADERS = [
+    ("tuple", fetch(None)),
+    ("sqlite3.Row", fetch(sqlite3.Row)),
+    ("Expense (row_factory)", records),
+    ("ExpenseBatch", batch),
+]
+
+
+def measure(tracker, load):
+    gc.collect()
+    start = time.perf_counter()
+    result = load(tracker)
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = load(tracker)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(result), elapsed, held
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        with ExpenseTracker(os.path.join(tmp, "records.db"), synchronous="OFF") as tracker:
+            fill(tracker, rows)
+            records(tracker)  # warm the page cache
+            print(f"{rows:,} rows")
+            print(f"{'rows as':<24}{'build':>10}{'per row':>11}{'memory':>11}{'per row':>10}")
+            for label, load in LOADERS:
+                count, elapsed, held = measure(tracker, load)
+                print(f"{label:<24}{elapsed:>9.2f}s{elapsed / count * 1e9:>9.0f}ns"
+                      f"{held / 1e6:>9.0f}MB{held / count:>9.0f}B")
+
+
+if __name__ == "__main__":
+    main()
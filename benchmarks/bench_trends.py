@@ -0,0 +1,74 @@
+# benchmarks/bench_trends.py
+"""Rolling statistics per new expense: DailyTrends.add vs recomputing the windows.
+
+Loads a seeded history into DailyTrends, then records a stream of new
+expenses for today, once with add() and once by re-reading the daily
+totals and recomputing every window from a sorted copy, the way a chart
+would without the incremental windows. Both end with the same statistics.
+
+Usage: python benchmarks/bench_trends.py [rows] [new expenses]   (default: 200000 2000)
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.days import current_day
+from expense_db.trends import DailyTrends
+from expense_db.tracker import ExpenseTracker
+
+WINDOWS = (7, 30, 90, 365)
+DAYS = 365
+
+
+def recompute(daily):
+    """Every window's latest statistics, from scratch."""
+    stats = {}
+    for size in WINDOWS:
+        window = sorted(daily[-size:])
+        rank = (len(window) - 1) / 10
+        stats[size] = (sum(window), statistics.fmean(window), statistics.median(window),
+                       statistics.pstdev(window), window[int(rank)])
+    return stats
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    adds = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(7)
+    amounts = [rng.randint(2000, 200_000) for _ in range(adds)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with ExpenseTracker(os.path.join(tmp, "trends.db"), synchronous="OFF") as tracker:
+            fill(tracker, rows, days=DAYS * 2)
+            start = time.perf_counter()
+            trends = DailyTrends.from_tracker(tracker, DAYS, WINDOWS)
+            loaded = time.perf_counter() - start
+    print(f"{rows:,} rows, windows {WINDOWS}: loaded {len(trends.daily)} days in "
+          f"{loaded * 1000:.1f}ms")
+
+    daily = list(trends.daily)
+    start = time.perf_counter()
+    for cents in amounts:
+        daily[-1] += cents
+        expected = recompute(daily)
+    full = time.perf_counter() - start
+
+    today = current_day()
+    start = time.perf_counter()
+    for cents in amounts:
+        trends.add(today, cents)
+    incremental = time.perf_counter() - start
+
+    ok = all(abs(trends.points[size][-1][1] - expected[size][1]) < 1e-6
+             and trends.points[size][-1][2] == expected[size][2] for size in WINDOWS)
+    print(f"{'recompute every window':<26}{full / adds * 1e6:>9.1f}us per expense")
+    print(f"{'DailyTrends.add':<26}{incremental / adds * 1e6:>9.1f}us per expense  "
+          f"x{full / incremental:.0f}  {'statistics match' if ok else 'STATISTICS DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
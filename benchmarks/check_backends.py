@@ -0,0 +1,182 @@
+# benchmarks/check_backends.py
+"""Check that every storage backend gives the tracker the same answers.
+
+Fills an in-memory SQLite database, a MemoryBackend and a partitioned
+database (archived at 120 days) with the same synthetic history plus a few
+awkward writes (out-of-order and archived dates, accents, deletes), then
+compares every read call (the partitioned one again after merge,
+compact and a failed insert). Rows that the interface lets come back in any order (periods,
+search ranking) are compared as sets. Also round-trips a MemoryBackend
+snapshot and prints how long the common reads take on each backend.
+
+Usage: python benchmarks/check_backends.py [rows]   (default: 5000)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.synthetic import fill
+from expense_db.days import day_to_date, days_ago
+from expense_db.memory_backend import MemoryBackend
+from expense_db.partitions import PartitionedSQLiteBackend
+from expense_db.sqlite_backend import SQLiteBackend
+from expense_db.tracker import ExpenseTracker, page_key
+
+PERIODS = {"day": 1, "week": 7, "month": 30, "year": 365, "all": 10_000}
+SEARCHES = [
+    ("lunch", None, None),
+    ("gro", None, None),
+    ("food", None, None),
+    ("cafe", None, None),
+    ("coffee food", None, None),
+    ("order", None, "Shopping"),
+    ("e", (None, None), None),
+    ("grab", ("2020-01-01", date.today().isoformat()), "Transport"),
+    ("nothing matches this", None, None),
+]
+
+
+def extra_writes(tracker):
+    """Writes the synthetic history doesn't cover: old dates, accents, deletes."""
+    today = date.today()
+    tracker.add_expense("Food", 99.5, (today - timedelta(days=400)).isoformat(), "Café con leche")
+    tracker.add_expense("Food", 12, today.isoformat(), "cafe")
+    tracker.add_expenses([
+        ("Bills", 1500, (today - timedelta(days=n)).isoformat(), f"bill {n}")
+        for n in range(0, 300, 3)
+    ])
+    tracker.delete_expense(5)
+    tracker.delete_expense(6)
+    tracker.delete_expense(10_000_000)
+
+
+def all_search_results(tracker, query, date_range, category):
+    ids = set()
+    page = 0
+    while True:
+        rows = tracker.search(query, date_range, category, page_size=200, page=page)
+        if not rows:
+            return ids
+        ids.update(row[0] for row in rows)
+        page += 1
+
+
+def results(tracker):
+    """Every read call's answer, in a form the backends must agree on."""
+    out = {}
+    out["get_all_expenses"] = sorted(tracker.get_all_expenses())
+    pages = []
+    page = tracker.get_expenses_page(37)
+    while page:
+        pages.append(page)
+        page = tracker.get_expenses_page(37, after=page_key(page[-1]))
+    out["get_expenses_page"] = pages
+    out["get_expenses_page before"] = [
+        tracker.get_expenses_page(37, before=page_key(page[-1])) for page in pages]
+    for days in PERIODS.values():
+        out[f"get_expenses_by_period {days}"] = sorted(tracker.get_expenses_by_period(days))
+        out[f"get_summary_by_category {days}"] = tracker.get_summary_by_category(days)
+        out[f"get_daily_totals {days}"] = tracker.get_daily_totals(days)
+        out[f"get_weekly_totals {days}"] = tracker.get_weekly_totals(days)
+        out[f"get_monthly_totals {days}"] = tracker.get_monthly_totals(days)
+        out[f"get_category_stats {days}"] = tracker.get_category_stats(days)
+    out["get_period_summaries"] = tracker.get_period_summaries(PERIODS)
+    out["get_expense"] = [tracker.get_expense(i) for i in (1, 5, 100, 10_000_000)]
+    for query, date_range, category in SEARCHES:
+        out[f"search {query!r} {date_range} {category}"] = all_search_results(
+            tracker, query, date_range, category)
+    out["verify_rollup"] = tracker.verify_rollup()
+    return out
+
+
+def compare(expected, actual, label):
+    failures = [name for name in expected if expected[name] != actual[name]]
+    for name in failures:
+        print(f"MISMATCH {label}: {name}")
+    return failures
+
+
+def timings(trackers):
+    calls = [
+        ("get_expenses_page(50)", lambda t: t.get_expenses_page(50)),
+        ("get_expenses_by_period(30)", lambda t: t.get_expenses_by_period(30)),
+        ("get_summary_by_category(365)", lambda t: t.get_summary_by_category(365)),
+        ("get_period_summaries", lambda t: t.get_period_summaries(PERIODS)),
+        ("search('lunch')", lambda t: t.search("lunch")),
+    ]
+    print(f"{'call':<30}" + "".join(f"{name:>12}" for name in trackers))
+    for label, call in calls:
+        line = f"{label:<30}"
+        for tracker in trackers.values():
+            start = time.perf_counter()
+            for _ in range(20):
+                call(tracker)
+            line += f"{(time.perf_counter() - start) / 20 * 1000:>10.2f}ms"
+        print(line)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        partitioned = PartitionedSQLiteBackend(os.path.join(tmp, "expenses.db"), scheme="month")
+        trackers = {
+            "sqlite": ExpenseTracker(backend=SQLiteBackend(":memory:")),
+            "memory": ExpenseTracker(backend=MemoryBackend()),
+            "partitioned": ExpenseTracker(backend=partitioned),
+        }
+        for tracker in trackers.values():
+            fill(tracker, rows)
+            # Archive before the extra writes so some of them land in archives
+            if tracker.backend is partitioned:
+                partitioned.archive(days_ago(120))
+            extra_writes(tracker)
+
+        expected = results(trackers["sqlite"])
+        failures = []
+        for name in ("memory", "partitioned"):
+            failures += compare(expected, results(trackers[name]), name)
+
+        # The SQLite counter starts at 1 (its migration bumps it), so compare
+        # writes seen; archiving counts as writes, so the partitioned one is ahead
+        counters = [tracker.change_counter() for tracker in trackers.values()]
+        if counters[0] - 1 != counters[1] or counters[2] <= counters[0]:
+            print(f"MISMATCH: change_counter {counters}")
+            failures.append("change_counter")
+
+        partitioned.merge("year")
+        failures += compare(expected, results(trackers["partitioned"]), "partitioned after merge")
+        partitioned.compact()
+        failures += compare(expected, results(trackers["partitioned"]), "partitioned after compact")
+        # A batch that fails after writing to an archive must leave nothing behind
+        try:
+            partitioned.insert([("Food", 100, day_to_date(days_ago(400)), "rolled back"),
+                                (None, 100, day_to_date(days_ago(1)), "no category")])
+        except sqlite3.IntegrityError:
+            pass
+        failures += compare(expected, results(trackers["partitioned"]),
+                            "partitioned after a failed insert")
+
+        path = os.path.join(tmp, "expenses.snapshot")
+        trackers["memory"].backend.snapshot(path)
+        with ExpenseTracker(backend=MemoryBackend(path)) as reopened:
+            failures += compare(expected, results(reopened), "memory snapshot")
+            reopened.add_expense("Food", 1, None, "after reload")
+            new_id = reopened.get_expenses_page(1)[0][0]
+        with ExpenseTracker(backend=MemoryBackend(path)) as reopened:
+            if reopened.get_expense(new_id) is None:
+                print("MISMATCH memory snapshot: close() did not save the new expense")
+                failures.append("close")
+
+        print(f"{len(expected) * 6 + 2} checks over {rows:,} rows: "
+              f"{'FAILED ' + str(len(failures)) if failures else 'all backends agree'}")
+        timings(trackers)
+        trackers["partitioned"].close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/check_importer.py
+"""Check that the importer rejects bad rows instead of aborting the import.
+
+Imports a small CSV mixing good rows with malformed and out-of-range
+amounts (1e30 pesos overflows the decimal context, 10**20 the 64-bit
+centavo column) and dates, then checks that every bad row landed in the
+reject file and every good one in the database.
+
+Usage: python benchmarks/check_importer.py
+"""
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from expense_db.importer import import_file
+from expense_db.tracker import ExpenseTracker
+
+ROWS = [
+    ("date", "category", "amount", "description", None),
+    ("2024-01-02", "Food", "150.00", "Lunch", True),
+    ("2024-01-03", "Food", "1e30", "Too big for the decimal context", False),
+    ("2024-01-04", "Bills", "100000000000000000000", "Too big for 64-bit centavos", False),
+    ("2024-01-05", "Transport", "₱1,234.50", "Grab", True),
+    ("2024-01-06", "Food", "abc", "Not a number", False),
+    ("2024-13-01", "Food", "10", "Bad date", False),
+    ("2024-01-07", "Other", "(4.00)", "Negative amount", False),
+    ("2024-01-08", "Other", "12.00 PHP", "Currency suffix", True),
+]
+
+
+def main():
+    expected_ok = sum(1 for row in ROWS[1:] if row[4])
+    expected_bad = len(ROWS) - 1 - expected_ok
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "import.csv")
+        rejects = os.path.join(tmp, "import.rejects.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for row in ROWS:
+                f.write(",".join(f'"{field}"' for field in row[:4]) + "\n")
+        with ExpenseTracker(os.path.join(tmp, "check.db")) as tracker:
+            stats = import_file(tracker, path, reject_path=rejects)
+            stored = len(tracker.get_all_expenses())
+        with open(rejects, encoding="utf-8") as f:
+            rejected = [json.loads(line) for line in f]
+
+    problems = []
+    if stats.inserted != expected_ok or stored != expected_ok:
+        problems.append(f"expected {expected_ok} rows imported, got {stats.inserted} ({stored} stored)")
+    if len(rejected) != expected_bad:
+        problems.append(f"expected {expected_bad} rejects, got {len(rejected)}")
+    for amount in ("1e30", "100000000000000000000"):
+        if not any(amount in json.dumps(reject["record"]) for reject in rejected):
+            problems.append(f"the {amount} row is not in the reject file")
+    for reject in rejected:
+        print(f"line {reject['line']}: {reject['error']}")
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        return 1
+    print(f"{stats.inserted} imported, {len(rejected)} rejected: ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# benchmarks/check_query_plans.py
+"""Check that the tracker's hot queries are served by indexes.
+
+Runs EXPLAIN QUERY PLAN for each query against a freshly migrated database
+and exits non-zero if any of them misses its index, scans the table or needs
+a temp b-tree for ORDER BY.
+
+Usage: python benchmarks/check_query_plans.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from expense_db import sqlite_backend
+from expense_db.tracker import ExpenseTracker
+
+# (name, sql, params, index expected in the plan)
+HOT_QUERIES = [
+    ("get_all_expenses", sqlite_backend.SELECT_ALL_SQL, (), "idx_expenses_date"),
+    ("get_expenses_by_period", sqlite_backend.SELECT_PERIOD_SQL, (19723,),
+     "idx_expenses_day_category_amount"),
+    ("get_expenses_page", sqlite_backend.NEXT_PAGE_SQL, ("2024-01-01", 100, 50),
+     "idx_expenses_date"),
+    ("get_summary_by_category", sqlite_backend.SUMMARY_SQL, (19723,),
+     "daily_category_totals USING PRIMARY KEY"),
+    ("get_daily_totals", sqlite_backend.DAILY_TOTALS_SQL, (19723,),
+     "daily_category_totals USING PRIMARY KEY"),
+    ("get_weekly_totals", sqlite_backend.WEEKLY_TOTALS_SQL, (19723,),
+     "daily_category_totals USING PRIMARY KEY"),
+    ("get_monthly_totals", sqlite_backend.MONTHLY_TOTALS_SQL, (19723,),
+     "daily_category_totals USING PRIMARY KEY"),
+]
+
+
+def check(tracker):
+    """Return a list of (name, plan, problem) for queries that miss their index."""
+    failures = []
+    for name, sql, params, index in HOT_QUERIES:
+        plan = tracker.explain(sql, params)
+        text = " | ".join(plan)
+        if index not in text:
+            failures.append((name, text, f"does not use {index}"))
+        elif "USE TEMP B-TREE FOR ORDER BY" in text:
+            failures.append((name, text, "sorts with a temp b-tree"))
+        elif any(line.startswith("SCAN expenses") and "INDEX" not in line for line in plan):
+            failures.append((name, text, "scans the table"))
+    return failures
+
+
+def main():
+    with ExpenseTracker(":memory:") as tracker:
+        for name, sql, params, _index in HOT_QUERIES:
+            print(f"{name:<28} {' | '.join(tracker.explain(sql, params))}")
+        failures = check(tracker)
+    for name, plan, problem in failures:
+        print(f"FAIL {name}: {problem}\n     {plan}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
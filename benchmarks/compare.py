@@ -0,0 +1,61 @@
+# benchmarks/compare.py
+"""Compare two benchmarks.suite result files and flag regressions.
+
+A case regresses when its median time grows by more than --threshold
+(a ratio) and by more than --min-ms, so sub-millisecond noise is ignored.
+Exits 1 when anything regressed.
+
+Usage: python -m benchmarks.compare base.json new.json [--threshold 1.2]
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base, new, threshold=1.2, min_ms=0.05):
+    """Yield (rows, case, base_ms, new_ms, ratio, regressed) for cases in both files."""
+    for rows, cases in new["results"].items():
+        base_cases = base["results"].get(rows, {})
+        for case, result in cases.items():
+            before = base_cases.get(case)
+            if not before or "median_ms" not in before or "median_ms" not in result:
+                continue
+            base_ms, new_ms = before["median_ms"], result["median_ms"]
+            ratio = new_ms / base_ms if base_ms else float("inf")
+            regressed = ratio > threshold and new_ms - base_ms > min_ms
+            yield rows, case, base_ms, new_ms, ratio, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+    base, new = load(args.base), load(args.new)
+
+    for key in ("seed", "end", "generator_version"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: {key} differs ({base['meta'].get(key)} vs {new['meta'].get(key)})")
+    print(f"base {base['meta'].get('commit')}  ->  new {new['meta'].get('commit')}\n")
+    print(f"{'rows':>10}  {'case':<42} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    regressions = 0
+    for rows, case, base_ms, new_ms, ratio, regressed in compare(
+            base, new, args.threshold, args.min_ms):
+        flag = "  REGRESSED" if regressed else ""
+        regressions += regressed
+        print(f"{int(rows):>10,}  {case:<42} {base_ms:>10.3f} {new_ms:>10.3f} {ratio:>6.2f}x{flag}")
+    print(f"\n{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+# benchmarks/suite.py
+"""Time every public ExpenseTracker method on synthetic histories.
+
+For each size a seeded synthetic database is generated (or reused from
+--db-dir), then each case runs up to --repeat times within a time budget and
+the min/median are recorded. Besides the tracker methods this covers the GUI
+refresh query (ExpenseTracker.snapshot, cold and cached) and the chart data
+loaders from main/visualize_expenses.py. Write cases undo their rows
+afterwards, so a reused database keeps the same contents.
+
+Results go to a JSON file that benchmarks.compare can diff between commits.
+
+Usage: python -m benchmarks.suite [--rows 10000 100000] [--seed 42] [--out results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'main'))
+from benchmarks.synthetic import GENERATOR_VERSION, fill
+from expense_db.migrations import LATEST_VERSION
+from expense_db.tracker import ExpenseTracker, period_start
+
+DEFAULT_ROWS = (10_000, 100_000)
+# Never produced by the generator, so write cases can clean up after themselves
+BENCH_DESCRIPTION = "benchmark write"
+
+
+def read_cases(tracker, rows):
+    """(name, callable) pairs that only read."""
+    conn = tracker._connection()
+    middle = conn.execute(
+        "SELECT date, id FROM expenses ORDER BY date DESC, id DESC LIMIT 1 OFFSET ?",
+        (rows // 2,),
+    ).fetchone()
+    rng = random.Random(0)
+    max_id = conn.execute("SELECT MAX(id) FROM expenses").fetchone()[0] or 1
+
+    def iterate_all():
+        for _ in tracker.iter_expenses():
+            pass
+
+    cases = [
+        ("get_all_expenses", tracker.get_all_expenses),
+        ("iter_expenses", iterate_all),
+        ("get_expenses_page/first", lambda: tracker.get_expenses_page(100)),
+        ("get_expenses_page/after_middle", lambda: tracker.get_expenses_page(100, after=middle)),
+        ("get_expenses_page/before_middle", lambda: tracker.get_expenses_page(100, before=middle)),
+        ("get_expenses_by_period/7", lambda: tracker.get_expenses_by_period(7)),
+        ("get_expenses_by_period/30", lambda: tracker.get_expenses_by_period(30)),
+        ("get_summary_by_category/7", lambda: tracker.get_summary_by_category(7)),
+        ("get_summary_by_category/365", lambda: tracker.get_summary_by_category(365)),
+        ("get_daily_totals/30", lambda: tracker.get_daily_totals(30)),
+        ("get_weekly_totals/12", lambda: tracker.get_weekly_totals(12)),
+        ("get_monthly_totals/12", lambda: tracker.get_monthly_totals(12)),
+        ("get_category_stats/7", lambda: tracker.get_category_stats(7)),
+        ("get_period_summaries/week_month_year",
+         lambda: tracker.get_period_summaries({"week": 7, "month": 30, "year": 365})),
+        ("get_expense", lambda: tracker.get_expense(rng.randint(1, max_id))),
+        ("search/common_word", lambda: tracker.search("lunch")),
+        ("search/prefix_category_30_days", lambda: tracker.search(
+            "gro", (period_start(30), None), "Food")),
+        ("change_counter", tracker.change_counter),
+        ("data_version", tracker.data_version),
+        ("verify_rollup", tracker.verify_rollup),
+        # What the GUI runs on every refresh
+        ("refresh/snapshot", lambda: tracker.snapshot(100, 7)),
+    ]
+    return [(name, func) for name, func in cases if middle or "middle" not in name]
+
+
+def chart_cases(tracker):
+    """Chart data loaders; charts whose optional dependency is missing are skipped."""
+    import visualize_expenses
+    cases = []
+    for chart, (load, _draw, _figsize) in visualize_expenses.CHARTS.items():
+        for days in (30, 365):
+            cases.append((f"chart/{chart}/{days}", lambda load=load, days=days: load(tracker, days)))
+    return cases
+
+
+def cached_refresh_case(db_path):
+    """The GUI refresh through a tracker with the result cache on (all hits after the first)."""
+    cached = ExpenseTracker(db_path, result_cache_entries=64)
+    return cached, ("refresh/snapshot_cached", lambda: cached.snapshot(100, 7))
+
+
+def write_cases(tracker):
+    """Write cases; the rows they add are described as BENCH_DESCRIPTION."""
+    today = date.today().isoformat()
+
+    def delete_one():
+        expense_id = tracker.add_expense("Food", 1, today, BENCH_DESCRIPTION)
+        start = time.perf_counter()
+        tracker.delete_expense(expense_id)
+        return time.perf_counter() - start
+
+    return [
+        ("add_expense", lambda: tracker.add_expense("Food", 123.45, today, BENCH_DESCRIPTION)),
+        ("add_expenses/1000", lambda: tracker.add_expenses(
+            [("Food", 10 + i % 90, today, BENCH_DESCRIPTION) for i in range(1000)])),
+        ("delete_expense", delete_one),
+        ("rebuild_rollup", tracker.rebuild_rollup),
+    ]
+
+
+def measure(func, repeat, budget):
+    """Run ``func`` up to ``repeat`` times (at least once) within ``budget`` seconds."""
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < repeat and (not times or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        inner = func()
+        elapsed = time.perf_counter() - start
+        # Cases that need untimed setup return their own timing
+        times.append(inner if isinstance(inner, float) else elapsed)
+    return {
+        "runs": len(times),
+        "min_ms": min(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+    }
+
+
+def database(rows, seed, db_dir, end):
+    """Return (path, fill seconds or None when reused) for a synthetic database."""
+    name = f"synthetic-{rows}-s{seed}-g{GENERATOR_VERSION}-v{LATEST_VERSION}-{end}.db"
+    path = os.path.join(db_dir, name)
+    if os.path.exists(path):
+        return path, None
+    tracker = ExpenseTracker(path + ".tmp", synchronous="OFF")
+    start = time.perf_counter()
+    fill(tracker, rows, seed, end=end)
+    elapsed = time.perf_counter() - start
+    tracker._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    tracker.close()
+    os.replace(path + ".tmp", path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + ".tmp" + suffix):
+            os.remove(path + ".tmp" + suffix)
+    return path, elapsed
+
+
+def run_size(rows, seed, db_dir, end, repeat, budget, progress):
+    path, fill_s = database(rows, seed, db_dir, end)
+    results = {}
+    if fill_s is not None:
+        results["fill"] = {"runs": 1, "min_ms": fill_s * 1000, "median_ms": fill_s * 1000,
+                           "rows_per_second": rows / fill_s}
+    tracker = ExpenseTracker(path)
+    cached, cached_case = cached_refresh_case(path)
+    try:
+        for name, func in read_cases(tracker, rows) + [cached_case] + chart_cases(tracker):
+            try:
+                results[name] = measure(func, repeat, budget)
+            except ImportError as exc:
+                results[name] = {"skipped": str(exc)}
+            progress(rows, name, results[name])
+
+        try:
+            for name, func in write_cases(tracker):
+                results[name] = measure(func, repeat, budget)
+                progress(rows, name, results[name])
+        finally:
+            # Put the database back the way it was generated
+            conn = tracker._connection()
+            with conn:
+                conn.execute("DELETE FROM expenses WHERE description = ?", (BENCH_DESCRIPTION,))
+    finally:
+        cached.close()
+        tracker.close()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(rows, name, result):
+    if "skipped" in result:
+        print(f"{rows:>10,}  {name:<42} skipped: {result['skipped']}")
+    else:
+        print(f"{rows:>10,}  {name:<42} {result['median_ms']:>10.3f} ms  (min {result['min_ms']:.3f}, "
+              f"{result['runs']} runs)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ExpenseTracker on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                        help="database sizes to test (10k to 10M rows)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", default=date.today().isoformat(),
+                        help="last date of the synthetic history (default today)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="seconds per case after which no more runs start")
+    parser.add_argument("--db-dir", help="keep generated databases here and reuse them")
+    parser.add_argument("--out", default="bench-results.json")
+    args = parser.parse_args(argv)
+    end = date.fromisoformat(args.end)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "end": end.isoformat(),
+            "generator_version": GENERATOR_VERSION,
+            "schema_version": LATEST_VERSION,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        db_dir = args.db_dir or tmp
+        os.makedirs(db_dir, exist_ok=True)
+        for rows in args.rows:
+            report["results"][str(rows)] = run_size(
+                rows, args.seed, db_dir, end, args.repeat, args.budget, print_result)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# benchmarks/synthetic.py
+"""Seeded synthetic expense histories for benchmarks.
+
+The same (rows, seed, end date, skew) always produces the same expenses.
+Categories follow a Zipf-like distribution, each with its own amount
+profile and description vocabulary; weekends and recent months are busier
+than the rest, and some descriptions are empty.
+"""
+import random
+from datetime import date, timedelta
+
+GENERATOR_VERSION = 1
+
+# category -> (median amount in pesos, spread, descriptions)
+CATEGORY_PROFILES = {
+    "Food": (180, 0.7, ["Lunch", "Groceries", "Coffee", "Dinner out", "Snacks", "Jollibee"]),
+    "Transport": (60, 0.8, ["Jeepney", "Grab", "MRT", "Gas", "Tricycle", "Parking"]),
+    "Bills": (1800, 0.5, ["Electricity", "Water", "Internet", "Phone load", "Rent"]),
+    "Shopping": (900, 1.0, ["Clothes", "Shoes", "Lazada order", "Shopee order", "Gadgets"]),
+    "Entertainment": (450, 0.8, ["Movie", "Netflix", "Concert", "Games", "Karaoke"]),
+    "Health": (700, 0.9, ["Pharmacy", "Checkup", "Vitamins", "Dentist"]),
+    "Education": (1200, 0.9, ["Books", "Tuition", "Online course", "School supplies"]),
+    "Other": (300, 1.2, ["Gift", "Donation", "Misc", "Haircut", "Laundry"]),
+}
+
+
+def generate(rows, seed=42, days=730, end=None, category_skew=1.1, empty_description=0.15):
+    """Yield ``rows`` insertable (category, cents, date, description) tuples.
+
+    Dates fall in the ``days`` days ending at ``end`` (default today), with
+    the rows sorted oldest first like a real history. ``category_skew`` is
+    the Zipf exponent: 0 spreads rows evenly, larger values favour the first
+    categories.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    categories = list(CATEGORY_PROFILES)
+    category_weights = [1 / (rank ** category_skew) for rank in range(1, len(categories) + 1)]
+
+    # Later days and weekends are busier; word choice within a category is skewed too
+    first = end - timedelta(days=days - 1)
+    day_dates = [first + timedelta(days=offset) for offset in range(days)]
+    day_weights = [(1 + offset / days) * (1.4 if d.weekday() >= 5 else 1.0)
+                   for offset, d in enumerate(day_dates)]
+    day_counts = _split(rows, day_weights, rng)
+
+    for day, count in zip(day_dates, day_counts):
+        iso = day.isoformat()
+        for category in rng.choices(categories, category_weights, k=count):
+            median, spread, words = CATEGORY_PROFILES[category]
+            cents = max(1, round(rng.lognormvariate(0, spread) * median * 100))
+            if rng.random() < empty_description:
+                description = ""
+            else:
+                description = words[min(int(rng.expovariate(0.8)), len(words) - 1)]
+            yield (category, cents, iso, description)
+
+
+def _split(total, weights, rng):
+    """Split ``total`` into integer counts proportional to ``weights``."""
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in rng.choices(range(len(weights)), weights, k=total - sum(counts)):
+        counts[index] += 1
+    return counts
+
+
+def fill(tracker, rows, seed=42, batch_size=50_000, **options):
+    """Insert a synthetic history into ``tracker``; returns the number of rows."""
+    batch = []
+    inserted = 0
+    for expense in generate(rows, seed, **options):
+        batch.append(expense)
+        if len(batch) == batch_size:
+            tracker._insert_batch(batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        tracker._insert_batch(batch)
+        inserted += len(batch)
+    return inserted
@@ -0,0 +1,120 @@
+# expense_db/analytics.py
+"""Columnar expense analytics with NumPy.
+
+load_columns() reads (day, category code, amount) for a period into
+contiguous arrays in one pass over the backend's rows. ExpenseColumns then groups,
+accumulates and ranks them with vectorised kernels (np.bincount, np.cumsum,
+np.sort) instead of Python loops. Amounts stay in integer centavos until
+a result is returned in pesos.
+
+NumPy is an optional dependency: it is imported with this module, so import
+the module only where the analytics are needed.
+"""
+import numpy as np
+
+from .days import WEEK_OFFSET, days_ago
+
+ROW_DTYPE = np.dtype([("day", np.int32), ("category", np.int32), ("amount", np.int64)])
+# percentiles() packs (category, amount) into one int64 sort key; amounts
+# must fit below this many bits (about 11 trillion pesos).
+AMOUNT_BITS = 40
+
+
+class ExpenseColumns:
+    """Expenses as parallel arrays; ``categories[code]`` names each category code."""
+
+    def __init__(self, day, category, amount, categories):
+        self.day = day
+        self.category = category
+        self.amount = amount
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.day)
+
+    @staticmethod
+    def _grouped(keys, weights):
+        """Sum weights over every integer key from the smallest to the largest.
+
+        Returns (keys, totals); keys with nothing in them total 0, so the
+        result can be plotted or accumulated without filling gaps.
+        """
+        if not len(keys):
+            return np.empty(0, np.int64), np.empty(0)
+        low = keys.min()
+        totals = np.bincount(keys - low, weights=weights)
+        return np.arange(low, low + len(totals)), totals
+
+    def _daily(self):
+        """Return (day numbers, totals in pesos) for every day in the range."""
+        days, totals = self._grouped(self.day, self.amount)
+        return days, totals / 100
+
+    def by_category(self):
+        """Return {category: total pesos}."""
+        totals = np.bincount(self.category, weights=self.amount,
+                             minlength=len(self.categories)) / 100
+        return dict(zip(self.categories, totals.tolist()))
+
+    def by_day(self):
+        """Return (datetime64[D] days, totals) for every day in the range."""
+        days, totals = self._daily()
+        return days.astype("datetime64[D]"), totals
+
+    # Weeks and months regroup the daily totals, so the per-row work is a
+    # single bincount however many buckets are asked for.
+    def by_week(self):
+        """Return (datetime64[D] Mondays, totals) for every week in the range."""
+        days, totals = self._daily()
+        weeks, totals = self._grouped((days + WEEK_OFFSET) // 7, totals)
+        return (weeks * 7 - WEEK_OFFSET).astype("datetime64[D]"), totals
+
+    def by_month(self):
+        """Return (datetime64[M] months, totals) for every month in the range."""
+        days, totals = self._daily()
+        months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        months, totals = self._grouped(months, totals)
+        return months.astype("datetime64[M]"), totals
+
+    def cumulative(self):
+        """Return (datetime64[D] days, running total) for every day in the range."""
+        days, totals = self.by_day()
+        return days, np.cumsum(totals)
+
+    def percentiles(self, q=(50, 90, 99)):
+        """Return {category: {q: amount}} using linear interpolation, like np.percentile.
+
+        One sort of (category, amount) keys orders amounts within each
+        category; every percentile of every category is then read off by
+        index arithmetic.
+        """
+        counts = np.bincount(self.category, minlength=len(self.categories))
+        keys = np.sort((self.category.astype(np.int64) << AMOUNT_BITS) | self.amount)
+        amounts = (keys & ((1 << AMOUNT_BITS) - 1)) / 100
+        starts = np.cumsum(counts) - counts
+        present = np.flatnonzero(counts)
+        fractions = np.asarray(q, dtype=float) / 100
+        position = starts[present, None] + (counts[present, None] - 1) * fractions
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        values = amounts[low] + (amounts[high] - amounts[low]) * (position - low)
+        return {self.categories[code]: dict(zip(q, row))
+                for code, row in zip(present.tolist(), values.tolist())}
+
+
+def load_columns(tracker, days=None):
+    """Load the last N days of expenses (all of them when ``days`` is None)."""
+    start = days_ago(days) if days is not None else -2 ** 31
+    cursor = tracker.backend.columns(start)
+    # Category names become dense codes in order of first appearance
+    codes = {}
+    rows = np.fromiter(
+        ((day, codes.setdefault(category, len(codes)), cents) for day, category, cents in cursor),
+        dtype=ROW_DTYPE,
+    )
+    return ExpenseColumns(
+        np.ascontiguousarray(rows["day"]),
+        np.ascontiguousarray(rows["category"]),
+        np.ascontiguousarray(rows["amount"]),
+        list(codes),
+    )
@@ -0,0 +1,126 @@
+# expense_db/async_tracker.py
+"""Awaitable ExpenseTracker for asyncio code.
+
+Every call runs on a thread pool so the event loop never waits on SQLite.
+Writes go to a single writer thread, which serialises them on one
+connection. Reads go to a pool of reader threads; each reader has its own
+connection (the SQLite backend keeps one per thread), so under WAL they run
+concurrently with each other and with a write, each seeing the last
+committed state. Backends without per-thread connections (an in-memory
+database, MemoryBackend) run reads on the writer thread too.
+
+    async with AsyncExpenseTracker("expenses.db") as tracker:
+        await tracker.add_expense("Food", 150)
+        async for expense in tracker.iter_expenses():
+            ...
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .tracker import ExpenseTracker, page_key
+
+
+def _read(name):
+    """Build an async method that runs ExpenseTracker.<name> on a reader thread."""
+    method = getattr(ExpenseTracker, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(self._readers, method, *args, **kwargs)
+    return wrapper
+
+
+def _write(name):
+    """Build an async method that runs ExpenseTracker.<name> on the writer thread."""
+    method = getattr(ExpenseTracker, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(self._writer, method, *args, **kwargs)
+    return wrapper
+
+
+class AsyncExpenseTracker:
+    def __init__(self, db_name="expenses.db", readers=4, **options):
+        """Open the database; ``options`` are passed on to ExpenseTracker.
+
+        The tracker is created (and migrated) on the writer thread, so the
+        constructor blocks until the schema is up to date.
+        """
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="expense-db-writer")
+        try:
+            self.tracker = self._writer.submit(ExpenseTracker, db_name, **options).result()
+        except BaseException:
+            self._writer.shutdown()
+            raise
+        if self.tracker.backend.shared:
+            self._readers = self._writer
+        else:
+            self._readers = ThreadPoolExecutor(readers, thread_name_prefix="expense-db-reader")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def _run(self, executor, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(method, self.tracker, *args, **kwargs))
+
+    async def close(self):
+        """Wait for running calls to finish, then close every connection."""
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown)
+
+    def _shutdown(self):
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        self.tracker.close()
+
+    add_expense = _write("add_expense")
+    add_expenses = _write("add_expenses")
+    delete_expense = _write("delete_expense")
+    rebuild_rollup = _write("rebuild_rollup")
+
+    get_all_expenses = _read("get_all_expenses")
+    get_expenses_page = _read("get_expenses_page")
+    get_expenses_by_period = _read("get_expenses_by_period")
+    get_expenses_batch = _read("get_expenses_batch")
+    get_summary_by_category = _read("get_summary_by_category")
+    get_daily_totals = _read("get_daily_totals")
+    get_weekly_totals = _read("get_weekly_totals")
+    get_monthly_totals = _read("get_monthly_totals")
+    get_category_stats = _read("get_category_stats")
+    get_period_summaries = _read("get_period_summaries")
+    get_expense = _read("get_expense")
+    search = _read("search")
+    snapshot = _read("snapshot")
+    change_counter = _read("change_counter")
+    data_version = _read("data_version")
+    verify_rollup = _read("verify_rollup")
+
+    async def iter_pages(self, page_size=500, after=None):
+        """Yield every expense newest first, one list of up to ``page_size`` rows at a time.
+
+        Each page is a separate keyset query: rows committed while iterating
+        may or may not be seen, but rows that exist throughout are each
+        yielded exactly once.
+        """
+        while True:
+            page = await self._run(self._readers, ExpenseTracker._fetch_page, page_size, after)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = page_key(page[-1])
+
+    async def iter_expenses(self, page_size=500, after=None):
+        """Yield every expense newest first, fetching ``page_size`` rows at a time."""
+        async for page in self.iter_pages(page_size, after):
+            for expense in page:
+                yield expense
@@ -0,0 +1,104 @@
+# expense_db/cache.py
+"""LRU cache for query results, bounded by entry count and approximate bytes.
+
+Every invalidation bumps a generation number. A reader notes the generation
+before running its query and the result is only stored if no invalidation
+happened in between, so a write racing a read cannot leave a stale entry.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from .records import Expense, ExpenseBatch
+
+MISSING = object()
+# Containers longer than this are sized from a sample of their items
+SIZE_SAMPLE = 64
+
+
+def estimate_size(value):
+    """Approximate the memory held by a query result in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:SIZE_SAMPLE]
+        per_item = sum(estimate_size(k) + estimate_size(v) for k, v in sample)
+    elif isinstance(value, Expense):
+        return size + sum(sys.getsizeof(field) for field in value)
+    elif isinstance(value, ExpenseBatch):
+        columns = (value.ids, value.cents, value.days, value.category_codes)
+        return (size + sum(sys.getsizeof(column) for column in columns)
+                + estimate_size(value.categories) + estimate_size(value.descriptions))
+    elif isinstance(value, (list, tuple)):
+        sample = value[:SIZE_SAMPLE]
+        per_item = sum(estimate_size(item) for item in sample)
+        items = value
+    else:
+        return size
+    if sample:
+        size += per_item * len(items) // len(sample)
+    return size
+
+
+class ResultCache:
+    def __init__(self, max_entries=128, max_bytes=8 * 1024 * 1024):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value (marking it recently used) or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, generation):
+        """Store a value computed during ``generation``; dropped if it is stale or too big."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry and start a new generation."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
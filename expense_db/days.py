@@ -0,0 +1,66 @@
+# expense_db/days.py
+"""Integer day and month numbers for expense dates.
+
+The schema stores each date's day number (days since 1970-01-01) next to the
+'YYYY-MM-DD' text, and the daily rollup carries a month number (months since
+January 1970), so period filters compare integers and weekly and monthly
+buckets are integer arithmetic inside SQLite. These helpers convert between
+those numbers and dates.
+"""
+from datetime import date as date_type, datetime, timedelta
+
+EPOCH = date_type(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+# 1970-01-01 was a Thursday; shifting by 3 makes weeks start on Monday.
+WEEK_OFFSET = 3
+
+
+def date_to_day(value):
+    """Return the day number of a date or 'YYYY-MM-DD' string."""
+    if isinstance(value, str):
+        value = date_type.fromisoformat(value)
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def day_to_date(day):
+    """Return the 'YYYY-MM-DD' string for a day number."""
+    return date_type.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+
+def current_day():
+    """Return today's day number in local time."""
+    return date_to_day(datetime.now().date())
+
+
+def week_of(day):
+    """Return the Monday-based week number containing a day number."""
+    return (day + WEEK_OFFSET) // 7
+
+
+def week_start(week):
+    """Return the 'YYYY-MM-DD' Monday that starts a week number."""
+    return day_to_date(week * 7 - WEEK_OFFSET)
+
+
+def month_of(value):
+    """Return the month number of a date or 'YYYY-MM-DD' string."""
+    if isinstance(value, str):
+        value = date_type.fromisoformat(value)
+    return (value.year - 1970) * 12 + value.month - 1
+
+
+def month_label(month):
+    """Return 'YYYY-MM' for a month number."""
+    year, index = divmod(month, 12)
+    return f"{1970 + year:04d}-{index + 1:02d}"
+
+
+def month_start_day(month):
+    """Return the day number of the first day of a month number."""
+    year, index = divmod(month, 12)
+    return date_to_day(date_type(1970 + year, index + 1, 1))
+
+
+def days_ago(days):
+    """Return the day number N days before today (the "last N days" cutoff)."""
+    return date_to_day((datetime.now() - timedelta(days=days)).date())
@@ -0,0 +1,308 @@
+# expense_db/importer.py
+"""Stream CSV and JSON Lines files into an ExpenseTracker.
+
+Rows flow through a chain of generators -- read, map columns, parse dates and
+amounts, validate -- and are inserted in batches, so memory use does not grow
+with the file size. Rows that fail are written to an optional reject file as
+JSON Lines ({"line": ..., "error": ..., "record": ...}).
+
+Usage: python -m expense_db.importer statement.csv [--db expenses.db]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+
+from .money import to_cents
+from .tracker import ExpenseTracker, _is_iso_date
+
+# Header names recognised for each expense field, checked case-insensitively.
+COLUMN_ALIASES = {
+    "date": ("date", "transaction date", "trans date", "posting date", "posted date",
+             "value date", "booking date"),
+    "amount": ("amount", "debit", "debit amount", "withdrawal", "withdrawals",
+               "money out", "paid out", "value"),
+    "category": ("category", "type", "transaction type"),
+    "description": ("description", "details", "memo", "narrative", "payee",
+                    "merchant", "particulars", "reference"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y",
+                "%d.%m.%Y", "%d %b %Y", "%d-%b-%Y", "%b %d, %Y", "%Y%m%d")
+
+_AMOUNT_JUNK = re.compile(r"[^0-9.\-]")
+_PLAIN_NUMBER = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+class ImportStats:
+    """Running counters for one import, passed to the progress callback."""
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.first_id = None
+        self.last_id = None
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        return (f"ImportStats(read={self.read}, inserted={self.inserted}, "
+                f"rejected={self.rejected}, elapsed={self.elapsed:.2f}s)")
+
+
+def detect_format(path):
+    """Guess 'csv', 'tsv' or 'jsonl' from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext in (".tsv", ".tab"):
+        return "tsv"
+    return "csv"
+
+
+def resolve_columns(names, columns=None):
+    """Map expense fields to source column names.
+
+    ``columns`` overrides auto-detection for individual fields; everything
+    else is matched against COLUMN_ALIASES. Raises ValueError when no amount
+    column can be found.
+    """
+    lookup = {name.strip().lower(): name for name in names}
+    resolved = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if columns and field in columns:
+            if columns[field] not in names:
+                raise ValueError(f"column {columns[field]!r} not found for {field}")
+            resolved[field] = columns[field]
+            continue
+        for alias in aliases:
+            if alias in lookup:
+                resolved[field] = lookup[alias]
+                break
+    if "amount" not in resolved:
+        raise ValueError(f"no amount column found in {list(names)}")
+    return resolved
+
+
+def read_csv(path, columns=None, delimiter=","):
+    """Yield (line, raw_row, (category, amount, date, description)) from a CSV file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        resolved = resolve_columns(header, columns)
+        width = len(header)
+        # Unmapped fields point one past the last column, at a padding cell.
+        fields = itemgetter(*(header.index(resolved[field]) if field in resolved else width
+                              for field in ("category", "amount", "date", "description")))
+        for line, row in enumerate(reader, 2):
+            if not row:
+                continue
+            raw = row[:]
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            row.append("")
+            yield line, raw, fields(row)
+
+
+def read_jsonl(path, columns=None):
+    """Yield (line, raw_record, (category, amount, date, description)) from JSON Lines."""
+    with open(path, encoding="utf-8-sig") as f:
+        # Objects may carry different keys, so resolve once per key layout.
+        layouts = {}
+        for line, text in enumerate(f, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                yield line, text.rstrip("\n"), exc
+                continue
+            if not isinstance(record, dict):
+                yield line, record, ValueError("expected a JSON object")
+                continue
+            keys = tuple(record)
+            resolved = layouts.get(keys)
+            if resolved is None:
+                if len(layouts) >= 256:
+                    layouts.clear()
+                try:
+                    resolved = layouts[keys] = resolve_columns(keys, columns)
+                except ValueError as exc:
+                    yield line, record, exc
+                    continue
+            yield line, record, tuple(record.get(resolved[field]) if field in resolved else None
+                                      for field in ("category", "amount", "date", "description"))
+
+
+def parse_amount(value, sign=1):
+    """Parse '1,234.50', '₱12', '(4.00)' or '12.00-' into integer centavos times ``sign``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return to_cents(value) * sign
+    text = str(value).strip()
+    try:
+        return to_cents(text) * sign
+    except ValueError:
+        # A plain number that is out of range stays rejected; stripping
+        # would turn '1e30' into 130
+        if _PLAIN_NUMBER.fullmatch(text):
+            raise
+    negative = text.startswith("(") and text.endswith(")") or text.endswith("-")
+    cleaned = _AMOUNT_JUNK.sub("", text.rstrip("-"))
+    if not cleaned:
+        raise ValueError(f"invalid amount {value!r}")
+    cents = to_cents(cleaned)
+    return (-cents if negative else cents) * sign
+
+
+def make_date_parser(formats=DATE_FORMATS):
+    """Return a cached function converting a date string to YYYY-MM-DD."""
+    @lru_cache(maxsize=4096)
+    def parse_date(value):
+        if not isinstance(value, str):
+            raise ValueError(f"invalid date {value!r}")
+        value = value.strip()
+        if _is_iso_date(value):
+            return value
+        for fmt in formats:
+            try:
+                return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+        raise ValueError(f"unrecognised date {value!r}")
+    return parse_date
+
+
+def parse_rows(rows, date_parser, default_category="Other", amount_sign=1):
+    """Turn raw field tuples into (line, raw, expense tuple or exception)."""
+    for line, raw, fields in rows:
+        if isinstance(fields, Exception):
+            yield line, raw, fields
+            continue
+        category, amount, date, description = fields
+        try:
+            if amount is None or amount == "":
+                raise ValueError("missing amount")
+            if not date:
+                raise ValueError("missing date")
+            cents = parse_amount(amount, amount_sign)
+            if cents <= 0:
+                raise ValueError(f"amount must be positive, got {amount!r}")
+            if not category:
+                category = default_category
+            elif not isinstance(category, str):
+                raise ValueError(f"invalid category {category!r}")
+            expense = (category.strip() or default_category, cents,
+                       date_parser(date), description or "")
+        except ValueError as exc:
+            yield line, raw, exc
+            continue
+        yield line, raw, expense
+
+
+def import_file(tracker, path, fmt=None, columns=None, reject_path=None,
+                batch_size=5000, date_formats=DATE_FORMATS, default_category="Other",
+                amount_sign=1, progress=None):
+    """Stream ``path`` into ``tracker`` and return an ImportStats.
+
+    ``amount_sign=-1`` suits statements that list spending as negative
+    amounts. ``progress`` is called with the ImportStats after every batch.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "jsonl":
+        rows = read_jsonl(path, columns)
+    elif fmt in ("csv", "tsv"):
+        rows = read_csv(path, columns, "\t" if fmt == "tsv" else ",")
+    else:
+        raise ValueError(f"unsupported format {fmt!r}")
+
+    stats = ImportStats()
+    parsed = parse_rows(rows, make_date_parser(date_formats), default_category, amount_sign)
+    rejects = open(reject_path, "w", encoding="utf-8") if reject_path else None
+    try:
+        while True:
+            chunk = list(islice(parsed, batch_size))
+            if not chunk:
+                break
+            batch = []
+            for line, raw, result in chunk:
+                if isinstance(result, Exception):
+                    stats.rejected += 1
+                    if rejects:
+                        rejects.write(json.dumps({"line": line, "error": str(result),
+                                                  "record": raw}, ensure_ascii=False) + "\n")
+                else:
+                    batch.append(result)
+            stats.read += len(chunk)
+            if batch:
+                ids = tracker._insert_batch(batch)
+                stats.inserted += len(batch)
+                if stats.first_id is None:
+                    stats.first_id = ids.start
+                stats.last_id = ids.stop - 1
+            if progress:
+                progress(stats)
+    finally:
+        if rejects:
+            rejects.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import expenses from CSV or JSON Lines.")
+    parser.add_argument("path")
+    parser.add_argument("--db", default="expenses.db")
+    parser.add_argument("--format", choices=("csv", "tsv", "jsonl"))
+    parser.add_argument("--map", action="append", default=[], metavar="FIELD=COLUMN",
+                        help="map an expense field (date, amount, category, description) to a column")
+    parser.add_argument("--reject", metavar="PATH", help="write failed rows to this JSONL file")
+    parser.add_argument("--date-format", action="append", metavar="FMT",
+                        help="strptime format to try (repeatable, replaces the defaults)")
+    parser.add_argument("--negate", action="store_true",
+                        help="amounts are negative for spending (bank statement style)")
+    parser.add_argument("--category", default="Other", help="category for rows without one")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    columns = {}
+    for item in args.map:
+        field, sep, column = item.partition("=")
+        if not sep or field not in COLUMN_ALIASES:
+            parser.error(f"invalid --map {item!r}")
+        columns[field] = column
+
+    def report(stats):
+        print(f"\r{stats.read:,} rows  {stats.inserted:,} inserted  "
+              f"{stats.rejected:,} rejected  {stats.rows_per_second:,.0f} rows/s",
+              end="", file=sys.stderr)
+
+    with ExpenseTracker(args.db) as tracker:
+        stats = import_file(tracker, args.path, args.format, columns, args.reject,
+                            args.batch_size, tuple(args.date_format or DATE_FORMATS),
+                            args.category, -1 if args.negate else 1, report)
+    print(file=sys.stderr)
+    print(f"Imported {stats.inserted:,} of {stats.read:,} rows in {stats.elapsed:.2f}s")
+    if stats.rejected:
+        print(f"{stats.rejected:,} rows rejected" + (f", see {args.reject}" if args.reject else ""))
+    return 0 if stats.inserted or not stats.read else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
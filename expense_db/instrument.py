@@ -0,0 +1,179 @@
+# expense_db/instrument.py
+"""Per-call timing, histograms and a slow-query log for ExpenseTracker.
+
+Attach an Instrumentation with ExpenseTracker(instrumentation=...) or
+tracker.instrument(...). Each public tracker call then records its wall
+time, rows returned and approximate bytes, grouped per method with a
+latency histogram. Calls slower than ``slow_ms`` go to a bounded log with
+the SQL they ran (captured with a connection trace callback, parameters
+expanded) and its EXPLAIN QUERY PLAN. With no instrumentation attached a
+call costs one attribute check.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from .cache import estimate_size
+from .records import Expense, ExpenseBatch
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+# Distinct statements kept per call; executemany repeats one statement per row
+MAX_STATEMENTS = 20
+_PLANNABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Bookkeeping statements that would only crowd the slow log
+_IGNORED = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "SELECT last_insert_rowid()")
+
+
+class MethodStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds, rows, nbytes):
+        self.calls += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.bytes += nbytes
+        ms = seconds * 1000
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if ms <= bound:
+                break
+        else:
+            index = len(HISTOGRAM_BOUNDS_MS)
+        self.histogram[index] += 1
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000,
+            "avg_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+            "min_ms": self.min * 1000 if self.calls else 0.0,
+            "max_ms": self.max * 1000,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "histogram": dict(zip(histogram_labels(), self.histogram)),
+        }
+
+
+def histogram_labels():
+    """Bucket labels matching MethodStats.histogram, e.g. '<=0.1ms' and '>1000ms'."""
+    return [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+
+
+def count_rows(result):
+    """Rows in a tracker result: list, dict and batch lengths, 1 for a single row, else 0."""
+    if isinstance(result, (list, dict, range, ExpenseBatch)):
+        return len(result)
+    if isinstance(result, (tuple, Expense)):
+        return 1
+    return 0
+
+
+class Instrumentation:
+    def __init__(self, slow_ms=50, slow_log_size=100):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._methods = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    def trace(self, statement):
+        """Connection trace callback: remember the SQL run by the current call."""
+        statements = getattr(self._local, "statements", None)
+        if statements is not None and len(statements) < MAX_STATEMENTS:
+            statement = statement.strip()
+            if statement not in statements and not statement.startswith(_IGNORED):
+                statements.append(statement)
+
+    def call(self, tracker, name, method, args, kwargs):
+        """Run a tracker method and record it; calls made from inside it are not recorded."""
+        if getattr(self._local, "statements", None) is not None:
+            return method(tracker, *args, **kwargs)
+        self._local.statements = []
+        start = time.perf_counter()
+        try:
+            result = method(tracker, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            statements, self._local.statements = self._local.statements, None
+        rows = count_rows(result)
+        nbytes = estimate_size(result) if rows else 0
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = MethodStats()
+            stats.add(elapsed, rows, nbytes)
+        if elapsed * 1000 >= self.slow_ms:
+            self._log_slow(tracker, name, args, kwargs, elapsed, rows, nbytes, statements)
+        return result
+
+    def _log_slow(self, tracker, name, args, kwargs, elapsed, rows, nbytes, statements):
+        plans = {}
+        for statement in statements:
+            if statement.split(None, 1)[0].upper() in _PLANNABLE:
+                try:
+                    plans[statement] = tracker.explain(statement)
+                except Exception as exc:
+                    plans[statement] = [f"(no plan: {exc})"]
+        arguments = [repr(arg) for arg in args] + [f"{k}={v!r}" for k, v in kwargs.items()]
+        entry = {
+            "when": datetime.now().isoformat(timespec="seconds"),
+            "method": name,
+            "args": ", ".join(arguments)[:200],
+            "ms": elapsed * 1000,
+            "rows": rows,
+            "bytes": nbytes,
+            "statements": [{"sql": sql, "plan": plans.get(sql, [])} for sql in statements],
+        }
+        with self._lock:
+            self._slow.append(entry)
+
+    def stats(self):
+        """Return {method: {calls, total_ms, avg_ms, min_ms, max_ms, rows, bytes, histogram}}."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._methods.items())}
+
+    def slow_queries(self):
+        """Return the slow-call log, oldest first."""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._slow.clear()
+
+    def report(self, slow_limit=5):
+        """Format the per-method table, histograms and recent slow calls as text."""
+        stats = self.stats()
+        if not stats:
+            return "No database calls recorded yet."
+        lines = [f"{'method':<26} {'calls':>6} {'avg ms':>9} {'max ms':>9} {'rows':>9} {'KB':>9}"]
+        for name, s in stats.items():
+            lines.append(f"{name:<26} {s['calls']:>6} {s['avg_ms']:>9.2f} {s['max_ms']:>9.2f} "
+                         f"{s['rows']:>9} {s['bytes'] / 1024:>9.1f}")
+        lines.append("")
+        lines.append("Latency histograms (calls per bucket):")
+        for name, s in stats.items():
+            buckets = [f"{label} {count}" for label, count in s["histogram"].items() if count]
+            lines.append(f"  {name:<24} {', '.join(buckets)}")
+        slow = self.slow_queries()[-slow_limit:]
+        lines.append("")
+        lines.append(f"Slow calls (>= {self.slow_ms} ms): {len(self.slow_queries())}")
+        for entry in slow:
+            lines.append(f"  {entry['when']} {entry['method']}({entry['args']}) "
+                         f"{entry['ms']:.1f} ms, {entry['rows']} rows")
+            for statement in entry["statements"]:
+                lines.append(f"      SQL:  {' '.join(statement['sql'].split())[:120]}")
+                for detail in statement["plan"]:
+                    lines.append(f"      PLAN: {detail}")
+        return "\n".join(lines)
@@ -0,0 +1,284 @@
+# expense_db/ledgers.py
+"""Summaries and exports across several expense databases ("ledgers") at once.
+
+Each ledger (one expenses.db per household or department) is queried in a
+worker process, so N ledgers take about as long as the slowest one on a
+machine with N cores. Workers return integer centavos, which are merged
+exactly into a combined result next to the per-ledger ones. A ledger that
+fails (missing file, corrupt database, crashed worker) is reported in
+``failed`` and left out of the combined result instead of aborting the run.
+
+    with Ledgers(["home.db", "office.db"]) as ledgers:
+        result = ledgers.summary(30)
+        result.combined    # {category: total}
+        result.by_ledger   # {"home": {category: total}, "office": {...}}
+        result.failed      # {"office": "DatabaseError: file is not a database"}
+
+Usage: python -m expense_db.ledgers home.db office.db [--days 30] [--export all.csv]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from decimal import ROUND_HALF_UP
+
+from .days import (WEEK_OFFSET, current_day, day_to_date, days_ago, month_label, month_of,
+                   month_start_day, week_of, week_start)
+from .money import CENT, cents_to_decimal, cents_to_float
+from .tracker import ExpenseTracker
+
+LedgerResult = namedtuple("LedgerResult", "combined by_ledger failed")
+EXPORT_FIELDS = ["ledger", "id", "date", "category", "amount", "description"]
+
+# Trackers opened by this (worker) process, reused across queries
+_trackers = {}
+
+
+def _backend(path):
+    tracker = _trackers.get(path)
+    if tracker is None:
+        # Opening a missing file would create an empty ledger
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no such ledger: {path}")
+        tracker = _trackers[path] = ExpenseTracker(path)
+    # Through the tracker, so a ledger archived since it was opened is
+    # read with its archive files
+    return tracker.backend
+
+
+def _query(path, method, *args):
+    """Run one backend query on a ledger; returns a list of rows in centavos."""
+    return list(getattr(_backend(path), method)(*args))
+
+
+def _export(path, part_path, name, start_day):
+    """Write a ledger's expenses since ``start_day`` to a CSV part file; returns the count."""
+    rows = _backend(path).period(start_day)
+    with open(part_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for expense in rows:
+            writer.writerow([name, expense.id, expense.date, expense.category,
+                             f"{expense.amount:.2f}", expense.description])
+    return len(rows)
+
+
+def _close_trackers():
+    for tracker in _trackers.values():
+        tracker.close()
+    _trackers.clear()
+
+
+def _sum_series(series):
+    totals = {}
+    for rows in series:
+        for key, cents in rows:
+            totals[key] = totals.get(key, 0) + cents
+    return sorted(totals.items())
+
+
+class Ledgers:
+    def __init__(self, paths, workers=None, decimal=False):
+        """Query the ledger files in ``paths`` with a pool of ``workers`` processes.
+
+        ``paths`` is a list of database files, named by their file name
+        without extension, or a {name: path} mapping. ``workers`` defaults
+        to one per ledger up to the number of CPUs; 0 runs every query in
+        the calling process.
+        """
+        if isinstance(paths, Mapping):
+            self.paths = dict(paths)
+        else:
+            self.paths = {}
+            for path in paths:
+                name = os.path.splitext(os.path.basename(path))[0]
+                if name in self.paths:
+                    raise ValueError(f"two ledgers are named {name!r}; pass a {{name: path}} dict")
+                self.paths[name] = path
+        if workers is None:
+            workers = min(len(self.paths), os.cpu_count() or 1)
+        self.workers = workers
+        self.decimal = decimal
+        self._money = cents_to_decimal if decimal else cents_to_float
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Stop the worker processes (their connections close with them)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.workers == 0:
+            _close_trackers()
+
+    def _run(self, jobs):
+        """Run {name: (function, args)} jobs; returns ({name: result}, {name: error})."""
+        results = {}
+        failed = {}
+        if self.workers == 0:
+            for name, (function, args) in jobs.items():
+                try:
+                    results[name] = function(*args)
+                except Exception as exc:
+                    failed[name] = f"{type(exc).__name__}: {exc}"
+            return results, failed
+        broken = self._submit(jobs, results, failed)
+        # A worker that dies breaks the whole pool and fails every pending
+        # ledger with it; retry those one at a time so only the culprit fails
+        for name in broken:
+            self._submit({name: jobs[name]}, results, failed)
+        # Keep the caller's ledger order
+        return ({name: results[name] for name in jobs if name in results},
+                {name: failed[name] for name in jobs if name in failed})
+
+    def _submit(self, jobs, results, failed):
+        """Run jobs on the pool; returns the names of those lost to a broken pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        futures = {self._pool.submit(function, *args): name
+                   for name, (function, args) in jobs.items()}
+        broken = []
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                failed.pop(name, None)
+            except BrokenProcessPool as exc:
+                failed[name] = f"{type(exc).__name__}: {exc}"
+                broken.append(name)
+            except Exception as exc:
+                failed[name] = f"{type(exc).__name__}: {exc}"
+        if broken:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        return broken if len(jobs) > 1 else []
+
+    def _fan_out(self, function, *args):
+        """Call ``function(path, *args)`` for every ledger."""
+        return self._run({name: (function, (path,) + args) for name, path in self.paths.items()})
+
+    def _series(self, method, start_day, label):
+        """Fan out a (key, cents) series query and merge it by key."""
+        results, failed = self._fan_out(_query, method, start_day)
+        money = self._money
+        by_ledger = {name: [(label(key), money(cents)) for key, cents in rows]
+                     for name, rows in results.items()}
+        combined = [(label(key), money(cents)) for key, cents in _sum_series(results.values())]
+        return LedgerResult(combined, by_ledger, failed)
+
+    def summary(self, days=7):
+        """Total per category over the last N days (see ExpenseTracker.get_summary_by_category)."""
+        results, failed = self._fan_out(_query, "category_totals", days_ago(days))
+        money = self._money
+        by_ledger = {name: {category: money(cents) for category, cents in sorted(rows)}
+                     for name, rows in results.items()}
+        combined = {category: money(cents)
+                    for category, cents in _sum_series(results.values())}
+        return LedgerResult(combined, by_ledger, failed)
+
+    def daily_totals(self, days=30):
+        """[(date, total)] for the last N days, oldest first."""
+        return self._series("daily_totals", days_ago(days), day_to_date)
+
+    def weekly_totals(self, weeks=12):
+        """[(monday, total)] for the last N weeks including this one, oldest first."""
+        first_week = week_of(current_day()) - weeks + 1
+        return self._series("weekly_totals", first_week * 7 - WEEK_OFFSET, week_start)
+
+    def monthly_totals(self, months=12):
+        """[("YYYY-MM", total)] for the last N months including this one, oldest first."""
+        first_month = month_of(datetime.now().date()) - months + 1
+        return self._series("monthly_totals", month_start_day(first_month), month_label)
+
+    def category_stats(self, days=7):
+        """Per-category total, count, min, max and avg over the last N days."""
+        results, failed = self._fan_out(_query, "period_stats", [days_ago(days)])
+        merged = {}
+        for rows in results.values():
+            for category, total, count, low, high in rows:
+                if not count:
+                    continue
+                seen = merged.get(category)
+                if seen is not None:
+                    total, count = total + seen[0], count + seen[1]
+                    low, high = min(low, seen[2]), max(high, seen[3])
+                merged[category] = (total, count, low, high)
+        by_ledger = {name: self._stats({row[0]: row[1:] for row in rows if row[2]})
+                     for name, rows in results.items()}
+        return LedgerResult(self._stats(merged), by_ledger, failed)
+
+    def _stats(self, rows):
+        money = self._money
+        stats = {}
+        for category, (total, count, low, high) in sorted(rows.items()):
+            avg = money(total) / count
+            if self.decimal:
+                avg = avg.quantize(CENT, rounding=ROUND_HALF_UP)
+            stats[category] = {"total": money(total), "count": count,
+                               "min": money(low), "max": money(high), "avg": avg}
+        return stats
+
+    def export(self, path, days=None):
+        """Write every ledger's expenses (the last N days, or all) to one CSV file.
+
+        Each worker writes its ledger to a part file next to ``path``; the
+        parts are then joined in ledger order under one header. Returns the
+        row counts: the total as ``combined`` and each ledger's in ``by_ledger``.
+        """
+        start = days_ago(days) if days is not None else -2 ** 31
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.TemporaryDirectory(dir=directory) as parts_dir:
+            parts = {name: os.path.join(parts_dir, f"{index}.csv")
+                     for index, name in enumerate(self.paths)}
+            counts, failed = self._run({
+                name: (_export, (ledger_path, parts[name], name, start))
+                for name, ledger_path in self.paths.items()
+            })
+            with open(path, "w", newline="", encoding="utf-8") as out:
+                csv.writer(out).writerow(EXPORT_FIELDS)
+                for name in counts:
+                    with open(parts[name], newline="", encoding="utf-8") as part:
+                        for chunk in iter(lambda: part.read(1 << 20), ""):
+                            out.write(chunk)
+        return LedgerResult(sum(counts.values()), counts, failed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise several expense databases at once.")
+    parser.add_argument("ledgers", nargs="+", metavar="DB")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--export", metavar="PATH", help="also write every expense to one CSV")
+    args = parser.parse_args(argv)
+
+    with Ledgers(args.ledgers, args.workers) as ledgers:
+        result = ledgers.summary(args.days)
+        names = list(result.by_ledger)
+        print(f"{'category':<16}" + "".join(f"{name[:12]:>14}" for name in names)
+              + f"{'total':>14}")
+        for category, total in sorted(result.combined.items(), key=lambda item: -item[1]):
+            print(f"{category:<16}"
+                  + "".join(f"{result.by_ledger[name].get(category, 0):>14,.2f}" for name in names)
+                  + f"{total:>14,.2f}")
+        if args.export:
+            exported = ledgers.export(args.export, args.days)
+            print(f"Exported {exported.combined:,} expenses to {args.export}")
+            result.failed.update(exported.failed)
+    for name, error in result.failed.items():
+        print(f"{name}: skipped ({error})", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
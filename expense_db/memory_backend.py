@@ -0,0 +1,411 @@
+# expense_db/memory_backend.py
+"""In-memory storage for ExpenseTracker, with optional snapshots to disk.
+
+Expenses are held column by column (ids, day numbers and centavos in
+typed arrays, categories, dates and descriptions in lists) sorted by
+(day, id), so a period is one bisect and a keyset page is a slice. Per-day
+category totals are kept next to the rows the way the SQLite rollup
+table is, so summaries cost per day rather than per expense.
+
+    tracker = ExpenseTracker(backend=MemoryBackend())
+    tracker = ExpenseTracker(backend=MemoryBackend("expenses.snapshot"))
+
+With a path, an existing snapshot is loaded on open and close() writes a
+new one if anything changed (snapshot() writes one at any time). A
+snapshot is a pickle of the columns, so only load files you wrote.
+"""
+import os
+import pickle
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from .days import WEEK_OFFSET, day_to_date, month_of, date_to_day
+from .records import Expense
+from .storage import StorageBackend, search_words
+
+SNAPSHOT_FORMAT = "expense-memory-1"
+# Batches at least this big are appended and the columns re-sorted once,
+# instead of inserting each row at its sorted position
+RESORT_BATCH = 64
+
+
+class MemoryBackend(StorageBackend):
+    # One lock guards everything, so threads gain nothing from running reads apart
+    shared = True
+
+    def __init__(self, path=None):
+        self.path = path
+        self.name = path or ":memory:"
+        self._lock = threading.RLock()
+        self._clear()
+        self._next_id = 1
+        self._counter = 0
+        self._dirty = False
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _clear(self):
+        self._ids = array("q")
+        self._days = array("l")
+        self._cents = array("q")
+        self._categories = []
+        self._dates = []
+        self._descriptions = []
+        self._day_of = {}   # id -> day, to find a row with two bisects
+        self._totals = {}   # day -> {category: [total, count, min, max]}
+        self._active_days = []  # sorted days that have expenses
+        self._date_strings = {}  # day -> shared 'YYYY-MM-DD' string
+
+    # Snapshots
+
+    def snapshot(self, path=None):
+        """Write the expenses to ``path`` (default: the backend's path) atomically."""
+        path = path or self.path
+        if not path:
+            raise ValueError("no snapshot path given")
+        with self._lock:
+            state = {
+                "format": SNAPSHOT_FORMAT,
+                "next_id": self._next_id,
+                "counter": self._counter,
+                "ids": self._ids,
+                "days": self._days,
+                "cents": self._cents,
+                "categories": self._categories,
+                "descriptions": self._descriptions,
+            }
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+            if path == self.path:
+                self._dirty = False
+
+    def _load(self, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not an expense snapshot")
+        self._ids = state["ids"]
+        self._days = state["days"]
+        self._cents = state["cents"]
+        self._categories = [sys.intern(category) for category in state["categories"]]
+        self._descriptions = state["descriptions"]
+        self._dates = [self._date_string(day) for day in self._days]
+        self._day_of = dict(zip(self._ids, self._days))
+        self._next_id = state["next_id"]
+        self._counter = state["counter"]
+        self._rebuild_totals()
+
+    def close(self):
+        """Write a snapshot if the backend has a path and anything changed."""
+        with self._lock:
+            if self.path and self._dirty:
+                self.snapshot()
+
+    # Row storage
+
+    def _date_string(self, day):
+        date = self._date_strings.get(day)
+        if date is None:
+            date = self._date_strings[day] = day_to_date(day)
+        return date
+
+    def _row(self, position):
+        return Expense(self._ids[position], self._categories[position],
+                       self._cents[position] / 100, self._dates[position],
+                       self._descriptions[position])
+
+    def _rows_newest_first(self, low, high):
+        """Rows at positions [low, high), newest first."""
+        return [self._row(position) for position in range(high - 1, low - 1, -1)]
+
+    def _position(self, day, expense_id):
+        """Where (day, expense_id) is or would go in the sorted columns."""
+        low = bisect_left(self._days, day)
+        high = bisect_right(self._days, day, low)
+        return bisect_left(self._ids, expense_id, low, high)
+
+    def _find(self, expense_id):
+        day = self._day_of.get(expense_id)
+        if day is None:
+            return None
+        return self._position(day, expense_id)
+
+    def _insert_at(self, position, expense_id, day, category, cents, date, description):
+        self._ids.insert(position, expense_id)
+        self._days.insert(position, day)
+        self._cents.insert(position, cents)
+        self._categories.insert(position, category)
+        self._dates.insert(position, date)
+        self._descriptions.insert(position, description)
+
+    def _resort(self):
+        order = sorted(range(len(self._ids)), key=lambda i: (self._days[i], self._ids[i]))
+        self._ids = array("q", [self._ids[i] for i in order])
+        self._days = array("l", [self._days[i] for i in order])
+        self._cents = array("q", [self._cents[i] for i in order])
+        self._categories = [self._categories[i] for i in order]
+        self._dates = [self._dates[i] for i in order]
+        self._descriptions = [self._descriptions[i] for i in order]
+
+    # Per-day totals
+
+    def _add_total(self, day, category, cents):
+        categories = self._totals.get(day)
+        if categories is None:
+            categories = self._totals[day] = {}
+            insort(self._active_days, day)
+        stats = categories.get(category)
+        if stats is None:
+            categories[category] = [cents, 1, cents, cents]
+        else:
+            stats[0] += cents
+            stats[1] += 1
+            stats[2] = min(stats[2], cents)
+            stats[3] = max(stats[3], cents)
+
+    def _remove_total(self, day, category, cents):
+        categories = self._totals[day]
+        stats = categories[category]
+        stats[0] -= cents
+        stats[1] -= 1
+        if stats[1] == 0:
+            del categories[category]
+            if not categories:
+                del self._totals[day]
+                self._active_days.pop(bisect_left(self._active_days, day))
+            return
+        # Like the SQLite trigger, re-read min and max from the day's rows
+        low = bisect_left(self._days, day)
+        high = bisect_right(self._days, day, low)
+        amounts = [self._cents[i] for i in range(low, high) if self._categories[i] == category]
+        stats[2] = min(amounts)
+        stats[3] = max(amounts)
+
+    def _compute_totals(self):
+        totals = {}
+        for day, category, cents in zip(self._days, self._categories, self._cents):
+            stats = totals.setdefault(day, {}).get(category)
+            if stats is None:
+                totals[day][category] = [cents, 1, cents, cents]
+            else:
+                stats[0] += cents
+                stats[1] += 1
+                stats[2] = min(stats[2], cents)
+                stats[3] = max(stats[3], cents)
+        return totals
+
+    def _rebuild_totals(self):
+        self._totals = self._compute_totals()
+        self._active_days = sorted(self._totals)
+
+    def _days_since(self, start_day):
+        return self._active_days[bisect_left(self._active_days, start_day):]
+
+    # StorageBackend
+
+    def insert(self, rows):
+        with self._lock:
+            prepared = []
+            for category, cents, date, description in rows:
+                day = date_to_day(date)
+                if day_to_date(day) != date:
+                    raise ValueError(f"invalid date {date!r}, expected YYYY-MM-DD")
+                prepared.append((sys.intern(category), cents, self._date_string(day),
+                                 description, day))
+            first_id = self._next_id
+            appended = len(self._ids)
+            append = len(prepared) >= RESORT_BATCH
+            for expense_id, row in enumerate(prepared, first_id):
+                category, cents, date, description, day = row
+                position = len(self._ids) if append else self._position(day, expense_id)
+                self._insert_at(position, expense_id, day, category, cents, date, description)
+                self._day_of[expense_id] = day
+                self._add_total(day, category, cents)
+            if append:
+                tail = self._days[max(appended - 1, 0):]
+                if any(a > b for a, b in zip(tail, tail[1:])):
+                    self._resort()
+            self._next_id = first_id + len(prepared)
+            self._counter += len(prepared)
+            self._dirty = True
+            return range(first_id, self._next_id)
+
+    def delete(self, expense_id):
+        with self._lock:
+            position = self._find(expense_id)
+            if position is None:
+                return None
+            row = self._row(position)
+            day = self._days[position]
+            category = self._categories[position]
+            cents = self._cents[position]
+            for column in (self._ids, self._days, self._cents, self._categories,
+                           self._dates, self._descriptions):
+                del column[position]
+            del self._day_of[expense_id]
+            self._remove_total(day, category, cents)
+            self._counter += 1
+            self._dirty = True
+            return row
+
+    def get(self, expense_id):
+        with self._lock:
+            position = self._find(expense_id)
+            return None if position is None else self._row(position)
+
+    def all_expenses(self):
+        with self._lock:
+            return self._rows_newest_first(0, len(self._ids))
+
+    def page(self, page_size, after=None, before=None):
+        with self._lock:
+            if before is not None:
+                date, expense_id = before
+                low = self._position(date_to_day(date), expense_id)
+                if low < len(self._ids) and self._ids[low] == expense_id:
+                    low += 1
+                return self._rows_newest_first(low, min(low + page_size, len(self._ids)))
+            if after is None:
+                high = len(self._ids)
+            else:
+                date, expense_id = after
+                high = self._position(date_to_day(date), expense_id)
+            return self._rows_newest_first(max(high - page_size, 0), high)
+
+    def period(self, start_day):
+        with self._lock:
+            return self._rows_newest_first(bisect_left(self._days, start_day), len(self._ids))
+
+    def category_totals(self, start_day):
+        with self._lock:
+            totals = {}
+            for day in self._days_since(start_day):
+                for category, stats in self._totals[day].items():
+                    totals[category] = totals.get(category, 0) + stats[0]
+            return sorted(totals.items())
+
+    def daily_totals(self, start_day):
+        with self._lock:
+            return [(day, sum(stats[0] for stats in self._totals[day].values()))
+                    for day in self._days_since(start_day)]
+
+    def _bucket_totals(self, start_day, bucket):
+        totals = {}
+        for day, cents in self.daily_totals(start_day):
+            key = bucket(day)
+            totals[key] = totals.get(key, 0) + cents
+        return sorted(totals.items())
+
+    def weekly_totals(self, start_day):
+        with self._lock:
+            return self._bucket_totals(start_day, lambda day: (day + WEEK_OFFSET) // 7)
+
+    def monthly_totals(self, start_day):
+        with self._lock:
+            return self._bucket_totals(start_day, lambda day: month_of(self._date_string(day)))
+
+    def period_stats(self, starts):
+        # Walk the days newest first, accumulating once, and copy the running
+        # stats out each time the walk passes a period's start
+        with self._lock:
+            running = {}
+            per_start = {}
+            pending = sorted(set(starts), reverse=True)
+            for day in reversed(self._days_since(pending[-1])):
+                while pending and day < pending[0]:
+                    per_start[pending.pop(0)] = {c: tuple(s) for c, s in running.items()}
+                for category, (total, count, low, high) in self._totals[day].items():
+                    stats = running.get(category)
+                    if stats is None:
+                        running[category] = [total, count, low, high]
+                    else:
+                        stats[0] += total
+                        stats[1] += count
+                        stats[2] = min(stats[2], low)
+                        stats[3] = max(stats[3], high)
+            for start in pending:
+                per_start[start] = {c: tuple(s) for c, s in running.items()}
+            rows = []
+            for category in sorted(running):
+                row = [category]
+                for start in starts:
+                    row.extend(per_start[start].get(category, (None,) * 4))
+                rows.append(tuple(row))
+            return rows
+
+    def search(self, words, first_day, last_day, category, candidates, page_size, offset):
+        whole, prefix = set(words[:-1]), words[-1]
+
+        def score(description, row_category):
+            # 2 points per word found in the description, 1 per word found
+            # only in the category (the SQLite backend weighs bm25 the same way)
+            in_description = set(search_words(description or ""))
+            in_category = set(search_words(row_category))
+            points = 0
+            for word in whole:
+                if word in in_description:
+                    points += 2
+                elif word in in_category:
+                    points += 1
+                else:
+                    return None
+            if any(token.startswith(prefix) for token in in_description):
+                return points + 2
+            if any(token.startswith(prefix) for token in in_category):
+                return points + 1
+            return None
+
+        with self._lock:
+            low = bisect_left(self._days, first_day)
+            high = bisect_right(self._days, last_day, low)
+            scores = {}
+            matches = []
+            for position in range(low, high):
+                row_category = self._categories[position]
+                if category is not None and row_category != category:
+                    continue
+                key = (self._descriptions[position], row_category)
+                points = scores.get(key, 0)
+                if points == 0:
+                    points = scores[key] = score(*key)
+                if points is not None:
+                    matches.append((self._ids[position], points, position))
+            matches.sort(reverse=True)
+            ranked = sorted(matches[:candidates], key=lambda match: (-match[1], -match[0]))
+            return [self._row(position) for _, _, position in ranked[offset:offset + page_size]]
+
+    def columns(self, start_day):
+        with self._lock:
+            low = bisect_left(self._days, start_day)
+            return list(zip(self._days[low:], self._categories[low:], self._cents[low:]))
+
+    def change_counter(self):
+        return self._counter
+
+    def data_version(self):
+        # Nothing else can write to this process's memory
+        return 0
+
+    def rebuild_rollup(self):
+        with self._lock:
+            self._rebuild_totals()
+
+    def verify_rollup(self):
+        with self._lock:
+            expected = self._compute_totals()
+            mismatches = []
+            for day in set(expected) | set(self._totals):
+                month = month_of(self._date_string(day))
+                want_day = expected.get(day, {})
+                have_day = self._totals.get(day, {})
+                for category in set(want_day) | set(have_day):
+                    want = want_day.get(category)
+                    have = have_day.get(category)
+                    want = want and tuple(want) + (month,)
+                    have = have and tuple(have) + (month,)
+                    if want != have:
+                        mismatches.append((self._date_string(day), category, want, have))
+            return sorted(mismatches)
@@ -0,0 +1,285 @@
+# expense_db/migrations.py
+"""Versioned schema migrations tracked with PRAGMA user_version.
+
+Each entry in MIGRATIONS moves the schema up one version. A step is either a
+SQL statement or a callable taking the connection. Pending migrations run
+inside one IMMEDIATE transaction each, so an existing expenses.db is upgraded
+in place and a crash leaves it at the last completed version.
+
+Migrations are history: each one spells out the schema it creates, so a
+later change to a table is a new migration rather than an edit to an old one.
+"""
+import sqlite3
+
+CREATE_EXPENSES_SQL = '''
+    CREATE TABLE IF NOT EXISTS expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        date TEXT NOT NULL,
+        description TEXT
+    )
+'''
+
+# Adding a row can only widen min/max; removing one re-reads them from the
+# (date, category, amount) index, which is a single index seek per bound.
+_ROLLUP_ADD_ROW = '''
+    INSERT INTO daily_category_totals (date, category, {total}, count, {min}, {max})
+    VALUES (NEW.date, NEW.category, NEW.{amount}, 1, NEW.{amount}, NEW.{amount})
+    ON CONFLICT (date, category) DO UPDATE SET
+        {total} = {total} + excluded.{total},
+        count = count + 1,
+        {min} = MIN({min}, excluded.{min}),
+        {max} = MAX({max}, excluded.{max});
+'''
+_ROLLUP_REMOVE_ROW = '''
+    UPDATE daily_category_totals SET
+        {total} = {total} - OLD.{amount},
+        count = count - 1,
+        {min} = COALESCE((SELECT MIN({amount}) FROM expenses
+                          WHERE date = OLD.date AND category = OLD.category), 0),
+        {max} = COALESCE((SELECT MAX({amount}) FROM expenses
+                          WHERE date = OLD.date AND category = OLD.category), 0)
+    WHERE date = OLD.date AND category = OLD.category;
+    DELETE FROM daily_category_totals
+    WHERE date = OLD.date AND category = OLD.category AND count <= 0;
+'''
+
+
+def _rollup_steps(amount, total, low, high, value_type):
+    """Rollup table, triggers and backfill for one version of the amount columns."""
+    names = dict(amount=amount, total=total, min=low, max=high)
+    add_row = _ROLLUP_ADD_ROW.format(**names)
+    remove_row = _ROLLUP_REMOVE_ROW.format(**names)
+    return (
+        f"""
+        CREATE TABLE IF NOT EXISTS daily_category_totals (
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            {total} {value_type} NOT NULL,
+            count INTEGER NOT NULL,
+            {low} {value_type} NOT NULL,
+            {high} {value_type} NOT NULL,
+            PRIMARY KEY (date, category)
+        ) WITHOUT ROWID
+        """,
+        f"CREATE TRIGGER IF NOT EXISTS expenses_rollup_insert AFTER INSERT ON expenses "
+        f"BEGIN {add_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS expenses_rollup_delete AFTER DELETE ON expenses "
+        f"BEGIN {remove_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS expenses_rollup_update "
+        f"AFTER UPDATE OF date, category, {amount} ON expenses "
+        f"BEGIN {remove_row} {add_row} END",
+        f"INSERT INTO daily_category_totals "
+        f"SELECT date, category, SUM({amount}), COUNT(*), MIN({amount}), MAX({amount}) "
+        f"FROM expenses GROUP BY date, category",
+    )
+
+
+_CHANGE_COUNTER_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS expenses_count_insert AFTER INSERT ON expenses "
+    "BEGIN UPDATE change_counter SET value = value + 1 WHERE id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_count_update AFTER UPDATE ON expenses "
+    "BEGIN UPDATE change_counter SET value = value + 1 WHERE id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_count_delete AFTER DELETE ON expenses "
+    "BEGIN UPDATE change_counter SET value = value + 1 WHERE id = 1; END",
+)
+
+# From version 6 the rollup is keyed by integer day number (days since
+# 1970-01-01) and carries the month number (months since January 1970), so
+# period filters and week/month buckets are integer math. See days.py.
+_DAY_SQL = "CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+_MONTH_SQL = ("((CAST(substr({column}, 1, 4) AS INTEGER) - 1970) * 12 "
+              "+ CAST(substr({column}, 6, 2) AS INTEGER) - 1)")
+_DAY_ROLLUP_ADD_ROW = f'''
+    INSERT INTO daily_category_totals
+        (day, category, total_cents, count, min_cents, max_cents, month)
+    VALUES (NEW.day, NEW.category, NEW.amount_cents, 1, NEW.amount_cents,
+            NEW.amount_cents, {_MONTH_SQL.format(column="NEW.date")})
+    ON CONFLICT (day, category) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        count = count + 1,
+        min_cents = MIN(min_cents, excluded.min_cents),
+        max_cents = MAX(max_cents, excluded.max_cents);
+'''
+_DAY_ROLLUP_REMOVE_ROW = '''
+    UPDATE daily_category_totals SET
+        total_cents = total_cents - OLD.amount_cents,
+        count = count - 1,
+        min_cents = COALESCE((SELECT MIN(amount_cents) FROM expenses
+                              WHERE day = OLD.day AND category = OLD.category), 0),
+        max_cents = COALESCE((SELECT MAX(amount_cents) FROM expenses
+                              WHERE day = OLD.day AND category = OLD.category), 0)
+    WHERE day = OLD.day AND category = OLD.category;
+    DELETE FROM daily_category_totals
+    WHERE day = OLD.day AND category = OLD.category AND count <= 0;
+'''
+# Round-tripping through julianday() yields NULL for text that is not a date
+# and rolls impossible days over ('2024-02-30' -> '2024-03-01'), so this
+# rejects those, '2024-2-3' and free text from any writer.
+_CHECK_DATE = ("SELECT RAISE(ABORT, 'invalid date, expected YYYY-MM-DD') "
+               "WHERE date(julianday(NEW.date)) IS NOT NEW.date;")
+
+MIGRATIONS = [
+    (1, "create expenses table", (
+        CREATE_EXPENSES_SQL,
+    )),
+    (2, "index expenses by date", (
+        # idx_expenses_date serves SELECT * range scans and ORDER BY date with
+        # the narrowest index; the covering index answers date/category/amount
+        # aggregates without touching the table.
+        "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_date_category_amount "
+        "ON expenses (date, category, amount)",
+    )),
+    (3, "trigger-maintained daily category rollup",
+        _rollup_steps("amount", "total", "min_amount", "max_amount", "REAL")),
+    (4, "persistent change counter", (
+        # Unlike PRAGMA data_version this survives reopening the database, so
+        # it can key on-disk caches of derived data such as rendered charts.
+        "CREATE TABLE IF NOT EXISTS change_counter ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO change_counter (id, value) VALUES (1, 0)",
+    ) + _CHANGE_COUNTER_TRIGGERS),
+    (5, "store amounts as integer centavos", (
+        # SQLite cannot change a column type in place: copy into a new table,
+        # drop the old one (which drops its indexes and triggers) and rename.
+        '''
+        CREATE TABLE expenses_cents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            description TEXT
+        )
+        ''',
+        "INSERT INTO expenses_cents (id, category, amount_cents, date, description) "
+        "SELECT id, category, CAST(ROUND(amount * 100) AS INTEGER), date, description "
+        "FROM expenses",
+        # Keep the AUTOINCREMENT high-water mark so deleted ids stay unused.
+        "DELETE FROM sqlite_sequence WHERE name = 'expenses_cents'",
+        "INSERT INTO sqlite_sequence (name, seq) "
+        "SELECT 'expenses_cents', seq FROM sqlite_sequence WHERE name = 'expenses'",
+        "DROP TABLE daily_category_totals",
+        "DROP TABLE expenses",
+        "ALTER TABLE expenses_cents RENAME TO expenses",
+        "CREATE INDEX idx_expenses_date ON expenses (date)",
+        "CREATE INDEX idx_expenses_date_category_amount "
+        "ON expenses (date, category, amount_cents)",
+    ) + _rollup_steps("amount_cents", "total_cents", "min_cents", "max_cents", "INTEGER")
+      + _CHANGE_COUNTER_TRIGGERS + (
+        # Cached charts were drawn from the old rows; make them stale.
+        "UPDATE change_counter SET value = value + 1 WHERE id = 1",
+    )),
+    (6, "integer day numbers", (
+        f"ALTER TABLE expenses ADD COLUMN day INTEGER "
+        f"GENERATED ALWAYS AS ({_DAY_SQL.format(column='date')}) VIRTUAL",
+        f"CREATE TRIGGER expenses_check_date_insert BEFORE INSERT ON expenses "
+        f"BEGIN {_CHECK_DATE} END",
+        f"CREATE TRIGGER expenses_check_date_update BEFORE UPDATE OF date ON expenses "
+        f"BEGIN {_CHECK_DATE} END",
+        # (day, category, amount_cents) serves period range scans and the
+        # rollup triggers' min/max seeks; the date-keyed index it replaces
+        # is no longer read by anything.
+        "DROP INDEX idx_expenses_date_category_amount",
+        "CREATE INDEX idx_expenses_day_category_amount "
+        "ON expenses (day, category, amount_cents)",
+        "DROP TRIGGER expenses_rollup_insert",
+        "DROP TRIGGER expenses_rollup_delete",
+        "DROP TRIGGER expenses_rollup_update",
+        "DROP TABLE daily_category_totals",
+        '''
+        CREATE TABLE daily_category_totals (
+            day INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            total_cents INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            min_cents INTEGER NOT NULL,
+            max_cents INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            PRIMARY KEY (day, category)
+        ) WITHOUT ROWID
+        ''',
+        f"CREATE TRIGGER expenses_rollup_insert AFTER INSERT ON expenses "
+        f"BEGIN {_DAY_ROLLUP_ADD_ROW} END",
+        f"CREATE TRIGGER expenses_rollup_delete AFTER DELETE ON expenses "
+        f"BEGIN {_DAY_ROLLUP_REMOVE_ROW} END",
+        f"CREATE TRIGGER expenses_rollup_update "
+        f"AFTER UPDATE OF date, category, amount_cents ON expenses "
+        f"BEGIN {_DAY_ROLLUP_REMOVE_ROW} {_DAY_ROLLUP_ADD_ROW} END",
+        f"INSERT INTO daily_category_totals "
+        f"SELECT day, category, SUM(amount_cents), COUNT(*), MIN(amount_cents), "
+        f"MAX(amount_cents), {_MONTH_SQL.format(column='date')} "
+        f"FROM expenses WHERE day IS NOT NULL GROUP BY day, category",
+    )),
+    (7, "full-text index over descriptions and categories", (
+        # External-content FTS5 table: it stores only the index and reads the
+        # text back from expenses by rowid, so descriptions are not duplicated.
+        "CREATE VIRTUAL TABLE expenses_fts USING fts5("
+        "description, category, content='expenses', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses BEGIN "
+        "INSERT INTO expenses_fts (rowid, description, category) "
+        "VALUES (NEW.id, NEW.description, NEW.category); END",
+        "CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses BEGIN "
+        "INSERT INTO expenses_fts (expenses_fts, rowid, description, category) "
+        "VALUES ('delete', OLD.id, OLD.description, OLD.category); END",
+        "CREATE TRIGGER expenses_fts_update AFTER UPDATE OF description, category "
+        "ON expenses BEGIN "
+        "INSERT INTO expenses_fts (expenses_fts, rowid, description, category) "
+        "VALUES ('delete', OLD.id, OLD.description, OLD.category); "
+        "INSERT INTO expenses_fts (rowid, description, category) "
+        "VALUES (NEW.id, NEW.description, NEW.category); END",
+        "INSERT INTO expenses_fts (expenses_fts) VALUES ('rebuild')",
+    )),
+    (8, "archive partition registry", (
+        # One row per archive file holding the expenses dated first_day to
+        # last_day (see partitions.py); empty until something is archived.
+        '''
+        CREATE TABLE partitions (
+            name TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            first_day INTEGER NOT NULL,
+            last_day INTEGER NOT NULL
+        )
+        ''',
+    )),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    """Return the schema version stored in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target=LATEST_VERSION):
+    """Apply pending migrations up to ``target``; returns the versions applied."""
+    current = schema_version(conn)
+    if current > LATEST_VERSION:
+        raise sqlite3.DatabaseError(
+            f"database schema version {current} is newer than this code ({LATEST_VERSION})"
+        )
+    applied = []
+    for version, _description, steps in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock.
+            if schema_version(conn) >= version:
+                conn.execute("COMMIT")
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,60 @@
+# expense_db/money.py
+"""Conversions between peso amounts and the integer centavos stored in SQLite.
+
+Amounts are stored as INTEGER centavos so sums are exact and the columns
+stay small. Values coming in (floats, strings, Decimals) are rounded half up
+to the nearest centavo; values going out are either floats (the default API)
+or exact Decimals.
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CENT = Decimal("0.01")
+# SQLite INTEGER is signed 64-bit
+MAX_CENTS = 2 ** 63 - 1
+
+
+def to_cents(amount):
+    """Convert a peso amount (int, float, str or Decimal) to integer centavos.
+
+    Raises ValueError for values that are not finite numbers or do not fit
+    in a 64-bit centavo column.
+    """
+    if isinstance(amount, bool):
+        raise ValueError(f"invalid amount {amount!r}")
+    if isinstance(amount, int):
+        return _in_range(amount * 100, amount)
+    try:
+        # repr() gives the shortest string that round-trips a float, so 0.1
+        # becomes Decimal("0.1") rather than its binary expansion.
+        value = Decimal(repr(amount) if isinstance(amount, float) else amount)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"invalid amount {amount!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"invalid amount {amount!r}")
+    try:
+        cents = int(value.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+    except InvalidOperation:
+        # More digits than the decimal context holds
+        raise ValueError(f"amount out of range {amount!r}") from None
+    return _in_range(cents, amount)
+
+
+def _in_range(cents, amount):
+    if not -MAX_CENTS - 1 <= cents <= MAX_CENTS:
+        raise ValueError(f"amount out of range {amount!r}")
+    return cents
+
+
+def cents_to_decimal(cents):
+    """Return integer centavos as an exact Decimal peso amount."""
+    return Decimal(cents).scaleb(-2)
+
+
+def cents_to_float(cents):
+    """Return integer centavos as a float peso amount."""
+    return cents / 100
+
+
+def float_to_decimal(amount):
+    """Return a float read back from centavos (cents / 100.0) as an exact Decimal."""
+    return cents_to_decimal(round(amount * 100))
@@ -0,0 +1,567 @@
+# expense_db/partitions.py
+"""Time partitions: old expenses moved out of expenses.db into archive files.
+
+archive() moves every expense dated before a cutoff into one SQLite file per
+calendar year (or month) under ``<db name>.archive/``, so expenses.db keeps
+only recent rows and stays small. Each archive file has the full expense
+schema (indexes, rollup, full-text index), and the ``partitions`` table in
+expenses.db records which days each file holds. Days before the newest
+partition's last day live only in archives; later days live only in
+expenses.db.
+
+PartitionedSQLiteBackend queries only the files whose days overlap the
+request: get_expenses_by_period(30) reads expenses.db alone, a yearly
+summary reads one or two archives. Adding an expense with an archived date
+writes it straight into its archive file, and ids stay unique across all
+files because expenses.db hands them out. ExpenseTracker switches to this
+backend by itself when a database has partitions.
+
+SQLite commits each file separately, so a crash in the middle of archive()
+or merge() can leave some rows in two files; running the command again
+copies them over the same ids and finishes the move.
+
+Usage: python -m expense_db.partitions [--db expenses.db] list
+       python -m expense_db.partitions archive (--before YYYY-MM-DD | --keep-days N) [--scheme year]
+       python -m expense_db.partitions merge [--scheme year]
+       python -m expense_db.partitions compact
+"""
+import argparse
+import os
+import sys
+from collections import namedtuple
+from itertools import chain
+
+from . import rollup
+from .days import date_to_day, day_to_date, days_ago, month_of, month_start_day
+from .migrations import migrate
+from .records import expense_row
+from .sqlite_backend import (
+    COLUMNS_SQL, DAILY_TOTALS_SQL, DELETE_EXPENSE_SQL, EXPENSE_COLUMNS, FIRST_PAGE_SQL,
+    MONTHLY_TOTALS_SQL, NEXT_PAGE_SQL, PREV_PAGE_SQL, SELECT_ALL_SQL, SELECT_ONE_SQL,
+    SELECT_PERIOD_SQL, SUMMARY_SQL, WEEKLY_TOTALS_SQL, SQLiteBackend, _period_stats_sql,
+    expenses, match_expression,
+)
+
+SCHEMES = ("year", "month")
+
+Partition = namedtuple("Partition", "name path first_day last_day")
+
+PARTITIONS_SQL = 'SELECT name, path, first_day, last_day FROM partitions ORDER BY first_day DESC'
+SAVE_PARTITION_SQL = '''
+    INSERT INTO partitions (name, path, first_day, last_day) VALUES (?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET first_day = excluded.first_day, last_day = excluded.last_day
+'''
+# Rows keep their ids when they move between files; REPLACE makes a repeated
+# move (after a crash) overwrite the earlier copy instead of failing.
+INSERT_WITH_ID_SQL = '''
+    INSERT INTO expenses (id, category, amount_cents, date, description)
+    VALUES (?, ?, ?, ?, ?)
+'''
+COPY_WITH_ID_SQL = INSERT_WITH_ID_SQL.replace("INSERT", "INSERT OR REPLACE", 1)
+SELECT_RANGE_SQL = '''
+    SELECT id, category, amount_cents, date, description FROM expenses
+    WHERE day BETWEEN ? AND ?
+'''
+DELETE_RANGE_SQL = 'DELETE FROM expenses WHERE day BETWEEN ? AND ?'
+BUMP_COUNTER_SQL = 'UPDATE change_counter SET value = value + ? WHERE id = 1'
+# The newest candidates of one file with their bm25 score, so matches from
+# several files can be ranked together (see SQLiteBackend's SEARCH_SQL)
+SEARCH_CANDIDATES_SQL = f'''
+    SELECT {EXPENSE_COLUMNS}, score FROM (
+        SELECT expenses.*, bm25(expenses_fts, 2.0, 1.0) AS score
+        FROM expenses_fts CROSS JOIN expenses ON expenses.id = expenses_fts.rowid
+        WHERE expenses_fts MATCH ?1 AND expenses.day BETWEEN ?2 AND ?3
+          AND (?4 IS NULL OR expenses.category = ?4)
+        ORDER BY expenses_fts.rowid DESC
+        LIMIT ?5
+    )
+'''
+
+
+def partition_name(day, scheme):
+    """Return the partition a day number belongs to: 'YYYY' or 'YYYY-MM'."""
+    date = day_to_date(day)
+    return date[:4] if scheme == "year" else date[:7]
+
+
+def partition_range(name):
+    """Return the (first_day, last_day) of the year 'YYYY' or month 'YYYY-MM'."""
+    year = int(name[:4])
+    if len(name) == 4:
+        first = (year - 1970) * 12
+        return month_start_day(first), month_start_day(first + 12) - 1
+    month = (year - 1970) * 12 + int(name[5:7]) - 1
+    return month_start_day(month), month_start_day(month + 1) - 1
+
+
+def _sum_by_key(results):
+    totals = {}
+    for rows in results:
+        for key, cents in rows:
+            totals[key] = totals.get(key, 0) + cents
+    return sorted(totals.items())
+
+
+def _merge_stats(a, b):
+    """Combine two (total, count, min, max) tuples from period_stats; either may be Nones."""
+    if a[1] is None:
+        return b
+    if b[1] is None:
+        return a
+    return (a[0] + b[0], a[1] + b[1], min(a[2], b[2]), max(a[3], b[3]))
+
+
+def _bulk_copy(conn, rows):
+    """Copy expense rows into an archive file, then rebuild what its triggers maintain.
+
+    Per-row rollup and full-text triggers dominate the cost of moving many
+    rows, so they are dropped for the copy and recreated from their stored
+    SQL; the rollup and index are rebuilt once instead, in the same transaction.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        triggers = conn.execute("SELECT name, sql FROM sqlite_master "
+                                "WHERE type = 'trigger' AND tbl_name = 'expenses'").fetchall()
+        for name, _ in triggers:
+            conn.execute(f'DROP TRIGGER "{name}"')
+        copied = conn.executemany(COPY_WITH_ID_SQL, rows).rowcount
+        for _, sql in triggers:
+            conn.execute(sql)
+        rollup.rebuild(conn)
+        conn.execute("INSERT INTO expenses_fts (expenses_fts) VALUES ('rebuild')")
+        conn.execute(BUMP_COUNTER_SQL, (copied,))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+class PartitionedSQLiteBackend(SQLiteBackend):
+    def __init__(self, db_name="expenses.db", scheme="year", keep_days=None, **options):
+        """Open ``db_name`` and its archives; ``options`` are SQLiteBackend's.
+
+        ``scheme`` ("year" or "month") sizes the archive files created from
+        now on. With ``keep_days``, expenses older than that (rounded down to
+        the start of their month) are archived on open.
+        """
+        if db_name == ":memory:":
+            raise ValueError("partitioned databases need a database file")
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme must be one of {SCHEMES}")
+        super().__init__(db_name, **options)
+        self.scheme = scheme
+        self._base_dir = os.path.dirname(os.path.abspath(db_name))
+        self.archive_dir = os.path.splitext(os.path.basename(db_name))[0] + ".archive"
+        self._migrated = set()
+        if keep_days is not None:
+            self.archive(days_ago(keep_days))
+
+    # Partitions and their files
+
+    def partitions(self):
+        """Return the archive partitions, newest first."""
+        return [Partition(*row) for row in self._connection().execute(PARTITIONS_SQL)]
+
+    def _path(self, partition):
+        return os.path.join(self._base_dir, partition.path)
+
+    def _archive(self, partition):
+        """Return the calling thread's connection to a partition's file."""
+        path = self._path(partition)
+        archives = getattr(self._local, "archives", None)
+        if archives is None:
+            archives = self._local.archives = {}
+        conn = archives.get(path)
+        if conn is None:
+            self._connection()  # raises once the backend is closed
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = archives[path] = self._connect(path)
+            with self._lock:
+                self._connections.append(conn)
+            if path not in self._migrated:
+                migrate(conn)
+                self._migrated.add(path)
+        return conn
+
+    def _forget(self, partition):
+        """Close this thread's connection to a partition and delete its files."""
+        path = self._path(partition)
+        self._migrated.discard(path)
+        conn = getattr(self._local, "archives", {}).pop(path, None)
+        if conn is not None:
+            with self._lock:
+                self._connections.remove(conn)
+            conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _stores(self, first_day=None, last_day=None):
+        """Connections to every file holding days in [first_day, last_day], newest first."""
+        partitions = self.partitions()
+        stores = []
+        if not partitions or last_day is None or last_day > partitions[0].last_day:
+            stores.append(self._connection())
+        for partition in partitions:
+            if ((first_day is None or partition.last_day >= first_day)
+                    and (last_day is None or partition.first_day <= last_day)):
+                stores.append(self._archive(partition))
+        return stores
+
+    def _partition_for(self, conn, day, partitions, before):
+        """Return the partition for ``day``, registering a new one if none covers it.
+
+        A new partition spans its whole year or month, cut short where it
+        would overlap another partition or reach ``before``. ``partitions``
+        is updated in place; the registry write joins ``conn``'s transaction.
+        """
+        for partition in partitions:
+            if partition.first_day <= day <= partition.last_day:
+                return partition
+        name = partition_name(day, self.scheme)
+        first, last = partition_range(name)
+        last = min(last, before - 1)
+        existing = next((p for p in partitions if p.name == name), None)
+        if existing is not None:
+            first, last = min(first, existing.first_day), max(last, existing.last_day)
+        for other in partitions:
+            if other is existing:
+                continue
+            if other.last_day < day:
+                first = max(first, other.last_day + 1)
+            elif other.first_day > day:
+                last = min(last, other.first_day - 1)
+        if existing is not None and not (first <= existing.first_day and existing.last_day <= last):
+            raise ValueError(f"partition {name} cannot grow to cover {day_to_date(day)}; "
+                             f"run merge first")
+        path = existing.path if existing else os.path.join(self.archive_dir, name + ".db")
+        partition = Partition(name, path, first, last)
+        conn.execute(SAVE_PARTITION_SQL, partition)
+        partitions[:] = sorted([p for p in partitions if p.name != name] + [partition],
+                               key=lambda p: p.first_day, reverse=True)
+        return partition
+
+    # Commands
+
+    def archive(self, before):
+        """Move expenses dated before ``before`` into archive partitions.
+
+        ``before`` is a 'YYYY-MM-DD' date or day number and is rounded down
+        to the first of its month. Returns the number of expenses moved.
+        """
+        if isinstance(before, str):
+            before = date_to_day(before)
+        boundary = month_start_day(month_of(day_to_date(before)))
+        hot = self._connection()
+        hot.execute("BEGIN IMMEDIATE")
+        try:
+            partitions = self.partitions()
+            touched = {}
+            days = hot.execute("SELECT DISTINCT day FROM daily_category_totals WHERE day < ?",
+                               (boundary,)).fetchall()
+            for (day,) in days:
+                partition = self._partition_for(hot, day, partitions, boundary)
+                touched[partition.name] = partition
+            moved = 0
+            for name in touched:
+                partition = next(p for p in partitions if p.name == name)
+                _bulk_copy(self._archive(partition), hot.execute(
+                    SELECT_RANGE_SQL, (partition.first_day, partition.last_day)))
+                # Dropping the rollup rows first spares the delete trigger its
+                # per-row min/max lookups
+                hot.execute("DELETE FROM daily_category_totals WHERE day BETWEEN ? AND ?",
+                            (partition.first_day, partition.last_day))
+                moved += hot.execute(
+                    DELETE_RANGE_SQL, (partition.first_day, partition.last_day)).rowcount
+            hot.execute("COMMIT")
+        except BaseException:
+            hot.execute("ROLLBACK")
+            raise
+        return moved
+
+    def merge(self, scheme=None):
+        """Regroup the archives by ``scheme`` (default: the backend's), e.g. months into years.
+
+        Returns the names of the partitions that were written to.
+        """
+        scheme = scheme or self.scheme
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme must be one of {SCHEMES}")
+        hot = self._connection()
+        hot.execute("BEGIN IMMEDIATE")
+        try:
+            partitions = self.partitions()
+            kept = {}
+            targets = {}
+            moves = []
+            for partition in partitions:
+                pieces = []
+                day = partition.first_day
+                while day <= partition.last_day:
+                    name = partition_name(day, scheme)
+                    last = min(partition_range(name)[1], partition.last_day)
+                    pieces.append((name, day, last))
+                    day = last + 1
+                if [name for name, _, _ in pieces] == [partition.name]:
+                    kept[partition.name] = partition
+                    continue
+                for name, first, last in pieces:
+                    moves.append((partition, name, first, last))
+                    low, high = targets.get(name, (first, last))
+                    targets[name] = (min(low, first), max(high, last))
+            if not moves:
+                hot.execute("COMMIT")
+                return []
+            written = {}
+            for name, (first, last) in targets.items():
+                if name in kept:
+                    first = min(first, kept[name].first_day)
+                    last = max(last, kept[name].last_day)
+                    path = kept[name].path
+                else:
+                    path = os.path.join(self.archive_dir, name + ".db")
+                written[name] = Partition(name, path, first, last)
+            # One copy per target, so its rollup and index are rebuilt once
+            for name, target in written.items():
+                _bulk_copy(self._archive(target), chain.from_iterable(
+                    self._archive(source).execute(SELECT_RANGE_SQL, (first, last))
+                    for source, piece, first, last in moves if piece == name))
+            sources = {source.name: source for source, _, _, _ in moves}
+            for name in sources:
+                hot.execute("DELETE FROM partitions WHERE name = ?", (name,))
+            for partition in written.values():
+                hot.execute(SAVE_PARTITION_SQL, partition)
+            hot.execute("COMMIT")
+        except BaseException:
+            hot.execute("ROLLBACK")
+            raise
+        for source in sources.values():
+            self._forget(source)
+        return sorted(written)
+
+    def compact(self):
+        """Drop empty archives, then optimize the full-text indexes and VACUUM every file.
+
+        Returns the total size of the files in bytes, before and after.
+        """
+        def size():
+            paths = [self.db_name] + [self._path(p) for p in self.partitions()]
+            return sum(os.path.getsize(path + suffix) for path in paths
+                       for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+        before = size()
+        hot = self._connection()
+        for partition in self.partitions():
+            if self._archive(partition).execute("SELECT 1 FROM expenses LIMIT 1").fetchone():
+                continue
+            with hot:
+                hot.execute("DELETE FROM partitions WHERE name = ?", (partition.name,))
+            self._forget(partition)
+        for conn in self._stores():
+            with conn:
+                conn.execute("INSERT INTO expenses_fts (expenses_fts) VALUES ('optimize')")
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before, size()
+
+    # StorageBackend
+
+    def insert(self, rows):
+        if not rows:
+            return range(0)
+        hot = self._connection()
+        # Archive files commit on their own, before expenses.db does; the
+        # rows written to them are taken back if the insert fails, or the
+        # ids released by the rollback would be handed out again
+        written = []
+        hot.execute("BEGIN IMMEDIATE")
+        try:
+            partitions = self.partitions()
+            boundary = partitions[0].last_day + 1 if partitions else -2 ** 31
+            # Ids come from expenses.db's AUTOINCREMENT sequence, reserved for
+            # every row including the ones that go to archive files
+            row = hot.execute("SELECT seq FROM sqlite_sequence WHERE name = 'expenses'").fetchone()
+            first_id = (row[0] if row else 0) + 1
+            ids = range(first_id, first_id + len(rows))
+            if row:
+                hot.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'expenses'",
+                            (ids.stop - 1,))
+            else:
+                hot.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('expenses', ?)",
+                            (ids.stop - 1,))
+            recent = []
+            archived = {}
+            for expense_id, expense in zip(ids, rows):
+                if partitions and date_to_day(expense[2]) < boundary:
+                    partition = self._partition_for(
+                        hot, date_to_day(expense[2]), partitions, boundary)
+                    archived.setdefault(partition.path, []).append((expense_id,) + tuple(expense))
+                else:
+                    recent.append((expense_id,) + tuple(expense))
+            for path, batch in archived.items():
+                conn = self._archive(next(p for p in partitions if p.path == path))
+                with conn:
+                    conn.executemany(INSERT_WITH_ID_SQL, batch)
+                written.append((conn, [(expense[0],) for expense in batch]))
+            hot.executemany(INSERT_WITH_ID_SQL, recent)
+            if len(recent) < len(rows):
+                hot.execute(BUMP_COUNTER_SQL, (len(rows) - len(recent),))
+            hot.execute("COMMIT")
+        except BaseException:
+            hot.execute("ROLLBACK")
+            for conn, written_ids in written:
+                with conn:
+                    conn.executemany(DELETE_EXPENSE_SQL, written_ids)
+            raise
+        return ids
+
+    def delete(self, expense_id):
+        expense = super().delete(expense_id)
+        if expense is not None:
+            return expense
+        for partition in self.partitions():
+            conn = self._archive(partition)
+            with conn:
+                expense = expenses(conn, SELECT_ONE_SQL, (expense_id,)).fetchone()
+                if expense is None:
+                    continue
+                conn.execute(DELETE_EXPENSE_SQL, (expense_id,))
+            # Archive writes bump expenses.db's counter so readers notice them
+            hot = self._connection()
+            with hot:
+                hot.execute(BUMP_COUNTER_SQL, (1,))
+            return expense
+        return None
+
+    def get(self, expense_id):
+        for conn in self._stores():
+            expense = expenses(conn, SELECT_ONE_SQL, (expense_id,)).fetchone()
+            if expense is not None:
+                return expense
+        return None
+
+    def all_expenses(self):
+        return [row for conn in self._stores() for row in expenses(conn, SELECT_ALL_SQL)]
+
+    def page(self, page_size, after=None, before=None):
+        # Files hold disjoint day ranges, so a page is filled from the
+        # newest (or, going back, the oldest) files that can still match
+        rows = []
+        if before is not None:
+            date, expense_id = before
+            for conn in reversed(self._stores(first_day=date_to_day(date))):
+                rows += expenses(
+                    conn, PREV_PAGE_SQL, (date, expense_id, page_size - len(rows))).fetchall()
+                if len(rows) == page_size:
+                    break
+            rows.reverse()
+            return rows
+        if after is None:
+            stores = self._stores()
+        else:
+            date, expense_id = after
+            stores = self._stores(last_day=date_to_day(date))
+        for conn in stores:
+            if after is None:
+                rows += expenses(conn, FIRST_PAGE_SQL, (page_size - len(rows),)).fetchall()
+            else:
+                rows += expenses(
+                    conn, NEXT_PAGE_SQL, (date, expense_id, page_size - len(rows))).fetchall()
+            if len(rows) == page_size:
+                break
+        return rows
+
+    def period(self, start_day):
+        return [row for conn in self._stores(start_day)
+                for row in expenses(conn, SELECT_PERIOD_SQL, (start_day,))]
+
+    def _each(self, sql, start_day):
+        return [conn.execute(sql, (start_day,)).fetchall() for conn in self._stores(start_day)]
+
+    def category_totals(self, start_day):
+        return _sum_by_key(self._each(SUMMARY_SQL, start_day))
+
+    def daily_totals(self, start_day):
+        return sorted(chain.from_iterable(self._each(DAILY_TOTALS_SQL, start_day)))
+
+    def weekly_totals(self, start_day):
+        return _sum_by_key(self._each(WEEKLY_TOTALS_SQL, start_day))
+
+    def monthly_totals(self, start_day):
+        return _sum_by_key(self._each(MONTHLY_TOTALS_SQL, start_day))
+
+    def period_stats(self, starts):
+        sql = _period_stats_sql(len(starts))
+        params = [min(starts)] + list(starts)
+        merged = {}
+        for conn in self._stores(min(starts)):
+            for category, *values in conn.execute(sql, params):
+                stats = [tuple(values[i:i + 4]) for i in range(0, len(values), 4)]
+                if category in merged:
+                    stats = [_merge_stats(a, b) for a, b in zip(merged[category], stats)]
+                merged[category] = stats
+        return [(category,) + tuple(chain.from_iterable(stats))
+                for category, stats in sorted(merged.items())]
+
+    def search(self, words, first_day, last_day, category, candidates, page_size, offset):
+        # bm25 scores come from each file's own statistics, so ranking across
+        # files is close to, not exactly, what one big index would give
+        params = (match_expression(words, category), first_day, last_day, category, candidates)
+        matches = [row for conn in self._stores(first_day, last_day)
+                   for row in conn.execute(SEARCH_CANDIDATES_SQL, params)]
+        matches.sort(key=lambda row: row[0], reverse=True)
+        ranked = sorted(matches[:candidates], key=lambda row: (row[5], -row[0]))
+        return [expense_row(None, row) for row in ranked[offset:offset + page_size]]
+
+    def columns(self, start_day):
+        return chain.from_iterable(conn.execute(COLUMNS_SQL, (start_day,))
+                                   for conn in self._stores(start_day))
+
+    def rebuild_rollup(self):
+        for conn in self._stores():
+            with conn:
+                rollup.rebuild(conn)
+
+    def verify_rollup(self):
+        return sorted(chain.from_iterable(rollup.verify(conn) for conn in self._stores()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old expenses into partition files.")
+    parser.add_argument("command", choices=("list", "archive", "merge", "compact"))
+    parser.add_argument("--db", default="expenses.db")
+    parser.add_argument("--scheme", choices=SCHEMES, default="year",
+                        help="archive file size for new partitions (default: year)")
+    parser.add_argument("--before", metavar="YYYY-MM-DD", help="archive expenses before this date")
+    parser.add_argument("--keep-days", type=int, help="archive expenses older than N days")
+    args = parser.parse_args(argv)
+
+    backend = PartitionedSQLiteBackend(args.db, scheme=args.scheme)
+    try:
+        if args.command == "archive":
+            if (args.before is None) == (args.keep_days is None):
+                parser.error("archive needs exactly one of --before and --keep-days")
+            before = args.before or days_ago(args.keep_days)
+            print(f"Archived {backend.archive(before):,} expenses.")
+        elif args.command == "merge":
+            written = backend.merge()
+            print(f"Merged into {', '.join(written)}." if written else "Nothing to merge.")
+        elif args.command == "compact":
+            before, after = backend.compact()
+            print(f"Compacted {before / 1e6:.1f} MB to {after / 1e6:.1f} MB.")
+        recent = backend._connection().execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+        print(f"{'recent':<10} {'':<23} {recent:>10,} rows  {args.db}")
+        for partition in reversed(backend.partitions()):
+            count = backend._archive(partition).execute(
+                "SELECT COUNT(*) FROM expenses").fetchone()[0]
+            print(f"{partition.name:<10} {day_to_date(partition.first_day)} to "
+                  f"{day_to_date(partition.last_day)} {count:>10,} rows  {partition.path}")
+    finally:
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
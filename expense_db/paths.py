@@ -0,0 +1,9 @@
+# expense_db/paths.py
+import os
+
+
+def user_cache_dir(*parts):
+    """Return (without creating) a per-user cache directory for the app."""
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "expense_tracker", *parts)
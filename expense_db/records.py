@@ -0,0 +1,141 @@
+# expense_db/records.py
+"""Expense records: one row as named fields, and a compact batch of many rows.
+
+Every read that returns expenses returns Expense records, built straight
+from the database cursor by expense_row (a sqlite3 row_factory). Fields are
+read by name, so a query that changes its column order cannot silently
+swap the amount and the date in the GUI:
+
+    for expense in tracker.get_expenses_by_period(30):
+        print(expense.date, expense.category, expense.amount)
+
+Records still unpack, index and compare like the old
+``(id, category, amount, date, description)`` tuples. Categories and dates
+are interned, so a million rows share a few dozen category strings and
+one string per day instead of holding a copy each.
+
+ExpenseBatch holds many expenses column by column in typed arrays for
+result sets too big to keep as objects (see ExpenseTracker.get_expenses_batch);
+benchmarks/bench_records.py compares the memory and build time of each.
+"""
+import sys
+from array import array
+
+from .days import date_to_day, day_to_date
+from .money import cents_to_decimal
+
+FIELDS = ("id", "category", "amount", "date", "description")
+
+
+class Expense:
+    __slots__ = FIELDS
+
+    def __init__(self, id, category, amount, date, description):
+        self.id = id
+        self.category = category
+        self.amount = amount
+        self.date = date
+        self.description = description
+
+    def __repr__(self):
+        return (f"Expense(id={self.id!r}, category={self.category!r}, amount={self.amount!r}, "
+                f"date={self.date!r}, description={self.description!r})")
+
+    def __iter__(self):
+        return iter((self.id, self.category, self.amount, self.date, self.description))
+
+    def __len__(self):
+        return 5
+
+    def __getitem__(self, index):
+        return (self.id, self.category, self.amount, self.date, self.description)[index]
+
+    def __reduce__(self):
+        return (Expense, tuple(self))
+
+    # Compares like the tuple it replaces, so sorting and == keep working
+    def _key(self, other):
+        if isinstance(other, (Expense, tuple)):
+            return tuple(other)
+        return None
+
+    def __eq__(self, other):
+        other = self._key(other)
+        return NotImplemented if other is None else tuple(self) == other
+
+    def __lt__(self, other):
+        other = self._key(other)
+        return NotImplemented if other is None else tuple(self) < other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+
+def expense_row(cursor, row):
+    """sqlite3 row_factory for ``id, category, amount, date, description`` queries."""
+    return Expense(row[0], sys.intern(row[1]), row[2], sys.intern(row[3]), row[4])
+
+
+class ExpenseBatch:
+    def __init__(self, rows=(), decimal=False):
+        """Expenses stored column by column; indexing builds Expense records on demand.
+
+        Ids, centavos, day numbers and category codes live in typed arrays
+        and equal descriptions are stored once, so a row costs a few dozen
+        bytes instead of an object with five more behind it. ``decimal``
+        returns amounts as Decimals like ExpenseTracker(decimal=True).
+        """
+        self.ids = array("q")
+        self.cents = array("q")
+        self.days = array("l")
+        self.category_codes = array("I")
+        self.categories = []        # code -> category
+        self.descriptions = []
+        self.decimal = decimal
+        self._codes = {}            # category -> code
+        self._descriptions = {}     # shares repeated descriptions
+        self._days = {}             # 'YYYY-MM-DD' -> day number
+        self._dates = {}            # day number -> 'YYYY-MM-DD'
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, expense):
+        """Add one expense row (an Expense or a 5-tuple in the same order)."""
+        expense_id, category, amount, date, description = expense
+        code = self._codes.get(category)
+        if code is None:
+            code = self._codes[category] = len(self.categories)
+            self.categories.append(category)
+        day = self._days.get(date)
+        if day is None:
+            day = self._days[date] = date_to_day(date)
+            self._dates[day] = date
+        self.ids.append(expense_id)
+        self.cents.append(round(amount * 100))
+        self.days.append(day)
+        self.category_codes.append(code)
+        self.descriptions.append(self._descriptions.setdefault(description, description))
+
+    def extend(self, rows):
+        for expense in rows:
+            self.append(expense)
+
+    def _date(self, day):
+        date = self._dates.get(day)
+        if date is None:
+            date = self._dates[day] = day_to_date(day)
+        return date
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        cents = self.cents[index]
+        return Expense(self.ids[index], self.categories[self.category_codes[index]],
+                       cents_to_decimal(cents) if self.decimal else cents / 100,
+                       self._date(self.days[index]), self.descriptions[index])
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self[index]
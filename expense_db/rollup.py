@@ -0,0 +1,76 @@
+# expense_db/rollup.py
+"""Daily per-category rollup of the expenses table.
+
+daily_category_totals holds one row per (day number, category) with the
+sum, count, min and max of the amounts in centavos and the month number,
+kept current by triggers on expenses (both are created by the schema
+migrations).
+Summaries read this table instead of the raw rows, so their cost depends on
+the number of days and categories rather than the number of expenses.
+
+Usage: python -m expense_db.rollup [--db expenses.db] (verify|rebuild)
+"""
+import argparse
+import sys
+
+from .days import day_to_date
+
+EXPECTED_ROLLUP_SQL = '''
+    SELECT day, category, SUM(amount_cents), COUNT(*), MIN(amount_cents), MAX(amount_cents),
+           (CAST(substr(date, 1, 4) AS INTEGER) - 1970) * 12 + CAST(substr(date, 6, 2) AS INTEGER) - 1
+    FROM expenses
+    WHERE day IS NOT NULL
+    GROUP BY day, category
+'''
+
+
+def rebuild(conn):
+    """Recompute every rollup row from the expenses table."""
+    conn.execute("DELETE FROM daily_category_totals")
+    conn.execute("INSERT INTO daily_category_totals " + EXPECTED_ROLLUP_SQL)
+
+
+def verify(conn):
+    """Return (date, category, expected, actual) for every rollup row that is wrong.
+
+    ``expected`` and ``actual`` are (total, count, min, max, month) tuples
+    with amounts in centavos, or None when the row is missing on that side. Integer sums are
+    exact, so any difference is a real mismatch.
+    """
+    expected = {(row[0], row[1]): row[2:] for row in conn.execute(EXPECTED_ROLLUP_SQL)}
+    mismatches = []
+    for row in conn.execute("SELECT * FROM daily_category_totals"):
+        key, actual = (row[0], row[1]), row[2:]
+        want = expected.pop(key, None)
+        if want != actual:
+            mismatches.append((day_to_date(key[0]), key[1], want, actual))
+    for (day, category), want in expected.items():
+        mismatches.append((day_to_date(day), category, want, None))
+    return sorted(mismatches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify or rebuild the daily rollup table.")
+    parser.add_argument("command", choices=("verify", "rebuild"))
+    parser.add_argument("--db", default="expenses.db")
+    args = parser.parse_args(argv)
+
+    # Open through the tracker so the schema is migrated first.
+    from .tracker import ExpenseTracker
+    with ExpenseTracker(args.db) as tracker:
+        if args.command == "rebuild":
+            tracker.rebuild_rollup()
+            print("Rollup rebuilt.")
+            return 0
+        mismatches = tracker.verify_rollup()
+    for date, category, want, actual in mismatches[:20]:
+        print(f"{date} {category}: expected {want}, found {actual}")
+    if mismatches:
+        print(f"{len(mismatches)} rollup rows differ; run 'rebuild' to fix them.")
+        return 1
+    print("Rollup is consistent.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
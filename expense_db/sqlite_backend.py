@@ -0,0 +1,292 @@
+# expense_db/sqlite_backend.py
+"""SQLite storage for ExpenseTracker: one database file in WAL mode.
+
+Each thread gets its own persistent connection; an in-memory database only
+exists on the connection that created it, so that case shares a single
+connection. The schema is created and upgraded by migrations.py.
+"""
+import sqlite3
+import threading
+
+from . import rollup
+from .days import WEEK_OFFSET
+from .migrations import migrate
+from .records import expense_row
+from .storage import StorageBackend, search_words
+
+# SQL is kept in module constants so every call passes the identical string
+# and sqlite3's per-connection statement cache reuses the prepared statement.
+INSERT_EXPENSE_SQL = '''
+    INSERT INTO expenses (category, amount_cents, date, description)
+    VALUES (?, ?, ?, ?)
+'''
+# Amounts are stored as integer centavos; rows come back with a float peso
+# amount in the same position as the original REAL column, as Expense
+# records when read through expenses() below.
+EXPENSE_COLUMNS = "id, category, amount_cents / 100.0 AS amount, date, description"
+SELECT_ALL_SQL = f'SELECT {EXPENSE_COLUMNS} FROM expenses ORDER BY date DESC'
+# Keyset pages walk idx_expenses_date backwards; the index carries the rowid,
+# so (date, id) order needs no sort and each page starts with an index seek.
+FIRST_PAGE_SQL = f'''
+    SELECT {EXPENSE_COLUMNS} FROM expenses
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+'''
+NEXT_PAGE_SQL = f'''
+    SELECT {EXPENSE_COLUMNS} FROM expenses
+    WHERE (date, id) < (?, ?)
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+'''
+PREV_PAGE_SQL = f'''
+    SELECT {EXPENSE_COLUMNS} FROM expenses
+    WHERE (date, id) > (?, ?)
+    ORDER BY date, id
+    LIMIT ?
+'''
+# Period filters and buckets use the integer day number (see days.py): an
+# integer range seek on idx_expenses_day_category_amount or the rollup key.
+SELECT_PERIOD_SQL = f'''
+    SELECT {EXPENSE_COLUMNS} FROM expenses
+    WHERE day >= ?
+    ORDER BY day DESC
+'''
+SUMMARY_SQL = '''
+    SELECT category, SUM(total_cents) FROM daily_category_totals
+    WHERE day >= ?
+    GROUP BY category
+'''
+DAILY_TOTALS_SQL = '''
+    SELECT day, SUM(total_cents) FROM daily_category_totals
+    WHERE day >= ?
+    GROUP BY day
+    ORDER BY day
+'''
+WEEKLY_TOTALS_SQL = f'''
+    SELECT (day + {WEEK_OFFSET}) / 7 AS week, SUM(total_cents) FROM daily_category_totals
+    WHERE day >= ?
+    GROUP BY week
+    ORDER BY week
+'''
+MONTHLY_TOTALS_SQL = '''
+    SELECT month, SUM(total_cents) FROM daily_category_totals
+    WHERE day >= ?
+    GROUP BY month
+    ORDER BY month
+'''
+# Full-text search walks the FTS5 matches newest first (cheap rowid order)
+# and ranks only the first ?5 of them by bm25, so a word that matches
+# millions of rows costs the same as a rare one. Description hits weigh
+# twice as much as category hits.
+SEARCH_SQL = f'''
+    SELECT {EXPENSE_COLUMNS} FROM (
+        SELECT expenses.*, bm25(expenses_fts, 2.0, 1.0) AS score
+        FROM expenses_fts CROSS JOIN expenses ON expenses.id = expenses_fts.rowid
+        WHERE expenses_fts MATCH ?1 AND expenses.day BETWEEN ?2 AND ?3
+          AND (?4 IS NULL OR expenses.category = ?4)
+        ORDER BY expenses_fts.rowid DESC
+        LIMIT ?5
+    )
+    ORDER BY score, id DESC
+    LIMIT ?6 OFFSET ?7
+'''
+COLUMNS_SQL = 'SELECT day, category, amount_cents FROM expenses WHERE day >= ?'
+SELECT_ONE_SQL = f'SELECT {EXPENSE_COLUMNS} FROM expenses WHERE id = ?'
+DELETE_EXPENSE_SQL = 'DELETE FROM expenses WHERE id = ?'
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def _period_stats_sql(periods):
+    """Build one GROUP BY query computing stats for several cutoffs at once.
+
+    Parameter ?1 is the earliest cutoff (bounds the index range scan) and
+    ?2.. are the per-period cutoffs, evaluated with conditional aggregates
+    over the daily rollup.
+    """
+    columns = []
+    for i in range(2, periods + 2):
+        in_period = f"CASE WHEN day >= ?{i} THEN"
+        columns.append(f"SUM({in_period} total_cents END), SUM({in_period} count END), "
+                       f"MIN({in_period} min_cents END), MAX({in_period} max_cents END)")
+    return (f"SELECT category, {', '.join(columns)} FROM daily_category_totals "
+            f"WHERE day >= ?1 GROUP BY category")
+
+
+def match_expression(words, category=None):
+    """Build an FTS5 MATCH expression from search_words() output.
+
+    Words are quoted, so FTS5 operators in user input are searched for
+    literally; the last one is a prefix. Words of ``category`` narrow the
+    match to that category's index entries before the exact check.
+    """
+    expression = " ".join(f'"{word}"' for word in words) + "*"
+    category_words = search_words(category or "")
+    if category_words:
+        expression = f'({expression}) AND category : "{" ".join(category_words)}"'
+    return expression
+
+
+def expenses(conn, sql, params=()):
+    """Run an EXPENSE_COLUMNS query on ``conn``; its rows come back as Expense records."""
+    cursor = conn.cursor()
+    cursor.row_factory = expense_row
+    return cursor.execute(sql, params)
+
+
+class SQLiteBackend(StorageBackend):
+    def __init__(self, db_name="expenses.db", synchronous="NORMAL",
+                 cache_size=-16000, mmap_size=64 * 1024 * 1024, cached_statements=64):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {SYNCHRONOUS_MODES}")
+        self.name = self.db_name = db_name
+        self.synchronous = synchronous
+        self.cache_size = int(cache_size)
+        self.mmap_size = int(mmap_size)
+        self.cached_statements = cached_statements
+        self.shared = db_name == ":memory:"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._closed = False
+        self._trace = None
+        migrate(self._connection())
+
+    def _connect(self, path=None):
+        """Open a connection to ``path`` (default: the database) and apply the pragmas."""
+        conn = sqlite3.connect(
+            path or self.db_name,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if self._trace is not None:
+            conn.set_trace_callback(self._trace)
+        return conn
+
+    def _connection(self):
+        """Return the calling thread's connection, opening it on first use."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("ExpenseTracker has been closed")
+        if self.shared:
+            with self._lock:
+                if not self._connections:
+                    self._connections.append(self._connect())
+                return self._connections[0]
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection opened by this backend."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._closed = True
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def set_trace_callback(self, callback):
+        self._trace = callback
+        with self._lock:
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+
+    def explain(self, sql, params=()):
+        """Return the EXPLAIN QUERY PLAN detail lines for ``sql``."""
+        rows = self._connection().execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return [row[3] for row in rows]
+
+    def has_partitions(self):
+        """True once expenses have been archived out of this file (see partitions.py)."""
+        row = self._connection().execute("SELECT 1 FROM partitions LIMIT 1").fetchone()
+        return row is not None
+
+    def insert(self, rows):
+        conn = self._connection()
+        with conn:
+            if len(rows) == 1:
+                cursor = conn.execute(INSERT_EXPENSE_SQL, rows[0])
+                return range(cursor.lastrowid, cursor.lastrowid + 1)
+            conn.executemany(INSERT_EXPENSE_SQL, rows)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return range(last_id - len(rows) + 1, last_id + 1)
+
+    def delete(self, expense_id):
+        conn = self._connection()
+        with conn:
+            expense = expenses(conn, SELECT_ONE_SQL, (expense_id,)).fetchone()
+            conn.execute(DELETE_EXPENSE_SQL, (expense_id,))
+        return expense
+
+    def get(self, expense_id):
+        return expenses(self._connection(), SELECT_ONE_SQL, (expense_id,)).fetchone()
+
+    def all_expenses(self):
+        return expenses(self._connection(), SELECT_ALL_SQL).fetchall()
+
+    def page(self, page_size, after=None, before=None):
+        conn = self._connection()
+        if before is not None:
+            date, expense_id = before
+            rows = expenses(conn, PREV_PAGE_SQL, (date, expense_id, page_size)).fetchall()
+            rows.reverse()
+            return rows
+        if after is None:
+            return expenses(conn, FIRST_PAGE_SQL, (page_size,)).fetchall()
+        date, expense_id = after
+        return expenses(conn, NEXT_PAGE_SQL, (date, expense_id, page_size)).fetchall()
+
+    def period(self, start_day):
+        return expenses(self._connection(), SELECT_PERIOD_SQL, (start_day,)).fetchall()
+
+    def category_totals(self, start_day):
+        return self._connection().execute(SUMMARY_SQL, (start_day,)).fetchall()
+
+    def daily_totals(self, start_day):
+        return self._connection().execute(DAILY_TOTALS_SQL, (start_day,)).fetchall()
+
+    def weekly_totals(self, start_day):
+        return self._connection().execute(WEEKLY_TOTALS_SQL, (start_day,)).fetchall()
+
+    def monthly_totals(self, start_day):
+        return self._connection().execute(MONTHLY_TOTALS_SQL, (start_day,)).fetchall()
+
+    def period_stats(self, starts):
+        return self._connection().execute(
+            _period_stats_sql(len(starts)), [min(starts)] + list(starts)
+        ).fetchall()
+
+    def search(self, words, first_day, last_day, category, candidates, page_size, offset):
+        return expenses(self._connection(), SEARCH_SQL, (
+            match_expression(words, category), first_day, last_day, category,
+            candidates, page_size, offset,
+        )).fetchall()
+
+    def columns(self, start_day):
+        return self._connection().execute(COLUMNS_SQL, (start_day,))
+
+    def change_counter(self):
+        return self._connection().execute(
+            "SELECT value FROM change_counter WHERE id = 1").fetchone()[0]
+
+    def data_version(self):
+        """PRAGMA data_version, which changes when another connection commits."""
+        return self._connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def rebuild_rollup(self):
+        conn = self._connection()
+        with conn:
+            rollup.rebuild(conn)
+
+    def verify_rollup(self):
+        return rollup.verify(self._connection())
@@ -0,0 +1,134 @@
+# expense_db/storage.py
+"""The storage interface behind ExpenseTracker.
+
+ExpenseTracker validates input, converts amounts and dates, caches and
+instruments calls; a backend only stores rows and answers queries. Two
+backends implement this interface: SQLiteBackend (sqlite_backend.py, the
+default, one database file) and MemoryBackend (memory_backend.py, sorted
+in-memory columns with optional snapshots to disk).
+benchmarks/check_backends.py runs the same calls against both and checks
+that they agree.
+
+Conventions shared by every backend:
+
+* An expense row is an Expense record (see records.py) with fields
+  ``id, category, amount, date, description``, the amount as a float
+  number of pesos and the date as 'YYYY-MM-DD'.
+* Rows to insert are ``(category, cents, date, description)`` tuples that
+  have already been validated (see tracker.normalize_expense).
+* Periods are given as integer day numbers and aggregates are returned in
+  integer centavos (see days.py and money.py).
+* "Newest first" means by date, then id, descending; rows on the same day
+  may come back in any order from period().
+"""
+import re
+import unicodedata
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def search_words(text):
+    """Split search text into lowercase words without accents.
+
+    Mirrors the FTS5 unicode61 tokenizer with remove_diacritics, so "Café"
+    and "cafe" are the same word to every backend.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+
+class StorageBackend:
+    # True when every thread shares one connection, so concurrent readers
+    # would only queue behind each other (see AsyncExpenseTracker)
+    shared = False
+    name = None
+
+    def close(self):
+        """Release connections and files; the backend cannot be used afterwards."""
+
+    def insert(self, rows):
+        """Insert rows in one transaction and return the range of their new ids."""
+        raise NotImplementedError
+
+    def delete(self, expense_id):
+        """Delete an expense and return its row, or None when there was none."""
+        raise NotImplementedError
+
+    def get(self, expense_id):
+        """Return one expense row, or None."""
+        raise NotImplementedError
+
+    def all_expenses(self):
+        """Return every expense row, newest first."""
+        raise NotImplementedError
+
+    def page(self, page_size, after=None, before=None):
+        """Return a keyset page of rows, newest first (see ExpenseTracker.get_expenses_page)."""
+        raise NotImplementedError
+
+    def period(self, start_day):
+        """Return the rows dated on or after ``start_day``, newest day first."""
+        raise NotImplementedError
+
+    def category_totals(self, start_day):
+        """Return [(category, total cents)] since ``start_day`` in any order."""
+        raise NotImplementedError
+
+    def daily_totals(self, start_day):
+        """Return [(day, total cents)] since ``start_day``, oldest first."""
+        raise NotImplementedError
+
+    def weekly_totals(self, start_day):
+        """Return [(week number, total cents)] since ``start_day``, oldest first."""
+        raise NotImplementedError
+
+    def monthly_totals(self, start_day):
+        """Return [(month number, total cents)] since ``start_day``, oldest first."""
+        raise NotImplementedError
+
+    def period_stats(self, starts):
+        """Return one row per category with (total, count, min, max) cents for each start day.
+
+        Rows are ``(category, total1, count1, min1, max1, total2, ...)`` with
+        None in place of a period's four values when the category has no
+        expenses in it; categories with none in any period are left out.
+        """
+        raise NotImplementedError
+
+    def search(self, words, first_day, last_day, category, candidates, page_size, offset):
+        """Return a page of rows matching every word, best match first.
+
+        The last word also matches as a prefix. Words are matched against
+        the description and category, case- and accent-insensitively. Only
+        the ``candidates`` newest matching expenses (by id) are ranked; how
+        they are ranked is up to the backend.
+        """
+        raise NotImplementedError
+
+    def columns(self, start_day):
+        """Iterate (day, category, cents) for the expenses since ``start_day``."""
+        raise NotImplementedError
+
+    def change_counter(self):
+        """Return a counter bumped by every write and kept across restarts."""
+        raise NotImplementedError
+
+    def data_version(self):
+        """Return a value that changes when someone else writes to the same storage."""
+        raise NotImplementedError
+
+    def rebuild_rollup(self):
+        """Recompute the per-day aggregates from the rows."""
+        raise NotImplementedError
+
+    def verify_rollup(self):
+        """Return (date, category, expected, actual) for every wrong per-day aggregate."""
+        raise NotImplementedError
+
+    def set_trace_callback(self, callback):
+        """Call ``callback(sql)`` for every statement run, or stop with None."""
+
+    def explain(self, sql, params=()):
+        """Return the query plan lines for ``sql``; only meaningful for SQL backends."""
+        raise NotImplementedError(f"{type(self).__name__} does not run SQL")
@@ -1,74 +1,494 @@
 # expense_db/tracker.py
-import sqlite3
-from datetime import datetime, timedelta
-from collections import defaultdict
+import functools
+import threading
+from datetime import date as date_type, datetime
+from collections.abc import Mapping
+from decimal import ROUND_HALF_UP
+from itertools import islice
+
+from .cache import MISSING, ResultCache
+from .days import (WEEK_OFFSET, current_day, date_to_day, day_to_date, days_ago,
+                   month_label, month_of, month_start_day, week_of, week_start)
+from .money import CENT, cents_to_decimal, cents_to_float, float_to_decimal, to_cents
+from .partitions import PartitionedSQLiteBackend
+from .records import Expense, ExpenseBatch
+from .sqlite_backend import SQLiteBackend
+from .storage import search_words
+
+# Search ranks at most this many of the newest matching expenses (see search)
+SEARCH_CANDIDATES = 2000
+EXPENSE_FIELDS = ("category", "amount", "date", "description")
+
+
+def normalize_expense(record, default_date=None):
+    """Validate one expense record and return an insertable tuple.
+
+    A record is either a mapping with EXPENSE_FIELDS keys or a sequence
+    ``(category, amount[, date[, description]])``. The returned amount is
+    in integer centavos. Raises ValueError.
+    """
+    if isinstance(record, Mapping):
+        category = record.get("category")
+        amount = record.get("amount")
+        date = record.get("date")
+        description = record.get("description")
+    else:
+        if not 2 <= len(record) <= 4:
+            raise ValueError(f"expected 2 to 4 fields, got {len(record)}")
+        category, amount, date, description = (tuple(record) + (None, None))[:4]
+
+    if not isinstance(category, str) or not category.strip():
+        raise ValueError("category cannot be empty")
+    cents = to_cents(amount)
+    if cents <= 0:
+        raise ValueError(f"amount must be positive, got {amount!r}")
+    if not date:
+        date = default_date or datetime.now().strftime("%Y-%m-%d")
+    elif not _is_iso_date(date):
+        raise ValueError(f"invalid date {date!r}, expected YYYY-MM-DD")
+    return (category.strip(), cents, date, description or "")
+
+
+def page_key(expense):
+    """Return the (date, id) keyset position of an expense row."""
+    return (expense.date, expense.id)
+
+
+def period_start(days):
+    """Return the YYYY-MM-DD cutoff used for "the last N days" queries."""
+    return day_to_date(days_ago(days))
+
+
+def _is_iso_date(value):
+    try:
+        return date_type.fromisoformat(value).isoformat() == value
+    except (TypeError, ValueError):
+        return False
+
+
+def _freeze(value):
+    """Make a call argument hashable for use in a cache key."""
+    if isinstance(value, dict):
+        # Keys in insertion order: it sets the result order, and keys of
+        # mixed types would not sort
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _cached(method):
+    """Serve a read method from the tracker's result cache when it is enabled."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self._result_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        self._check_result_cache()
+        key = (name, _freeze(args), _freeze(kwargs))
+        value = cache.get(key)
+        if value is MISSING:
+            generation = cache.generation
+            value = method(self, *args, **kwargs)
+            cache.put(key, value, generation)
+        return value
+    return wrapper
+
+
+def _timed(method):
+    """Record the call with the tracker's instrumentation when one is attached."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self._instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        return instrumentation.call(self, name, method, args, kwargs)
+    return wrapper
+
 
 class ExpenseTracker:
-    def __init__(self, db_name="expenses.db"):
-        self.db_name = db_name
-        self.init_database()
-    
-    def init_database(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT NOT NULL,
-                amount REAL NOT NULL,
-                date TEXT NOT NULL,
-                description TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
-    
+    def __init__(self, db_name="expenses.db", synchronous="NORMAL",
+                 cache_size=-16000, mmap_size=64 * 1024 * 1024,
+                 cached_statements=64, decimal=False,
+                 result_cache_entries=0, result_cache_bytes=8 * 1024 * 1024,
+                 instrumentation=None, backend=None):
+        # Storage is pluggable (see storage.py); by default it is the SQLite
+        # database ``db_name`` and the connection options apply to it, with
+        # its archive files once it has any (see partitions.py).
+        self._options = dict(synchronous=synchronous, cache_size=cache_size,
+                             mmap_size=mmap_size, cached_statements=cached_statements)
+        self._switch_lock = threading.Lock()
+        self._retired = []
+        # True while an SQLite file without archives might get some from
+        # another process (see the backend property)
+        self._watch_partitions = False
+        if backend is None:
+            backend = SQLiteBackend(db_name, **self._options)
+            if backend.has_partitions():
+                backend.close()
+                backend = PartitionedSQLiteBackend(db_name, **self._options)
+            else:
+                self._watch_partitions = db_name != ":memory:"
+        self._backend = backend
+        self.db_name = backend.name
+        # decimal=True returns amounts and totals as exact Decimals instead
+        # of floats; storage is integer centavos either way.
+        self.decimal = decimal
+        self._money = cents_to_decimal if decimal else cents_to_float
+        # Optional LRU cache of read results; cached values are shared between
+        # callers, so treat them as read-only.
+        self._result_cache = None
+        if result_cache_entries:
+            self._result_cache = ResultCache(result_cache_entries, result_cache_bytes)
+        # Cache freshness is tracked per thread (see _check_result_cache)
+        self._local = threading.local()
+        # Optional Instrumentation (see instrument.py); None costs one check per call
+        self._instrumentation = None
+        self.instrument(instrumentation)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def backend(self):
+        """The storage backend, switched to PartitionedSQLiteBackend once the file has archives.
+
+        ``python -m expense_db.partitions archive`` may run while this
+        tracker is open. Another connection's commit changes the calling
+        thread's data_version, and only then is the partitions table
+        checked again, so the usual cost is one PRAGMA per call.
+        """
+        backend = self._backend
+        if self._watch_partitions:
+            version = backend.data_version()
+            if getattr(self._local, "partition_version", None) != version:
+                self._local.partition_version = version
+                if backend.has_partitions():
+                    backend = self._switch_to_partitions()
+        return backend
+
+    def _switch_to_partitions(self):
+        with self._switch_lock:
+            if self._watch_partitions:
+                backend = PartitionedSQLiteBackend(self.db_name, **self._options)
+                if self._instrumentation is not None:
+                    backend.set_trace_callback(self._instrumentation.trace)
+                # Other threads may still be running a query on the old one
+                self._retired.append(self._backend)
+                self._backend = backend
+                self._watch_partitions = False
+                self._wrote()
+            return self._backend
+
+    def _connection(self):
+        """Return the calling thread's SQLite connection (SQLite backend only)."""
+        return self.backend._connection()
+
+    def close(self):
+        """Close the backend's connections."""
+        self._backend.close()
+        for backend in self._retired:
+            backend.close()
+
+    def explain(self, sql, params=()):
+        """Return the EXPLAIN QUERY PLAN detail lines for ``sql``."""
+        return self.backend.explain(sql, params)
+
+    def instrument(self, instrumentation):
+        """Attach an Instrumentation to record every call, or detach it with None."""
+        self._instrumentation = instrumentation
+        self.backend.set_trace_callback(
+            instrumentation.trace if instrumentation is not None else None)
+
+    @property
+    def instrumentation(self):
+        return self._instrumentation
+
+    def _check_result_cache(self):
+        """Invalidate cached results after another connection commits or the day changes.
+
+        PRAGMA data_version is per connection, so each thread compares against
+        the last value it saw; a thread's first lookup invalidates because it
+        cannot know what happened before it connected.
+        """
+        state = (self.data_version(), current_day())
+        if getattr(self._local, "cache_state", None) != state:
+            self._result_cache.invalidate()
+            self._local.cache_state = state
+
+    def _wrote(self):
+        """Bump the write generation; called after every committed write."""
+        if self._result_cache is not None:
+            self._result_cache.invalidate()
+
+    def cache_stats(self):
+        """Return result cache hits, misses and size, or None when the cache is off."""
+        return self._result_cache.stats() if self._result_cache is not None else None
+
+    @_timed
     def add_expense(self, category, amount, date=None, description=""):
-        if date is None:
-            date = datetime.now().strftime("%Y-%m-%d")
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO expenses (category, amount, date, description)
-            VALUES (?, ?, ?, ?)
-        ''', (category, amount, date, description))
-        conn.commit()
-        conn.close()
-        return True
-    
+        """Add a new expense and return its id.
+
+        ``amount`` may be an int, float, str or Decimal number of pesos; it
+        is rounded to the nearest centavo. Validated like add_expenses (see
+        normalize_expense); raises ValueError.
+        """
+        row = normalize_expense((category, amount, date, description))
+        ids = self.backend.insert([row])
+        self._wrote()
+        return ids.start
+
+    @_timed
+    def add_expenses(self, expenses, batch_size=1000):
+        """Insert many expenses, committing once per batch.
+
+        ``expenses`` may be any iterable (including a generator) of records
+        accepted by normalize_expense; only one batch is held in memory at a
+        time. Each batch is validated before it is written, so a bad record
+        raises ValueError without inserting its batch (earlier batches stay
+        committed). Returns the range of inserted ids; ids are contiguous
+        unless another connection writes between batches.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        today = datetime.now().strftime("%Y-%m-%d")
+        records = iter(expenses)
+        first_id = last_id = None
+        offset = 0
+        while True:
+            batch = []
+            for index, record in enumerate(islice(records, batch_size), offset):
+                try:
+                    batch.append(normalize_expense(record, today))
+                except (TypeError, ValueError) as exc:
+                    raise ValueError(f"expense #{index}: {exc}") from None
+            if not batch:
+                break
+            ids = self._insert_batch(batch)
+            if first_id is None:
+                first_id = ids.start
+            last_id = ids.stop - 1
+            offset += len(batch)
+        if first_id is None:
+            return range(0)
+        return range(first_id, last_id + 1)
+
+    @_timed
+    def _insert_batch(self, batch):
+        """Insert normalized rows (amounts in centavos) in one transaction and return their ids."""
+        ids = self.backend.insert(batch)
+        self._wrote()
+        return ids
+
+    def _rows(self, rows):
+        """Convert the amount of fetched rows to Decimal in decimal mode."""
+        if not self.decimal:
+            return rows
+        return [Expense(row.id, row.category, float_to_decimal(row.amount), row.date,
+                        row.description) for row in rows]
+
+    @_timed
+    @_cached
     def get_all_expenses(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM expenses ORDER BY date DESC')
-        expenses = cursor.fetchall()
-        conn.close()
-        return expenses
-    
+        return self._rows(self.backend.all_expenses())
+
+    @_timed
+    @_cached
+    def get_expenses_page(self, page_size=100, after=None, before=None):
+        """Return up to ``page_size`` expenses, newest first.
+
+        ``after`` is the (date, id) key of the last row of the previous page
+        (see page_key); None starts from the newest expense. ``before`` pages
+        the other way: the rows just newer than that key, still newest first.
+        """
+        return self._fetch_page(page_size, after, before)
+
+    def _fetch_page(self, page_size, after=None, before=None):
+        return self._rows(self.backend.page(page_size, after, before))
+
+    def iter_expenses(self, page_size=500, after=None):
+        """Yield every expense newest first, fetching ``page_size`` rows at a time."""
+        # Streams bypass the result cache so they do not evict everything else
+        while True:
+            page = self._fetch_page(page_size, after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page_key(page[-1])
+
+    @_timed
+    def get_expenses_batch(self, days=None, page_size=5000):
+        """Return every expense (or the last N days') as an ExpenseBatch, newest first.
+
+        For result sets too big to hold as Expense records: rows are read a
+        page at a time into typed columns (see records.py), so only one page
+        of records exists at once. Bypasses the result cache like iter_expenses.
+        """
+        batch = ExpenseBatch(decimal=self.decimal)
+        cutoff = None if days is None else period_start(days)
+        after = None
+        while True:
+            page = self.backend.page(page_size, after)
+            if cutoff is not None and page and page[-1].date < cutoff:
+                batch.extend(expense for expense in page if expense.date >= cutoff)
+                return batch
+            batch.extend(page)
+            if len(page) < page_size:
+                return batch
+            after = page_key(page[-1])
+
+    @_timed
+    @_cached
     def get_expenses_by_period(self, days=7):
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM expenses 
-            WHERE date >= ? 
-            ORDER BY date DESC
-        ''', (start_date,))
-        expenses = cursor.fetchall()
-        conn.close()
-        return expenses
-    
+        return self._rows(self.backend.period(days_ago(days)))
+
+    @_timed
+    @_cached
     def get_summary_by_category(self, days=7):
-        expenses = self.get_expenses_by_period(days)
-        summary = defaultdict(float)
-        for expense in expenses:
-            category = expense[1]
-            amount = expense[2]
-            summary[category] += amount
-        return dict(summary)
-    
+        rows = self.backend.category_totals(days_ago(days))
+        money = self._money
+        return {category: money(cents) for category, cents in rows}
+
+    @_timed
+    @_cached
+    def get_daily_totals(self, days=30):
+        """Return [(date, total)] for the last N days, oldest first."""
+        rows = self.backend.daily_totals(days_ago(days))
+        money = self._money
+        return [(day_to_date(day), money(cents)) for day, cents in rows]
+
+    @_timed
+    @_cached
+    def get_weekly_totals(self, weeks=12):
+        """Return [(monday, total)] for the last N weeks including this one, oldest first."""
+        first_week = week_of(current_day()) - weeks + 1
+        rows = self.backend.weekly_totals(first_week * 7 - WEEK_OFFSET)
+        money = self._money
+        return [(week_start(week), money(cents)) for week, cents in rows]
+
+    @_timed
+    @_cached
+    def get_monthly_totals(self, months=12):
+        """Return [("YYYY-MM", total)] for the last N months including this one, oldest first."""
+        first_month = month_of(datetime.now().date()) - months + 1
+        rows = self.backend.monthly_totals(month_start_day(first_month))
+        money = self._money
+        return [(month_label(month), money(cents)) for month, cents in rows]
+
+    @_timed
+    def get_category_stats(self, days=7):
+        """Per-category total, count, min, max and avg for the last N days."""
+        return self.get_period_summaries({days: days})[days]
+
+    @_timed
+    @_cached
+    def get_period_summaries(self, periods):
+        """Category stats for several periods using a single query.
+
+        ``periods`` maps a name to a number of days, e.g.
+        ``{"week": 7, "month": 30, "year": 365}``. Returns
+        ``{name: {category: {"total", "count", "min", "max", "avg"}}}``.
+        """
+        names = list(periods)
+        if not names:
+            return {}
+        starts = [days_ago(periods[name]) for name in names]
+        rows = self.backend.period_stats(starts)
+        money = self._money
+        result = {name: {} for name in names}
+        for row in rows:
+            category = row[0]
+            for i, name in enumerate(names):
+                total, count, low, high = row[1 + 4 * i:5 + 4 * i]
+                if count:
+                    avg = money(total) / count
+                    if self.decimal:
+                        avg = avg.quantize(CENT, rounding=ROUND_HALF_UP)
+                    result[name][category] = {
+                        "total": money(total), "count": count,
+                        "min": money(low), "max": money(high), "avg": avg,
+                    }
+        return result
+
+    @_timed
+    @_cached
+    def search(self, query, date_range=None, category=None, page_size=50, page=0):
+        """Return one page of expenses matching ``query``, best match first.
+
+        ``query`` is free text matched against descriptions and categories
+        (see search_words). ``date_range`` is an inclusive (start, end) pair
+        of YYYY-MM-DD dates, either of which may be None; ``category`` keeps
+        only that exact category. When more than SEARCH_CANDIDATES expenses
+        match, only the newest SEARCH_CANDIDATES are ranked and paged through.
+        """
+        words = search_words(query)
+        if not words:
+            return []
+        start, end = date_range or (None, None)
+        for value in (start, end):
+            if value is not None and not _is_iso_date(value):
+                raise ValueError(f"invalid date {value!r}, expected YYYY-MM-DD")
+        first = date_to_day(start) if start else -2 ** 31
+        last = date_to_day(end) if end else 2 ** 31
+        rows = self.backend.search(words, first, last, category, SEARCH_CANDIDATES,
+                                   page_size, page * page_size)
+        return self._rows(rows)
+
+    @_timed
+    def snapshot(self, page_size=100, summary_days=7):
+        """Everything a list-and-summary view needs to redraw, read in one call.
+
+        Returns (first page, category stats, summary start date,
+        data_version). data_version is read first, so a commit that lands
+        while the rest is loading still shows up as a change afterwards.
+        """
+        version = self.data_version()
+        return (
+            self.get_expenses_page(page_size),
+            self.get_category_stats(summary_days),
+            period_start(summary_days),
+            version,
+        )
+
+    @_timed
+    @_cached
+    def get_expense(self, expense_id):
+        """Return one expense row by ID, or None."""
+        row = self.backend.get(expense_id)
+        return row and self._rows([row])[0]
+
+    @_timed
     def delete_expense(self, expense_id):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM expenses WHERE id = ?', (expense_id,))
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        """Delete an expense by ID and return the deleted row, or None."""
+        expense = self.backend.delete(expense_id)
+        self._wrote()
+        return expense and self._rows([expense])[0]
+
+    @_timed
+    def change_counter(self):
+        """Return the persistent counter bumped by every insert, update and delete."""
+        return self.backend.change_counter()
+
+    @_timed
+    def data_version(self):
+        """Return PRAGMA data_version, which changes when another connection commits."""
+        return self.backend.data_version()
+
+    @_timed
+    def rebuild_rollup(self):
+        """Recompute the daily category rollup from the raw expenses."""
+        self.backend.rebuild_rollup()
+        self._wrote()
+
+    @_timed
+    def verify_rollup(self):
+        """Return rollup rows that disagree with the raw expenses (empty if none)."""
+        return self.backend.verify_rollup()
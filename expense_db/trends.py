@@ -0,0 +1,256 @@
+# expense_db/trends.py
+"""Rolling statistics of daily spending: moving sums, means, medians, spread.
+
+RollingWindow keeps the last N values of a series with a running sum and
+sum of squares (mean and standard deviation in O(1)) and a sorted copy
+(median and percentiles by index; a new value is placed by bisection, so an
+update costs O(log N) comparisons plus a memmove of at most N pointers).
+
+DailyTrends feeds one day total at a time into several windows and keeps
+each window's statistics for every day, which is what the chart overlays
+draw. add() records a new (or deleted) expense without recomputing
+anything: today's total is swapped in place in every window, and a day
+after the last one just pushes the days in between. Only a change to a
+past day replays the days after it.
+
+    trends = DailyTrends.from_tracker(tracker, days=90, windows=(7, 30))
+    trends.add(date_to_day("2024-05-02"), 15000)   # a new ₱150 expense
+    trends.latest(30)["median"]
+
+Amounts go in as integer centavos and statistics come out in pesos.
+
+Usage: python -m expense_db.trends [--db expenses.db] [--windows 7,30,90]
+"""
+import argparse
+import math
+import os
+import sys
+from bisect import bisect_left, insort
+from collections import deque
+
+from .days import current_day, day_to_date, days_ago
+from .tracker import ExpenseTracker
+
+DEFAULT_WINDOWS = (7, 30)
+DEFAULT_PERCENTILES = (10, 90)
+
+
+class RollingWindow:
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError("window size must be at least 1")
+        self.size = size
+        self.values = deque()
+        self._sorted = []
+        self.total = 0
+        self._squares = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def _insert(self, value):
+        insort(self._sorted, value)
+        self.total += value
+        self._squares += value * value
+
+    def _remove(self, value):
+        del self._sorted[bisect_left(self._sorted, value)]
+        self.total -= value
+        self._squares -= value * value
+
+    def push(self, value):
+        """Add a value, dropping the oldest once the window is full."""
+        self.values.append(value)
+        self._insert(value)
+        if len(self.values) > self.size:
+            self._remove(self.values.popleft())
+
+    def replace_last(self, value):
+        """Change the newest value (e.g. today's total after another expense)."""
+        self._remove(self.values[-1])
+        self.values[-1] = value
+        self._insert(value)
+
+    def clear(self):
+        self.values.clear()
+        self._sorted.clear()
+        self.total = self._squares = 0
+
+    def mean(self):
+        return self.total / len(self.values)
+
+    def std(self):
+        """Population standard deviation, from exact integer sums."""
+        n = len(self.values)
+        return math.sqrt(max(n * self._squares - self.total * self.total, 0)) / n
+
+    def percentile(self, p):
+        """The p-th percentile (0-100), interpolating between the closest ranks."""
+        rank = (len(self._sorted) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(self._sorted) - 1)
+        return self._sorted[low] + (self._sorted[high] - self._sorted[low]) * (rank - low)
+
+    def median(self):
+        return self.percentile(50)
+
+
+class DailyTrends:
+    def __init__(self, windows=DEFAULT_WINDOWS, percentiles=DEFAULT_PERCENTILES):
+        """Track rolling statistics over each window size (in days) of daily totals.
+
+        Windows that have not seen ``size`` days yet cover the days they have.
+        ``percentiles`` are reported next to the median, e.g. (10, 90).
+        """
+        self.windows = {size: RollingWindow(size) for size in sorted(set(windows))}
+        self.percentiles = tuple(percentiles)
+        self.first_day = None
+        self.daily = []  # every day's total in centavos, oldest first
+        self.points = {size: [] for size in self.windows}  # per day, per window
+
+    @classmethod
+    def from_tracker(cls, tracker, days=90, windows=DEFAULT_WINDOWS,
+                     percentiles=DEFAULT_PERCENTILES):
+        """Trends for the last ``days`` days, warmed up on the days before them.
+
+        Loads enough extra history that the first day shown already has full
+        windows, and runs through today so quiet days count as zero.
+        """
+        trends = cls(windows, percentiles)
+        start = days_ago(days + max(trends.windows) - 1)
+        trends.first_day = start
+        for day, cents in tracker.backend.daily_totals(start):
+            trends.add(day, cents)
+        trends.advance_to(current_day())
+        return trends
+
+    def _point(self, window):
+        values = (window.total, window.mean(), window.median(), window.std())
+        return values + tuple(window.percentile(p) for p in self.percentiles)
+
+    def _push_day(self, cents):
+        self.daily.append(cents)
+        for size, window in self.windows.items():
+            window.push(cents)
+            self.points[size].append(self._point(window))
+
+    def advance_to(self, day):
+        """Close every day up to ``day`` with no spending recorded yet."""
+        if self.first_day is None:
+            self.first_day = day
+        while self.first_day + len(self.daily) <= day:
+            self._push_day(0)
+
+    def add(self, day, cents):
+        """Record ``cents`` spent on ``day``; pass a negative amount for a deleted expense."""
+        if self.first_day is None:
+            self.first_day = day
+        index = day - self.first_day
+        if index < 0:
+            # Before the history starts: rebuild once with the earlier first day
+            self.daily = [cents] + [0] * (-index - 1) + self.daily
+            self.first_day = day
+            self._replay(0)
+            return
+        if index >= len(self.daily):
+            self.advance_to(day - 1)
+            self._push_day(cents)
+        elif index == len(self.daily) - 1:
+            self.daily[index] += cents
+            for size, window in self.windows.items():
+                window.replace_last(self.daily[index])
+                self.points[size][index] = self._point(window)
+        else:
+            self.daily[index] += cents
+            self._replay(index)
+
+    def _replay(self, index):
+        """Recompute every day from ``index`` on after a past day changed."""
+        daily = self.daily[index:]
+        del self.daily[index:]
+        for size, window in self.windows.items():
+            del self.points[size][index:]
+            window.clear()
+            for cents in self.daily[max(index - size + 1, 0):]:
+                window.push(cents)
+        for cents in daily:
+            self._push_day(cents)
+
+    def _stats(self, point):
+        total, mean, median, std = point[:4]
+        stats = {"sum": total / 100, "mean": mean / 100, "median": median / 100,
+                 "std": std / 100}
+        for p, value in zip(self.percentiles, point[4:]):
+            stats[f"p{p}"] = value / 100
+        return stats
+
+    def latest(self, size, days_back=0):
+        """Statistics of the ``size``-day window ending ``days_back`` days before the last day."""
+        points = self.points[size]
+        if days_back >= len(points):
+            return None
+        return self._stats(points[-1 - days_back])
+
+    def series(self, size, days=None):
+        """[(date, statistics)] for the window ending on each day, oldest first."""
+        points = self.points[size]
+        start = 0 if days is None else max(len(points) - days, 0)
+        return [(day_to_date(self.first_day + i), self._stats(points[i]))
+                for i in range(start, len(points))]
+
+    def daily_series(self, days=None):
+        """[(date, total)] in pesos, oldest first."""
+        start = 0 if days is None else max(len(self.daily) - days, 0)
+        return [(day_to_date(self.first_day + i), self.daily[i] / 100)
+                for i in range(start, len(self.daily))]
+
+
+def report(trends):
+    """Format a text table of the latest statistics for every window."""
+    names = [f"p{p}" for p in trends.percentiles]
+    lines = [f"{'window':>8}{'total':>13}{'mean/day':>11}{'median':>10}{'std':>10}"
+             + "".join(f"{name:>10}" for name in names) + f"{'vs prev':>10}"]
+    for size in trends.windows:
+        stats = trends.latest(size)
+        previous = trends.latest(size, size)
+        if previous and previous["sum"]:
+            change = f"{(stats['sum'] - previous['sum']) / previous['sum']:+.0%}"
+        else:
+            change = "-"
+        lines.append(f"{str(size) + 'd':>8}{stats['sum']:>13,.2f}{stats['mean']:>11,.2f}"
+                     f"{stats['median']:>10,.2f}{stats['std']:>10,.2f}"
+                     + "".join(f"{stats[name]:>10,.2f}" for name in names) + f"{change:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling spending statistics.")
+    parser.add_argument("--db", default="expenses.db")
+    parser.add_argument("--windows", default="7,30,90",
+                        help="comma-separated window sizes in days (default: 7,30,90)")
+    parser.add_argument("--percentiles", default="10,90")
+    args = parser.parse_args(argv)
+    try:
+        windows = [int(size) for size in args.windows.split(",")]
+        percentiles = [float(p) if "." in p else int(p) for p in args.percentiles.split(",")]
+    except ValueError:
+        parser.error("windows and percentiles must be comma-separated numbers")
+    if min(windows) < 1:
+        parser.error("window sizes must be at least 1 day")
+    if not all(0 <= p <= 100 for p in percentiles):
+        parser.error("percentiles must be between 0 and 100")
+    # Opening a missing file would create an empty database
+    if not os.path.exists(args.db):
+        parser.error(f"no such database: {args.db}")
+
+    with ExpenseTracker(args.db) as tracker:
+        # Twice the longest window, so each one has a previous window to compare with
+        trends = DailyTrends.from_tracker(tracker, max(windows) * 2, windows, percentiles)
+    print(f"Daily spending statistics up to {day_to_date(trends.first_day + len(trends.daily) - 1)}"
+          f" (₱)\n")
+    print(report(trends))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
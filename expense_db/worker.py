@@ -0,0 +1,107 @@
+# expense_db/worker.py
+"""Run tracker calls on a dedicated background thread.
+
+The worker thread creates and owns the ExpenseTracker, so every query runs
+on its connection. Callers submit ``func(tracker, *args)`` and get a
+Future; callbacks are queued and only run when the owning thread calls
+drain(), which lets a Tk app deliver results from ``root.after`` polling
+without touching widgets from another thread.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class DatabaseWorker:
+    def __init__(self, tracker_factory, on_error=None):
+        self.on_error = on_error
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._waiting = {}
+        self._pending = 0
+        self._thread = threading.Thread(
+            target=self._run, args=(tracker_factory,), name="expense-db-worker", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def busy(self):
+        """True while requests are queued or running."""
+        return self._pending > 0
+
+    def submit(self, func, *args, callback=None, error_callback=None, key=None):
+        """Queue ``func(tracker, *args)`` and return a Future.
+
+        When ``key`` is given and a request with the same key is still
+        waiting to start, the new request is dropped and the waiting one's
+        Future is returned instead, so repeated refreshes coalesce.
+        """
+        with self._lock:
+            if key is not None and key in self._waiting:
+                return self._waiting[key][0]
+            request = (Future(), func, args, callback, error_callback, key)
+            if key is not None:
+                self._waiting[key] = request
+            self._pending += 1
+        self._requests.put(request)
+        return request[0]
+
+    def call(self, func, *args):
+        """Run ``func(tracker, *args)`` on the worker and wait for the result."""
+        return self.submit(func, *args).result()
+
+    def post(self, callback, value):
+        """Queue ``callback(value)`` for the next drain(); safe from any thread."""
+        self._results.put((callback, value))
+
+    def drain(self):
+        """Run queued callbacks on the calling thread; returns how many ran."""
+        handled = 0
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                return handled
+            callback(value)
+            handled += 1
+
+    def close(self, timeout=5):
+        """Finish queued requests, stop the thread and close the tracker."""
+        self._requests.put(None)
+        self._thread.join(timeout)
+
+    def _run(self, tracker_factory):
+        tracker = startup_error = None
+        try:
+            tracker = tracker_factory()
+        except Exception as exc:
+            startup_error = exc
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    return
+                future, func, args, callback, error_callback, key = request
+                with self._lock:
+                    if key is not None:
+                        self._waiting.pop(key, None)
+                try:
+                    if startup_error is not None:
+                        raise startup_error
+                    result = func(tracker, *args)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    handler = error_callback or self.on_error
+                    if handler:
+                        self.post(handler, exc)
+                else:
+                    future.set_result(result)
+                    if callback:
+                        self.post(callback, result)
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+        finally:
+            if tracker is not None:
+                tracker.close()
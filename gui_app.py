@@ -1,18 +1,112 @@
 # gui_app.py
+import time
+STARTED = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
 from datetime import datetime
+from bisect import bisect_left
 import os
 import sys
 
-# Add 'expense_db' to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'expense_db'))
-from tracker import ExpenseTracker
+# Make the 'expense_db' package importable when launched from another directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from expense_db.tracker import ExpenseTracker, page_key, period_start
+from expense_db.money import cents_to_decimal, to_cents
+from expense_db.records import Expense
+from expense_db.worker import DatabaseWorker
+from expense_db.paths import user_cache_dir
+
+# The expense list keeps a sliding window of rows and pages in more from the
+# database as the user scrolls near either end.
+PAGE_SIZE = 100
+MAX_LOADED_ROWS = 400
+SCROLL_PRELOAD_FRACTION = 0.1
+
+# How often to check PRAGMA data_version for changes made by other processes
+EXTERNAL_CHANGE_POLL_MS = 2000
+SUMMARY_DAYS = 7
+
+# Search runs once typing pauses for this long; results load a page at a time
+SEARCH_DELAY_MS = 300
+SEARCH_PAGE_SIZE = 50
+
+# How often the Tk loop collects results from the database worker thread
+WORKER_POLL_MS = 30
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKGROUND_PATH = os.path.join(APP_DIR, "src", "city.jpg")
+WINDOW_SIZE = (900, 650)
+
+# Cold start budget; the timing report is printed when it is exceeded or
+# when EXPENSE_TRACKER_STARTUP_REPORT=1 is set.
+STARTUP_BUDGET_MS = 400
+
+
+def load_background(path, size):
+    """Return a PhotoImage of ``path`` scaled to ``size``, cached on disk.
+
+    The scaled copy is stored as PNG keyed by the source mtime and the target
+    size, so later launches load it with Tk alone and never import PIL.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        print("⚠️ src/city.jpg not found. Using solid background.")
+        return None
+    name = os.path.splitext(os.path.basename(path))[0]
+    prefix = f"{name}-{size[0]}x{size[1]}-"
+    cached = os.path.join(user_cache_dir("images"), f"{prefix}{mtime}.png")
+    if os.path.exists(cached):
+        try:
+            return tk.PhotoImage(file=cached)
+        except tk.TclError:
+            pass  # unreadable cache entry; rebuild it below
+
+    try:
+        from PIL import Image, ImageTk
+    except ImportError:
+        print("⚠️ PIL not installed. Install with: pip install Pillow")
+        return None
+    img = Image.open(path).convert("RGB").resize(size, Image.Resampling.LANCZOS)
+    try:
+        os.makedirs(user_cache_dir("images"), exist_ok=True)
+        for old in os.listdir(user_cache_dir("images")):
+            if old.startswith(prefix):
+                os.remove(os.path.join(user_cache_dir("images"), old))
+        img.save(cached + ".tmp", "PNG")
+        os.replace(cached + ".tmp", cached)
+    except OSError:
+        pass  # caching is best effort
+    return ImageTk.PhotoImage(img)
+
+
+class StartupTimer:
+    """Collects cold start milestones and reports them against the budget."""
+
+    def __init__(self, started=STARTED):
+        self.started = started
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, (time.perf_counter() - self.started) * 1000))
+
+    def report(self):
+        total = self.marks[-1][1] if self.marks else 0.0
+        if total <= STARTUP_BUDGET_MS and not os.environ.get("EXPENSE_TRACKER_STARTUP_REPORT"):
+            return
+        print("⏱️ Startup timing (step / since launch)")
+        previous = 0.0
+        for name, ms in self.marks:
+            print(f"   {name:<12} {ms - previous:8.1f} ms {ms:8.1f} ms")
+            previous = ms
+        if total > STARTUP_BUDGET_MS:
+            print(f"   ⚠️ over the {STARTUP_BUDGET_MS} ms budget")
 
 
 class ExpenseTrackerGUI:
-    def __init__(self, root):
+    def __init__(self, root, db_name="expenses.db"):
         self.root = root
         self.root.title("🪙 Expense Tracker Pro")
         self.root.geometry("900x650")
@@ -22,20 +116,12 @@ class ExpenseTrackerGUI:
         self.root.maxsize(900, 650)
         self.root.minsize(900, 650)
 
-        # Load background image
-        self.bg_image = None
-        bg_path = os.path.join("src", "city.jpg")
-        if os.path.exists(bg_path):
-            try:
-                from PIL import Image, ImageTk
-                img = Image.open(bg_path)
-                img = img.resize((900, 650), Image.Resampling.LANCZOS)
-                self.bg_image = ImageTk.PhotoImage(img)
-            except ImportError:
-                print("⚠️ PIL not installed. Install with: pip install Pillow")
-                self.bg_image = None
-        else:
-            print("⚠️ src/city.jpg not found. Using solid background.")
+        self.startup = StartupTimer()
+        self.startup.mark("imports")
+
+        # Load background image (pre-scaled copy cached on disk)
+        self.bg_image = load_background(BACKGROUND_PATH, WINDOW_SIZE)
+        self.startup.mark("image")
 
         # Create main canvas
         self.canvas = tk.Canvas(root, width=900, height=650, highlightthickness=0)
@@ -60,10 +146,40 @@ class ExpenseTrackerGUI:
             'border': '#cccccc',
         }
 
-        self.tracker = ExpenseTracker()
+        # All database work runs on the worker thread, which owns the connection
+        self.worker = DatabaseWorker(
+            lambda: ExpenseTracker(db_name, decimal=True, result_cache_entries=64),
+            on_error=self.show_db_error,
+        )
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.setup_ui()
+        # Load data only once the window has been drawn: the idle pass paints,
+        # then the next event loop turn starts the first query
+        self.root.after_idle(lambda: self.root.after(0, self.on_first_paint))
+        self.root.after(WORKER_POLL_MS, self.poll_worker)
+        self.root.after(EXTERNAL_CHANGE_POLL_MS, self.poll_external_changes)
+
+    def on_close(self):
+        self.worker.close()
+        self.root.destroy()
+
+    def on_first_paint(self):
+        self.startup.mark("first paint")
         self.refresh_data()
 
+    def poll_worker(self):
+        # Deliver finished database results on the Tk thread
+        self.worker.drain()
+        busy = self.worker.busy
+        if busy != self.showing_busy:
+            self.showing_busy = busy
+            self.canvas.itemconfig(self.busy_text, text="⏳ Working..." if busy else "")
+            self.root.config(cursor="watch" if busy else "")
+        self.root.after(WORKER_POLL_MS, self.poll_worker)
+
+    def show_db_error(self, exc):
+        messagebox.showerror("Database Error", str(exc))
+
     def setup_ui(self):
         # Header bar (blue)
         self.canvas.create_rectangle(
@@ -79,6 +195,15 @@ class ExpenseTrackerGUI:
             fill="white",
             tags="header_text"
         )
+        self.showing_busy = False
+        self.busy_text = self.canvas.create_text(
+            865, 60,
+            text="",
+            font=("Segoe UI", 10, "bold"),
+            fill="white",
+            anchor="e",
+            tags="busy_text"
+        )
 
         # Left panel - Add Expense (with inner padding to simulate rounded corners)
         self.canvas.create_rectangle(
@@ -185,6 +310,34 @@ class ExpenseTrackerGUI:
         self.add_btn.bind("<Enter>", lambda e: self.add_btn.config(bg="#43a047"))
         self.add_btn.bind("<Leave>", lambda e: self.add_btn.config(bg=self.colors['green']))
 
+        # Import Button
+        self.import_btn = tk.Button(
+            self.canvas,
+            text="📥 IMPORT CSV / JSONL",
+            font=("Segoe UI", 11, "bold"),
+            bg=self.colors['accent'],
+            fg="white",
+            activebackground=self.colors['gold'],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            command=self.import_expenses,
+            padx=15,
+            pady=6,
+            borderwidth=0,
+            highlightthickness=0
+        )
+        self.canvas.create_window(195, 480, window=self.import_btn, width=300, anchor="n")
+        self.import_status = self.canvas.create_text(
+            195, 530,
+            text="",
+            font=("Segoe UI", 10),
+            fill=self.colors['subtext'],
+            justify="center",
+            width=300,
+            tags="import_status"
+        )
+
         # Right panel - Weekly Summary
         self.canvas.create_rectangle(
             390, 120, 880, 300,
@@ -225,7 +378,7 @@ class ExpenseTrackerGUI:
             width=2,
             tags="list_header"
         )
-        self.canvas.create_text(
+        self.list_title = self.canvas.create_text(
             400, 330,
             text="📝 Recent Expenses",
             font=("Segoe UI", 14, "bold"),
@@ -255,14 +408,14 @@ class ExpenseTrackerGUI:
         tree_frame = tk.Frame(self.canvas, bg=self.colors['card'], bd=0)
         self.canvas.create_window(635, 360, window=tree_frame, width=480, height=200, anchor="n", tags="tree_frame")
 
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_scrollbar = ttk.Scrollbar(tree_frame)
+        self.tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         self.tree = ttk.Treeview(
             tree_frame,
             columns=("ID", "Date", "Category", "Amount", "Description"),
             show="headings",
-            yscrollcommand=scrollbar.set,
+            yscrollcommand=self.on_tree_scroll,
             height=8
         )
 
@@ -279,7 +432,45 @@ class ExpenseTrackerGUI:
         self.tree.column("Description", width=200)
 
         self.tree.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.tree.yview)
+        self.tree_scrollbar.config(command=self.tree.yview)
+
+        # Window state: keys of loaded rows and whether rows exist beyond each end
+        self.row_keys = {}
+        self.summary_stats = {}
+        self.summary_start = None
+        self.data_version = None
+        self.has_newer = False
+        self.has_older = False
+        self.page_pending = False
+        self.list_generation = 0
+        # While search_text is set the list shows ranked search results instead
+        self.search_text = None
+        self.search_page = 0
+        self.search_after = None
+
+        # Search box under the list
+        self.canvas.create_rectangle(
+            390, 570, 880, 630,
+            fill=self.colors['card'],
+            outline=self.colors['border'],
+            width=2,
+            tags="search_panel"
+        )
+        self.canvas.create_text(400, 600, text="🔍 Search:", font=("Segoe UI", 11), fill=self.colors['text'], anchor="w")
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(
+            self.canvas,
+            textvariable=self.search_var,
+            font=("Segoe UI", 11),
+            bg="#fafafa",
+            fg="#000000",
+            insertbackground="#000000",
+            relief=tk.SUNKEN,
+            bd=1
+        )
+        self.canvas.create_window(490, 600, window=self.search_entry, width=375, anchor="w")
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+        self.search_var.trace_add("write", self.on_search_typed)
 
         # Style Treeview
         style = ttk.Style()
@@ -314,7 +505,8 @@ class ExpenseTrackerGUI:
             return
 
         try:
-            amount = float(amount_str)
+            # Decimal centavos, so the summary totals add up exactly
+            amount = cents_to_decimal(to_cents(amount_str))
             if amount <= 0:
                 messagebox.showerror("Error", "Amount must be positive!")
                 return
@@ -322,13 +514,20 @@ class ExpenseTrackerGUI:
             messagebox.showerror("Error", "Invalid amount!")
             return
 
-        self.tracker.add_expense(category, amount, date, description)
-
         self.amount_entry.delete(0, tk.END)
         self.desc_entry.delete(0, tk.END)
         self.date_entry.set_date(datetime.now())
 
-        self.refresh_data()
+        fields = (category, amount, date, description)
+        self.worker.submit(
+            lambda tracker: (tracker.add_expense(*fields), tracker.data_version()),
+            callback=lambda result: self.expense_added(result, fields)
+        )
+
+    def expense_added(self, result, fields):
+        expense_id, version = result
+        category, amount = fields[0], fields[1]
+        self.apply_added(Expense(expense_id, *fields), version)
         messagebox.showinfo("Success", f"Added ₱{amount:.2f} to {category}!")
 
     def delete_expense(self):
@@ -342,35 +541,307 @@ class ExpenseTrackerGUI:
 
         confirm = messagebox.askyesno("Confirm", f"Delete expense #{expense_id}?")
         if confirm:
-            self.tracker.delete_expense(expense_id)
-            self.refresh_data()
-            messagebox.showinfo("Success", "Expense deleted!")
+            self.worker.submit(
+                lambda tracker: (tracker.delete_expense(expense_id), tracker.data_version()),
+                callback=self.expense_deleted
+            )
+
+    def expense_deleted(self, result):
+        expense, version = result
+        if expense:
+            self.apply_deleted(expense, version)
+        messagebox.showinfo("Success", "Expense deleted!")
+
+    def import_expenses(self):
+        path = filedialog.askopenfilename(
+            title="Import expenses",
+            filetypes=[("CSV / JSON Lines", "*.csv *.tsv *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        reject_path = path + ".rejects.jsonl"
+        self.import_btn.config(state=tk.DISABLED)
+        self.canvas.itemconfig(self.import_status, text="Importing...")
+
+        from expense_db.importer import import_file
+
+        def run_import(tracker):
+            # Runs on the worker thread; progress is posted back to the Tk loop
+            return import_file(tracker, path, reject_path=reject_path,
+                               progress=lambda stats: self.worker.post(self.show_import_progress, stats.read))
+
+        self.worker.submit(run_import, callback=self.import_finished,
+                           error_callback=self.import_failed)
+
+    def show_import_progress(self, rows_read):
+        self.canvas.itemconfig(self.import_status, text=f"Importing... {rows_read:,} rows read")
+
+    def import_finished(self, stats):
+        self.import_btn.config(state=tk.NORMAL)
+        text = f"Imported {stats.inserted:,} expenses in {stats.elapsed:.1f}s"
+        if stats.rejected:
+            text += f"\n{stats.rejected:,} rows skipped (see .rejects.jsonl)"
+        self.canvas.itemconfig(self.import_status, text=text)
+        self.refresh_data()
+
+    def import_failed(self, exc):
+        self.import_btn.config(state=tk.NORMAL)
+        self.canvas.itemconfig(self.import_status, text="")
+        messagebox.showerror("Import Failed", str(exc))
 
     def refresh_data(self):
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        expenses = self.tracker.get_all_expenses()
-        for expense in expenses:
-            exp_id, category, amount, date, description = expense
-            self.tree.insert("", tk.END, values=(exp_id, date, category, f"₱{amount:.2f}", description))
-
-        # Refresh summary
-        summary_dict = self.tracker.get_summary_by_category(7)
-        if summary_dict:
-            total = sum(summary_dict.values())
-            sorted_summary = sorted(summary_dict.items(), key=lambda x: x[1], reverse=True)
+        # Reload the list window and summary; repeated requests share one query
+        self.worker.submit(self.load_snapshot, callback=self.show_snapshot, key="refresh")
+
+    @staticmethod
+    def load_snapshot(tracker):
+        # Runs on the worker thread
+        return tracker.snapshot(PAGE_SIZE, SUMMARY_DAYS)
+
+    def show_snapshot(self, snapshot):
+        rows, stats, summary_start, version = snapshot
+        if self.search_text:
+            # The data changed under the search results; search again
+            self.run_search()
+        else:
+            self.show_rows(rows, len(rows) == PAGE_SIZE)
+
+        self.summary_start = summary_start
+        self.summary_stats = {
+            category: [s["total"], s["count"]] for category, s in stats.items()
+        }
+        self.render_summary()
+        self.data_version = version
+        if self.startup:
+            self.startup.mark("first query")
+            self.startup.report()
+            self.startup = None
+
+    def show_rows(self, rows, has_older):
+        # Replace the whole list; pages still in flight for the old one are ignored
+        self.list_generation += 1
+        self.page_pending = False
+        self.tree.delete(*self.tree.get_children())
+        self.row_keys.clear()
+        self.has_newer = False
+        self.has_older = has_older
+        for expense in rows:
+            self.insert_row(expense)
+
+    def on_search_typed(self, *args):
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after = None
+        text = self.search_var.get().strip()
+        if not text:
+            if self.search_text:
+                self.search_text = None
+                self.canvas.itemconfig(self.list_title, text="📝 Recent Expenses")
+                self.refresh_data()
+            return
+        self.search_text = text
+        self.search_page = 0
+        self.canvas.itemconfig(self.list_title, text="🔍 Search Results")
+        self.worker.submit(
+            lambda tracker: tracker.search(text, page_size=SEARCH_PAGE_SIZE),
+            callback=lambda rows: self.show_search_results(rows, text)
+        )
+
+    def show_search_results(self, rows, text):
+        if text != self.search_text:
+            return
+        self.show_rows(rows, len(rows) == SEARCH_PAGE_SIZE)
+
+    def render_summary(self):
+        if self.summary_stats:
+            total = sum(total for total, _ in self.summary_stats.values())
+            sorted_summary = sorted(self.summary_stats.items(), key=lambda x: x[1][0], reverse=True)
             summary_lines = []
-            for category, amount in sorted_summary[:5]:
+            for category, (amount, _) in sorted_summary[:5]:
                 summary_lines.append(f"{category}: ₱{amount:,.2f}")
             summary_text = "\n".join(summary_lines) + f"\n\nTOTAL: ₱{total:,.2f}"
             self.canvas.itemconfig(self.summary_text, text=summary_text, fill=self.colors['text'])
         else:
             self.canvas.itemconfig(self.summary_text, text="No expenses this week", fill=self.colors['subtext'])
 
+    def needs_reload(self, version):
+        # Another connection committed, or the summary window moved to a new day
+        return version != self.data_version or period_start(SUMMARY_DAYS) != self.summary_start
+
+    def poll_external_changes(self):
+        self.worker.submit(lambda tracker: tracker.data_version(),
+                           callback=self.check_data_version, key="data_version")
+        self.root.after(EXTERNAL_CHANGE_POLL_MS, self.poll_external_changes)
+
+    def check_data_version(self, version):
+        if self.data_version is not None and self.needs_reload(version):
+            self.refresh_data()
+
+    def apply_added(self, expense, version):
+        # Insert just the new row and fold its amount into the summary
+        if self.needs_reload(version):
+            self.refresh_data()
+            return
+        if self.search_text:
+            self.run_search()
+            self.adjust_summary(expense, 1)
+            return
+        index = self.row_index_for(page_key(expense))
+        if index is not None:
+            self.insert_row(expense, index)
+            self.trim_rows(from_top=index >= len(self.tree.get_children()) // 2)
+        self.adjust_summary(expense, 1)
+
+    def apply_deleted(self, expense, version):
+        # Remove just the deleted row and take its amount out of the summary
+        if self.needs_reload(version):
+            self.refresh_data()
+            return
+        iid = str(expense.id)
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+            del self.row_keys[iid]
+        self.adjust_summary(expense, -1)
+
+    def row_index_for(self, key):
+        """Index where a row with this key belongs, or None if outside the loaded window."""
+        children = self.tree.get_children()
+        if not children:
+            return None if self.has_older or self.has_newer else 0
+        # get_children() is newest first; bisect over the keys in ascending order
+        keys = [self.row_keys[iid] for iid in reversed(children)]
+        position = len(keys) - bisect_left(keys, key)
+        if position == 0 and self.has_newer:
+            return None
+        if position == len(keys) and self.has_older:
+            return None
+        return position
+
+    def adjust_summary(self, expense, sign):
+        if expense.date < self.summary_start:
+            return
+        stats = self.summary_stats.setdefault(expense.category, [0, 0])
+        stats[0] += sign * expense.amount
+        stats[1] += sign
+        if stats[1] <= 0:
+            del self.summary_stats[expense.category]
+        self.render_summary()
+
+    def insert_row(self, expense, index=tk.END):
+        iid = str(expense.id)
+        self.row_keys[iid] = page_key(expense)
+        self.tree.insert("", index, iid=iid, values=(expense.id, expense.date, expense.category,
+                                                     f"₱{expense.amount:.2f}", expense.description))
+
+    def trim_rows(self, from_top):
+        children = self.tree.get_children()
+        excess = len(children) - MAX_LOADED_ROWS
+        if excess <= 0:
+            return
+        first_index = self.tree.yview()[0] * len(children)
+        dropped = children[:excess] if from_top else children[-excess:]
+        self.tree.delete(*dropped)
+        for iid in dropped:
+            del self.row_keys[iid]
+        if from_top:
+            # Rows above the view are gone; scroll back so the same rows stay visible
+            self.tree.yview_moveto(max(first_index - excess, 0) / MAX_LOADED_ROWS)
+            self.has_newer = True
+        else:
+            self.has_older = True
+
+    def load_older_page(self):
+        if self.search_text:
+            self.load_search_page()
+            return
+        children = self.tree.get_children()
+        after = self.row_keys[children[-1]] if children else None
+        generation = self.list_generation
+        self.worker.submit(
+            lambda tracker: tracker.get_expenses_page(PAGE_SIZE, after=after),
+            callback=lambda rows: self.show_older_page(rows, generation),
+            error_callback=self.page_failed
+        )
+
+    def show_older_page(self, rows, generation):
+        self.page_pending = False
+        if generation != self.list_generation:
+            return
+        self.has_older = len(rows) == PAGE_SIZE
+        for expense in rows:
+            self.insert_row(expense)
+        self.trim_rows(from_top=True)
+
+    def load_search_page(self):
+        # Search results are ranked, not keyed by date, so they page by number
+        # and are never trimmed (there are at most SEARCH_CANDIDATES of them)
+        text, page = self.search_text, self.search_page + 1
+        generation = self.list_generation
+        self.worker.submit(
+            lambda tracker: tracker.search(text, page_size=SEARCH_PAGE_SIZE, page=page),
+            callback=lambda rows: self.show_search_page(rows, page, generation),
+            error_callback=self.page_failed
+        )
+
+    def show_search_page(self, rows, page, generation):
+        self.page_pending = False
+        if generation != self.list_generation:
+            return
+        self.search_page = page
+        self.has_older = len(rows) == SEARCH_PAGE_SIZE
+        for expense in rows:
+            if not self.tree.exists(str(expense.id)):
+                self.insert_row(expense)
+
+    def load_newer_page(self):
+        children = self.tree.get_children()
+        if not children:
+            self.page_pending = False
+            return
+        before = self.row_keys[children[0]]
+        generation = self.list_generation
+        self.worker.submit(
+            lambda tracker: tracker.get_expenses_page(PAGE_SIZE, before=before),
+            callback=lambda rows: self.show_newer_page(rows, generation),
+            error_callback=self.page_failed
+        )
+
+    def show_newer_page(self, rows, generation):
+        self.page_pending = False
+        if generation != self.list_generation:
+            return
+        children = self.tree.get_children()
+        first_index = self.tree.yview()[0] * len(children)
+        self.has_newer = len(rows) == PAGE_SIZE
+        for index, expense in enumerate(rows):
+            self.insert_row(expense, index)
+        # Prepending pushes the visible rows down; scroll so they stay in view
+        self.tree.yview_moveto((first_index + len(rows)) / (len(children) + len(rows)))
+        self.trim_rows(from_top=False)
+
+    def page_failed(self, exc):
+        # Let the next scroll try again instead of waiting on a page forever
+        self.page_pending = False
+        self.show_db_error(exc)
+
+    def on_tree_scroll(self, first, last):
+        self.tree_scrollbar.set(first, last)
+        if self.page_pending:
+            return
+        if self.has_older and float(last) >= 1 - SCROLL_PRELOAD_FRACTION:
+            self.page_pending = True
+            self.load_older_page()
+        elif self.has_newer and float(first) <= SCROLL_PRELOAD_FRACTION:
+            self.page_pending = True
+            self.load_newer_page()
+
 
 def main():
+    if "--startup-report" in sys.argv:
+        os.environ["EXPENSE_TRACKER_STARTUP_REPORT"] = "1"
     root = tk.Tk()
     app = ExpenseTrackerGUI(root)
     root.mainloop()
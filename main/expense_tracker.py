@@ -1,86 +1,13 @@
-import sqlite3
+import itertools
 import os
-from datetime import datetime, timedelta
-from collections import defaultdict
-
-class ExpenseTracker:
-    def __init__(self, db_name="expenses.db"):
-        self.db_name = db_name
-        self.init_database()
-    
-    def init_database(self):
-        """Initialize the SQLite database and create tables if they don't exist."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT NOT NULL,
-                amount REAL NOT NULL,
-                date TEXT NOT NULL,
-                description TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
-    
-    def add_expense(self, category, amount, date=None, description=""):
-        """Add a new expense to the database."""
-        if date is None:
-            date = datetime.now().strftime("%Y-%m-%d")
-        
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO expenses (category, amount, date, description)
-            VALUES (?, ?, ?, ?)
-        ''', (category, amount, date, description))
-        conn.commit()
-        conn.close()
-        return True
-    
-    def get_all_expenses(self):
-        """Retrieve all expenses from the database."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM expenses ORDER BY date DESC')
-        expenses = cursor.fetchall()
-        conn.close()
-        return expenses
-    
-    def get_expenses_by_period(self, days=7):
-        """Get expenses for the last N days."""
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM expenses 
-            WHERE date >= ? 
-            ORDER BY date DESC
-        ''', (start_date,))
-        expenses = cursor.fetchall()
-        conn.close()
-        return expenses
-    
-    def get_summary_by_category(self, days=7):
-        """Get spending summary grouped by category."""
-        expenses = self.get_expenses_by_period(days)
-        summary = defaultdict(float)
-        
-        for expense in expenses:
-            category = expense[1]
-            amount = expense[2]
-            summary[category] += amount
-        
-        return dict(summary)
-    
-    def delete_expense(self, expense_id):
-        """Delete an expense by ID."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM expenses WHERE id = ?', (expense_id,))
-        conn.commit()
-        conn.close()
+import sys
+
+# Share the tracker implementation in 'expense_db' instead of keeping a copy here
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from expense_db.tracker import ExpenseTracker
+from expense_db.importer import import_file
+from expense_db.instrument import Instrumentation
+from expense_db.money import cents_to_decimal, to_cents
 
 
 def clear_screen():
@@ -100,10 +27,13 @@ def print_menu():
     print("┌─────────────────────────────────────────┐")
     print("│  1. Add Expense                         │")
     print("│  2. View All Expenses                   │")
-    print("│  3. View Weekly Summary                 │")
-    print("│  4. View Monthly Summary                │")
-    print("│  5. Delete Expense                      │")
-    print("│  6. Exit                                │")
+    print("│  3. Search Expenses                     │")
+    print("│  4. View Weekly Summary                 │")
+    print("│  5. View Monthly Summary                │")
+    print("│  6. Delete Expense                      │")
+    print("│  7. Import from CSV/JSONL File          │")
+    print("│  8. Performance Stats                   │")
+    print("│  9. Exit                                │")
     print("└─────────────────────────────────────────┘")
 
 
@@ -118,7 +48,7 @@ def add_expense_interface(tracker):
         return
     
     try:
-        amount = float(input("Amount (₱): "))
+        amount = cents_to_decimal(to_cents(input("Amount (₱): ").strip()))
         if amount <= 0:
             print("❌ Amount must be positive!")
             return
@@ -131,15 +61,25 @@ def add_expense_interface(tracker):
     
     description = input("Description (optional): ").strip()
     
-    tracker.add_expense(category, amount, date, description)
+    try:
+        tracker.add_expense(category, amount, date, description)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return
     print(f"\n✅ Expense added: ₱{amount:.2f} for {category}")
 
 
+def print_expense(expense):
+    print(f"{expense.id:<5} {expense.date:<12} {expense.category:<15} "
+          f"₱{expense.amount:<11.2f} {expense.description:<30}")
+
+
 def view_all_expenses(tracker):
     """Display all expenses."""
-    expenses = tracker.get_all_expenses()
+    expenses = tracker.iter_expenses()
+    first = next(expenses, None)
     
-    if not expenses:
+    if first is None:
         print("\n📭 No expenses recorded yet!")
         return
     
@@ -148,40 +88,73 @@ def view_all_expenses(tracker):
     print(f"{'ID':<5} {'Date':<12} {'Category':<15} {'Amount':<12} {'Description':<30}")
     print("-" * 80)
     
-    for expense in expenses:
-        exp_id, category, amount, date, description = expense
-        print(f"{exp_id:<5} {date:<12} {category:<15} ₱{amount:<11.2f} {description:<30}")
+    total = 0
+    for expense in itertools.chain((first,), expenses):
+        print_expense(expense)
+        total += expense.amount
     
-    total = sum(exp[2] for exp in expenses)
     print("-" * 80)
     print(f"{'TOTAL:':<44} ₱{total:.2f}")
 
 
+def search_interface(tracker):
+    """Interface for full-text search over descriptions and categories."""
+    print("\n🔍 SEARCH EXPENSES")
+    print("-" * 40)
+
+    query = input("Search for: ").strip()
+    if not query:
+        return
+    start = input("From date (YYYY-MM-DD) [press Enter for any]: ").strip() or None
+    end = input("To date (YYYY-MM-DD) [press Enter for any]: ").strip() or None
+
+    page = 0
+    while True:
+        try:
+            results = tracker.search(query, (start, end), page_size=20, page=page)
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            return
+        if not results:
+            print("\n📭 No matching expenses!" if page == 0 else "\n📭 No more results.")
+            return
+
+        print(f"\n{'ID':<5} {'Date':<12} {'Category':<15} {'Amount':<12} {'Description':<30}")
+        print("-" * 80)
+        for expense in results:
+            print_expense(expense)
+        if len(results) < 20 or input("\nShow more? (y/n): ").lower() != 'y':
+            return
+        page += 1
+
+
 def view_summary(tracker, days, period_name):
     """Display spending summary for a period."""
-    summary = tracker.get_summary_by_category(days)
+    stats = tracker.get_category_stats(days)
     
-    if not summary:
+    if not stats:
         print(f"\n📭 No expenses in the last {period_name}!")
         return
     
     print(f"\n📈 {period_name.upper()} SUMMARY")
     print("-" * 50)
     
-    total = sum(summary.values())
+    total = sum(s["total"] for s in stats.values())
+    count = sum(s["count"] for s in stats.values())
     
     # Sort by amount (highest first)
-    sorted_summary = sorted(summary.items(), key=lambda x: x[1], reverse=True)
+    sorted_stats = sorted(stats.items(), key=lambda x: x[1]["total"], reverse=True)
     
-    for category, amount in sorted_summary:
+    for category, s in sorted_stats:
+        amount = s["total"]
         percentage = (amount / total) * 100
         bar_length = int(percentage / 2)
         bar = "█" * bar_length
-        print(f"{category:<15} ₱{amount:>8.2f}  {bar} {percentage:.1f}%")
+        print(f"{category:<15} ₱{amount:>8.2f}  {bar} {percentage:.1f}% ({s['count']}x, avg ₱{s['avg']:.2f})")
     
     print("-" * 50)
     print(f"{'TOTAL SPENT:':<15} ₱{total:>8.2f}")
-    print(f"\n💡 You spent ₱{total:.2f} in the last {period_name}!")
+    print(f"\n💡 You spent ₱{total:.2f} across {count} expenses in the last {period_name}!")
 
 
 def delete_expense_interface(tracker):
@@ -200,27 +173,102 @@ def delete_expense_interface(tracker):
     except ValueError:
         print("❌ Invalid ID!")
 
+def import_interface(tracker):
+    """Interface for importing expenses from a CSV or JSON Lines file."""
+    print("\n📥 IMPORT EXPENSES")
+    print("-" * 40)
+
+    path = input("File path (.csv, .tsv or .jsonl): ").strip().strip('"')
+    if not os.path.isfile(path):
+        print("❌ File not found!")
+        return
+
+    negate = input("Are expenses listed as negative amounts? (y/n): ").lower() == 'y'
+    reject_path = path + ".rejects.jsonl"
+
+    def report(stats):
+        print(f"\r   {stats.read:,} rows read, {stats.inserted:,} imported...", end="", flush=True)
+
+    try:
+        stats = import_file(tracker, path, reject_path=reject_path,
+                            amount_sign=-1 if negate else 1, progress=report)
+    except ValueError as exc:
+        print(f"\n❌ Could not import: {exc}")
+        stats = None
+
+    if stats is None or not stats.rejected:
+        if os.path.exists(reject_path):
+            os.remove(reject_path)
+    if stats is None:
+        return
+
+    print(f"\n\n✅ Imported {stats.inserted:,} expenses in {stats.elapsed:.1f}s")
+    if stats.rejected:
+        print(f"⚠️ {stats.rejected:,} rows skipped, see {reject_path}")
+
+
+def performance_interface(tracker):
+    """Show per-method timings and slow queries; toggle or reset recording."""
+    instrumentation = tracker.instrumentation
+    print("\n⏱️ PERFORMANCE STATS")
+    print("-" * 80)
+    if instrumentation is None:
+        print("Recording is off.")
+        if input("\nTurn recording on? (y/n): ").lower() == 'y':
+            tracker.instrument(Instrumentation())
+            print("✅ Recording database calls.")
+        return
+
+    print(instrumentation.report())
+    cache = tracker.cache_stats()
+    if cache:
+        print(f"\nResult cache: {cache['hits']} hits, {cache['misses']} misses "
+              f"({cache['hit_rate']:.0%}), {cache['entries']} entries")
+    print("-" * 80)
+    action = input("\n[r] reset, [o] turn off, Enter to go back: ").strip().lower()
+    if action == 'r':
+        instrumentation.reset()
+        print("✅ Stats cleared.")
+    elif action == 'o':
+        tracker.instrument(None)
+        print("✅ Recording turned off.")
+
+
 def main():
-    tracker = ExpenseTracker()
-    
+    # Recording is opt-in: --profile or EXPENSE_TRACKER_PROFILE=1 starts it,
+    # and the Performance Stats menu can turn it on later
+    profile = "--profile" in sys.argv or os.environ.get("EXPENSE_TRACKER_PROFILE") == "1"
+    with ExpenseTracker(decimal=True, result_cache_entries=64,
+                        instrumentation=Instrumentation() if profile else None) as tracker:
+        run_menu(tracker)
+
+
+def run_menu(tracker):
+    """Main menu loop."""
     while True:
         clear_screen()
         print_header()
         print_menu()
         
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-9): ").strip()
         
         if choice == '1':
             add_expense_interface(tracker)
         elif choice == '2':
             view_all_expenses(tracker)
         elif choice == '3':
-            view_summary(tracker, 7, "week")
+            search_interface(tracker)
         elif choice == '4':
-            view_summary(tracker, 30, "month")
+            view_summary(tracker, 7, "week")
         elif choice == '5':
-            delete_expense_interface(tracker)
+            view_summary(tracker, 30, "month")
         elif choice == '6':
+            delete_expense_interface(tracker)
+        elif choice == '7':
+            import_interface(tracker)
+        elif choice == '8':
+            performance_interface(tracker)
+        elif choice == '9':
             print("\n👋 Thanks for using Expense Tracker! Goodbye!\n")
             break
         else:
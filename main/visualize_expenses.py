@@ -1,146 +1,359 @@
-import matplotlib.pyplot as plt
+import argparse
+import hashlib
+import os
+import sys
+
 from expense_tracker import ExpenseTracker
-from datetime import datetime, timedelta
-from collections import defaultdict
+from expense_db.paths import user_cache_dir
+from expense_db.tracker import period_start
+
+# matplotlib is imported inside the functions that draw, so the menu and the
+# cache-hit path of render_chart start without loading it.
+
+IMAGE_FORMATS = ("png", "svg")
+
+
+def load_category_summary(tracker, days):
+    return tracker.get_summary_by_category(days)
+
+
+def load_daily_totals(tracker, days):
+    return tracker.get_daily_totals(days)
+
+
+def load_cumulative_spending(tracker, days):
+    """Running total per day, computed over NumPy columns."""
+    from expense_db.analytics import load_columns
+    columns = load_columns(tracker, days)
+    return columns.cumulative() if len(columns) else None
+
+
+def load_spending_trends(tracker, days):
+    """Daily totals with 7- and 30-day rolling statistics."""
+    from expense_db.trends import DailyTrends
+    trends = DailyTrends.from_tracker(tracker, days, windows=(7, 30))
+    return trends if any(trends.daily[-days:]) else None
+
+
+def draw_by_category(fig, summary, days):
+    """Draw a pie chart of expenses by category."""
+    import matplotlib
 
-def visualize_by_category(days=30):
-    """Create a pie chart of expenses by category."""
-    tracker = ExpenseTracker()
-    summary = tracker.get_summary_by_category(days)
-    
-    if not summary:
-        print(f"No expenses in the last {days} days!")
-        return
-    
     categories = list(summary.keys())
     amounts = list(summary.values())
-    
-    # Create figure with better styling
-    plt.figure(figsize=(10, 6))
-    colors = plt.cm.Set3(range(len(categories)))
-    
-    plt.pie(amounts, labels=categories, autopct='%1.1f%%', 
-            startangle=90, colors=colors, textprops={'fontsize': 10})
-    plt.title(f'Expenses by Category (Last {days} Days)', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.axis('equal')
-    
+
+    ax = fig.subplots()
+    colors = matplotlib.colormaps["Set3"](range(len(categories)))
+
+    ax.pie(amounts, labels=categories, autopct='%1.1f%%',
+           startangle=90, colors=colors, textprops={'fontsize': 10})
+    ax.set_title(f'Expenses by Category (Last {days} Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.axis('equal')
+
     # Add total spent
     total = sum(amounts)
-    plt.text(0, -1.3, f'Total Spent: ₱{total:.2f}', 
-             ha='center', fontsize=12, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.show()
+    ax.text(0, -1.3, f'Total Spent: ₱{total:.2f}',
+            ha='center', fontsize=12, fontweight='bold')
 
+    fig.tight_layout()
+
+
+def draw_daily_spending(fig, daily_totals, days):
+    """Draw a bar chart of daily spending."""
+    # Already grouped by date and sorted, oldest first
+    dates = [date for date, _ in daily_totals]
+    amounts = [amount for _, amount in daily_totals]
+
+    ax = fig.subplots()
+    ax.bar(dates, amounts, color='#06b6d4', alpha=0.8, edgecolor='#0891b2', linewidth=1.5)
+
+    ax.set_title(f'Daily Spending (Last {days} Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Amount (₱)', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
 
-def visualize_daily_spending(days=30):
-    """Create a bar chart of daily spending."""
-    tracker = ExpenseTracker()
-    expenses = tracker.get_expenses_by_period(days)
-    
-    if not expenses:
-        print(f"No expenses in the last {days} days!")
-        return
-    
-    # Group expenses by date
-    daily_spending = defaultdict(float)
-    for expense in expenses:
-        date = expense[3]
-        amount = expense[2]
-        daily_spending[date] += amount
-    
-    # Sort by date
-    dates = sorted(daily_spending.keys())
-    amounts = [daily_spending[date] for date in dates]
-    
-    # Create figure
-    plt.figure(figsize=(12, 6))
-    plt.bar(dates, amounts, color='#06b6d4', alpha=0.8, edgecolor='#0891b2', linewidth=1.5)
-    
-    plt.title(f'Daily Spending (Last {days} Days)', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.xlabel('Date', fontsize=12)
-    plt.ylabel('Amount (₱)', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.grid(axis='y', alpha=0.3, linestyle='--')
-    
     # Add average line
     avg_spending = sum(amounts) / len(amounts)
-    plt.axhline(y=avg_spending, color='red', linestyle='--', 
-                linewidth=2, label=f'Average: ₱{avg_spending:.2f}')
-    plt.legend()
-    
-    plt.tight_layout()
-    plt.show()
+    ax.axhline(y=avg_spending, color='red', linestyle='--',
+               linewidth=2, label=f'Average: ₱{avg_spending:.2f}')
+    ax.legend()
 
+    fig.tight_layout()
+
+
+def draw_category_comparison(fig, summary, days):
+    """Draw a horizontal bar chart comparing categories."""
+    import matplotlib
 
-def visualize_category_comparison(days=30):
-    """Create a horizontal bar chart comparing categories."""
-    tracker = ExpenseTracker()
-    summary = tracker.get_summary_by_category(days)
-    
-    if not summary:
-        print(f"No expenses in the last {days} days!")
-        return
-    
     # Sort by amount
     sorted_items = sorted(summary.items(), key=lambda x: x[1], reverse=True)
     categories = [item[0] for item in sorted_items]
     amounts = [item[1] for item in sorted_items]
-    
-    # Create figure
-    plt.figure(figsize=(10, 8))
-    colors = plt.cm.viridis(range(len(categories)))
-    
-    bars = plt.barh(categories, amounts, color=colors, edgecolor='black', linewidth=1.2)
-    
+
+    ax = fig.subplots()
+    colors = matplotlib.colormaps["viridis"](range(len(categories)))
+
+    bars = ax.barh(categories, amounts, color=colors, edgecolor='black', linewidth=1.2)
+
     # Add value labels on bars
     for i, (bar, amount) in enumerate(zip(bars, amounts)):
-        plt.text(amount + max(amounts)*0.01, i, f'₱{amount:.2f}', 
+        ax.text(amount + max(amounts)*0.01, i, f'₱{amount:.2f}',
                 va='center', fontsize=10, fontweight='bold')
-    
-    plt.title(f'Spending by Category (Last {days} Days)', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.xlabel('Amount (₱)', fontsize=12)
-    plt.ylabel('Category', fontsize=12)
-    plt.grid(axis='x', alpha=0.3, linestyle='--')
-    
+
+    ax.set_title(f'Spending by Category (Last {days} Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Amount (₱)', fontsize=12)
+    ax.set_ylabel('Category', fontsize=12)
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+
     total = sum(amounts)
-    plt.text(0.5, -0.15, f'Total: ₱{total:.2f}', 
-             transform=plt.gca().transAxes, ha='center', 
-             fontsize=12, fontweight='bold')
-    
-    plt.tight_layout()
+    ax.text(0.5, -0.15, f'Total: ₱{total:.2f}',
+            transform=ax.transAxes, ha='center',
+            fontsize=12, fontweight='bold')
+
+    fig.tight_layout()
+
+
+def draw_cumulative_spending(fig, cumulative, days):
+    """Draw a line chart of the running spending total."""
+    dates, totals = cumulative
+
+    ax = fig.subplots()
+    ax.plot(dates, totals, color='#0891b2', linewidth=2)
+    ax.fill_between(dates, totals, color='#06b6d4', alpha=0.2)
+
+    ax.set_title(f'Cumulative Spending (Last {days} Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Amount (₱)', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(alpha=0.3, linestyle='--')
+
+    ax.text(0.02, 0.95, f'Total Spent: ₱{totals[-1]:.2f}', transform=ax.transAxes,
+            va='top', fontsize=12, fontweight='bold')
+
+    fig.tight_layout()
+
+
+def draw_spending_trends(fig, trends, days):
+    """Draw daily bars with rolling averages, the 30-day median and its p10-p90 band."""
+    daily = trends.daily_series(days)
+    weekly = [stats for _, stats in trends.series(7, days)]
+    monthly = [stats for _, stats in trends.series(30, days)]
+    dates = [date for date, _ in daily]
+
+    ax = fig.subplots()
+    ax.bar(dates, [amount for _, amount in daily], color='#06b6d4', alpha=0.5,
+           label='Daily total')
+    ax.fill_between(dates, [stats['p10'] for stats in monthly],
+                    [stats['p90'] for stats in monthly],
+                    color='#a855f7', alpha=0.15, label='30-day p10-p90')
+    ax.plot(dates, [stats['mean'] for stats in weekly], color='#f97316', linewidth=2,
+            label='7-day average')
+    ax.plot(dates, [stats['mean'] for stats in monthly], color='#dc2626', linewidth=2,
+            label='30-day average')
+    ax.plot(dates, [stats['median'] for stats in monthly], color='#7c3aed', linewidth=1.5,
+            linestyle='--', label='30-day median')
+
+    ax.set_title(f'Spending Trends (Last {days} Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Amount (₱)', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    # Only every few dates, or long periods turn the axis into a black smear
+    step = max(len(dates) // 15, 1)
+    ax.set_xticks(range(0, len(dates), step), dates[::step])
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    ax.legend()
+
+    fig.tight_layout()
+
+
+# chart name -> (data loader, drawing function, figure size)
+CHARTS = {
+    "category_pie": (load_category_summary, draw_by_category, (10, 6)),
+    "daily_spending": (load_daily_totals, draw_daily_spending, (12, 6)),
+    "category_comparison": (load_category_summary, draw_category_comparison, (10, 8)),
+    "cumulative_spending": (load_cumulative_spending, draw_cumulative_spending, (12, 6)),
+    "spending_trends": (load_spending_trends, draw_spending_trends, (12, 6)),
+}
+
+
+def show_chart(chart, days=30, tracker=None):
+    """Load the chart's data and show it in an interactive matplotlib window."""
+    load, draw, figsize = CHARTS[chart]
+    own_tracker = tracker is None
+    tracker = tracker or ExpenseTracker()
+    try:
+        data = load(tracker, days)
+    finally:
+        if own_tracker:
+            tracker.close()
+
+    if not data:
+        print(f"No expenses in the last {days} days!")
+        return
+
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=figsize)
+    draw(fig, data, days)
     plt.show()
 
 
+def _chart_cache_prefix(tracker, chart, days):
+    db_key = hashlib.sha1(os.path.abspath(tracker.db_name).encode()).hexdigest()[:12]
+    return f"{db_key}-{chart}-{days}d-"
+
+
+def chart_cache_path(tracker, chart, days, fmt, cache_dir=None):
+    """Cache file for a chart: keyed by database, chart, day range, period start and change counter."""
+    name = (f"{_chart_cache_prefix(tracker, chart, days)}"
+            f"{period_start(days)}-v{tracker.change_counter()}.{fmt}")
+    return os.path.join(cache_dir or user_cache_dir("charts"), name)
+
+
+def render_chart(chart, days=30, fmt="png", tracker=None, cache_dir=None):
+    """Render a chart to an image file without a display.
+
+    Returns the file path, or None when there is no data for the period. The
+    image is reused until the database changes or the period rolls over.
+    """
+    if chart not in CHARTS:
+        raise ValueError(f"unknown chart {chart!r}, expected one of {sorted(CHARTS)}")
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"unsupported format {fmt!r}, expected one of {IMAGE_FORMATS}")
+    load, draw, figsize = CHARTS[chart]
+    own_tracker = tracker is None
+    tracker = tracker or ExpenseTracker()
+    try:
+        path = chart_cache_path(tracker, chart, days, fmt, cache_dir)
+        if os.path.exists(path):
+            return path
+        stale_prefix = _chart_cache_prefix(tracker, chart, days)
+        data = load(tracker, days)
+    finally:
+        if own_tracker:
+            tracker.close()
+    if not data:
+        return None
+
+    # Figure without pyplot renders through Agg (or the SVG backend) and never
+    # needs a display or touches the interactive backend.
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    draw(fig, data, days)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Drop older versions of this chart before writing the new one
+    for old in os.listdir(directory):
+        if old.startswith(stale_prefix) and old.endswith("." + fmt):
+            os.remove(os.path.join(directory, old))
+    fig.savefig(path + ".tmp", format=fmt)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def visualize_by_category(days=30):
+    """Create a pie chart of expenses by category."""
+    show_chart("category_pie", days)
+
+
+def visualize_daily_spending(days=30):
+    """Create a bar chart of daily spending."""
+    show_chart("daily_spending", days)
+
+
+def visualize_category_comparison(days=30):
+    """Create a horizontal bar chart comparing categories."""
+    show_chart("category_comparison", days)
+
+
+def visualize_cumulative_spending(days=30):
+    """Create a line chart of the running spending total."""
+    show_chart("cumulative_spending", days)
+
+
+def visualize_spending_trends(days=30):
+    """Create a chart of daily spending with rolling averages and spread."""
+    show_chart("spending_trends", days)
+
+
+def ask_days():
+    days = input("Number of days to analyze (default 30): ").strip()
+    return int(days) if days else 30
+
+
+def render_main(argv):
+    """Command line: render a chart to a file and print its path."""
+    parser = argparse.ArgumentParser(description="Render an expense chart without a display.")
+    parser.add_argument("chart", choices=sorted(CHARTS))
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--format", choices=IMAGE_FORMATS, default="png")
+    parser.add_argument("--db", default="expenses.db")
+    args = parser.parse_args(argv)
+    with ExpenseTracker(args.db) as tracker:
+        path = render_chart(args.chart, args.days, args.format, tracker)
+    if path is None:
+        print(f"No expenses in the last {args.days} days!")
+        return 1
+    print(path)
+    return 0
+
+
 def main():
     """Visualization menu."""
+    if len(sys.argv) > 1:
+        sys.exit(render_main(sys.argv[1:]))
+
     print("\n" + "="*50)
     print("📊  EXPENSE VISUALIZER  📊".center(50))
     print("="*50 + "\n")
-    
+
     print("1. Pie Chart - Expenses by Category")
     print("2. Bar Chart - Daily Spending")
     print("3. Horizontal Bar - Category Comparison")
-    print("4. Exit")
-    
-    choice = input("\nChoose visualization (1-4): ").strip()
-    
+    print("4. Line Chart - Cumulative Spending")
+    print("5. Trend Lines - Rolling Averages and Spread")
+    print("6. Save Chart as Image (PNG/SVG)")
+    print("7. Exit")
+
+    choice = input("\nChoose visualization (1-7): ").strip()
+
     if choice == '1':
-        days = input("Number of days to analyze (default 30): ").strip()
-        days = int(days) if days else 30
-        visualize_by_category(days)
+        visualize_by_category(ask_days())
     elif choice == '2':
-        days = input("Number of days to analyze (default 30): ").strip()
-        days = int(days) if days else 30
-        visualize_daily_spending(days)
+        visualize_daily_spending(ask_days())
     elif choice == '3':
-        days = input("Number of days to analyze (default 30): ").strip()
-        days = int(days) if days else 30
-        visualize_category_comparison(days)
+        visualize_category_comparison(ask_days())
     elif choice == '4':
+        visualize_cumulative_spending(ask_days())
+    elif choice == '5':
+        visualize_spending_trends(ask_days())
+    elif choice == '6':
+        charts = list(CHARTS)
+        for i, chart in enumerate(charts, 1):
+            print(f"   {i}. {chart}")
+        try:
+            chart = charts[int(input(f"Chart (1-{len(charts)}): ").strip()) - 1]
+        except (ValueError, IndexError):
+            print("Invalid choice!")
+            return
+        days = ask_days()
+        fmt = input("Format - png or svg (default png): ").strip().lower() or "png"
+        if fmt not in IMAGE_FORMATS:
+            print("Invalid format!")
+            return
+        path = render_chart(chart, days, fmt)
+        print(path if path else f"No expenses in the last {days} days!")
+    elif choice == '7':
         print("Goodbye!")
         return
     else:
@@ -148,4 +361,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()